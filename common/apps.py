@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from utils.logger import get_logger
 
 
 class CommonConfig(AppConfig):
@@ -7,4 +8,4 @@ class CommonConfig(AppConfig):
 
     def ready(self):
         import common.signals
-        print("Common signals loaded")
\ No newline at end of file
+        get_logger(__name__).event("app", "Common signals loaded")
\ No newline at end of file
@@ -4,6 +4,8 @@ from common.models import Links, Skills
 
 class SkillsFilter(filters.FilterSet):
     kw = filters.CharFilter(method='filter_kw')
+    # How each param is normalized in cache keys, see utils/cache/managers/cache_key.py
+    cache_key_normalizers = {'kw': 'keyword'}
 
     class Meta:
         model = Skills
@@ -14,6 +16,7 @@ class SkillsFilter(filters.FilterSet):
 
 class LinksFilter(filters.FilterSet):
     kw = filters.CharFilter(method='filter_kw')
+    cache_key_normalizers = {'kw': 'keyword'}
 
     class Meta:
         model = Links
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from common.models import File
+from utils.cache.managers.invalidation import CacheInvalidationManager
+
+
+class Command(BaseCommand):
+    help = "Store delivery URLs on File rows saved before they were persisted"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows updated per query")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Recompute every row, e.g. after changing CLOUDINARY_DERIVED_TRANSFORMATIONS",
+        )
+
+    def handle(self, *args, **options):
+        queryset = File.objects.order_by("pk").only("pk", "public_id", "version", "format", "resource_type")
+        if not options["force"]:
+            queryset = queryset.filter(url="")
+
+        updated = 0
+        last_pk = 0
+        while True:
+            # Keyset batches, rows updated by a batch may leave the filtered queryset
+            files = list(queryset.filter(pk__gt=last_pk)[:options["batch_size"]])
+            if not files:
+                break
+            for file in files:
+                file.set_delivery_urls()
+            with transaction.atomic():
+                File.objects.bulk_update(files, ["url", "derived_urls"])
+                # bulk_update skips save() and signals. Filling empty URLs serves the same ones,
+                # recomputing them may change them, so what reads these files is bumped
+                if options["force"]:
+                    self.mark_stale(files)
+            updated += len(files)
+            last_pk = files[-1].pk
+            self.stdout.write(f"Updated {updated} files")
+
+        self.stdout.write(f"Done, {updated} files updated")
+
+    def mark_stale(self, files):
+        """Queue the version bumps a save() of each file would have caused, flushed when the batch commits"""
+        CacheInvalidationManager.mark_stale(
+            CacheInvalidationManager.get_dependents(File)
+            | CacheInvalidationManager.get_objects_names(File, [file.pk for file in files]),
+            purge_keys=set().union(*(CacheInvalidationManager.get_purge_keys(file) for file in files)),
+        )
@@ -0,0 +1,89 @@
+import pickle
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from common.models import Skills
+from common.serializers import SkillsSerializer
+from info.models import Blogs, Projects
+from info.serializers import BlogsSerializer, ProjectsSerializer
+from utils.cache.managers.cache_codec import CacheCodecManager
+
+
+class Command(BaseCommand):
+    help = "Compare size, encode/decode time and Redis memory of cached payloads per codec"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=50, help="Encode/decode runs per payload")
+
+    def handle(self, *args, **options):
+        codecs = {
+            "pickle (legacy)": (
+                lambda data: pickle.dumps(data, pickle.DEFAULT_PROTOCOL),
+                pickle.loads,
+            ),
+            "json": (
+                lambda data: CacheCodecManager.encode(data, CacheCodecManager.JSON),
+                CacheCodecManager.decode,
+            ),
+            "msgpack": (
+                lambda data: CacheCodecManager.encode(data, CacheCodecManager.MSGPACK),
+                CacheCodecManager.decode,
+            ),
+        }
+        if CacheCodecManager.get_codec() != CacheCodecManager.MSGPACK:
+            codecs.pop("msgpack")
+
+        payloads = self.get_payloads()
+        if not payloads:
+            self.stdout.write("No rows to benchmark")
+            return
+
+        self.stdout.write(f"{'Payload':<22}{'Codec':<18}{'Bytes':>10}{'Redis':>10}{'Encode ms':>11}{'Decode ms':>11}")
+        for payload_name, data in payloads.items():
+            for codec_name, (encode, decode) in codecs.items():
+                value = encode(data)
+                encode_ms = self.measure(lambda: encode(data), options["repeat"])
+                decode_ms = self.measure(lambda: decode(value), options["repeat"])
+                memory = self.get_redis_memory(f"codec_benchmark_{payload_name}", value)
+                self.stdout.write(
+                    f"{payload_name:<22}{codec_name:<18}{len(value):>10}{memory:>10}{encode_ms:>11.3f}{decode_ms:>11.3f}"
+                )
+
+    def get_payloads(self):
+        """Build the list payloads cached by the views from the current database"""
+        payloads = {}
+        sources = [
+            ("blogs_page", BlogsSerializer, Blogs.objects.order_by("id")[:10]),
+            ("blogs_all", BlogsSerializer, Blogs.objects.order_by("id")),
+            ("projects_page", ProjectsSerializer, Projects.objects.order_by("id")[:5]),
+            ("skills_all", SkillsSerializer, Skills.objects.order_by("id")),
+        ]
+        for name, serializer_class, queryset in sources:
+            data = serializer_class(queryset, many=True).data
+            if data:
+                payloads[name] = {"data": {"data_list": data}, "status_code": 200}
+        return payloads
+
+    def measure(self, func, repeat):
+        """Average run time of a function in milliseconds"""
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) * 1000 / repeat
+
+    def get_redis_memory(self, key, value):
+        """Redis memory used by a stored value (stored length when MEMORY is unavailable)"""
+        connection = get_redis_connection("default")
+        # Written raw, so every codec is measured without the client's serializer
+        redis_key = cache.make_key(key)
+        connection.set(redis_key, value, ex=60)
+        try:
+            return connection.memory_usage(redis_key)
+        except ResponseError:
+            return connection.strlen(redis_key)
+        finally:
+            connection.delete(redis_key)
@@ -0,0 +1,67 @@
+import json
+import re
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+
+from utils.cache.managers.cache_key import CacheKeyManager
+from utils.cache.managers.response_cache import ResponseCacheManager
+from utils.cache.mixins.response_cache_mixin import ResponseCacheMixin
+
+# Matches the request line of common/combined access logs, or a bare "GET /path" / "/path" line
+REQUEST_LINE = re.compile(r'(?:"|^)(?:(?P<method>[A-Z]+) )?(?P<url>/\S*)')
+
+
+class Command(BaseCommand):
+    help = "Replay an access log and compare response cache hit ratios of raw and canonical cache keys"
+
+    def add_arguments(self, parser):
+        parser.add_argument("log_file", help="Access log (common/combined format or one URL per line)")
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        stats = defaultdict(lambda: {"requests": 0, "raw": set(), "canonical": set()})
+
+        try:
+            log_file = open(options["log_file"], encoding="utf-8", errors="replace")
+        except OSError as e:
+            raise CommandError(e)
+
+        with log_file:
+            for line in log_file:
+                match = REQUEST_LINE.search(line)
+                if not match or (match.group("method") or "GET") != "GET":
+                    continue
+
+                request = factory.get(match.group("url"))
+                view_class = CacheKeyManager.get_view_class(request)
+                if view_class is None or not issubclass(view_class, ResponseCacheMixin):
+                    continue
+
+                view_name = view_class.__name__
+                raw_key = json.dumps([request.path, request.GET.dict(), view_name], sort_keys=True)
+                view_stats = stats[view_name]
+                view_stats["requests"] += 1
+                view_stats["raw"].add(raw_key)
+                view_stats["canonical"].add(ResponseCacheManager.get_response_cache_key(request, view_name))
+
+        if not stats:
+            self.stdout.write("No cached GET requests found")
+            return
+
+        self.stdout.write(f"{'View':<24}{'Requests':>10}{'Raw keys':>10}{'Raw hit':>10}{'Keys':>10}{'Hit':>10}")
+        totals = {"requests": 0, "raw": 0, "canonical": 0}
+        for view_name, view_stats in sorted(stats.items()):
+            requests, raw, canonical = view_stats["requests"], len(view_stats["raw"]), len(view_stats["canonical"])
+            totals["requests"] += requests
+            totals["raw"] += raw
+            totals["canonical"] += canonical
+            self.stdout.write(self.format_row(view_name, requests, raw, canonical))
+        self.stdout.write(self.format_row("Total", totals["requests"], totals["raw"], totals["canonical"]))
+
+    def format_row(self, name, requests, raw_keys, canonical_keys):
+        # Every distinct key misses once, every repeat is a hit (no expiry, no version bumps)
+        raw_hit = (requests - raw_keys) / requests
+        canonical_hit = (requests - canonical_keys) / requests
+        return f"{name:<24}{requests:>10}{raw_keys:>10}{raw_hit:>10.1%}{canonical_keys:>10}{canonical_hit:>10.1%}"
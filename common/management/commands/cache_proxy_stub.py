@@ -0,0 +1,84 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Hop-by-hop headers are not replayed from the cache
+SKIPPED_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-length"}
+
+
+class Command(BaseCommand):
+    help = "Run a tiny caching reverse proxy that honours surrogate keys and PURGE requests, for local testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+        parser.add_argument("--upstream", default="http://127.0.0.1:8000", help="Base URL of the API")
+
+    def handle(self, *args, **options):
+        store = {}
+        lock = threading.Lock()
+        upstream = options["upstream"].rstrip("/")
+        key_header = getattr(settings, "CACHE_SURROGATE_KEY_HEADER", "Surrogate-Key")
+        purge_header = getattr(settings, "CACHE_PURGE_KEY_HEADER", "Surrogate-Key")
+        purge_method = getattr(settings, "CACHE_PURGE_METHOD", "PURGE")
+        write = self.stdout.write
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with lock:
+                    entry = store.get(self.path)
+                if entry is not None:
+                    write(f"HIT   {self.path}")
+                    self.reply(*entry[:3])
+                    return
+
+                status, headers, body = self.fetch()
+                keys = set(dict(headers).get(key_header, "").split())
+                if status == 200 and keys:
+                    with lock:
+                        store[self.path] = (status, headers, body, keys)
+                write(f"MISS  {self.path} keys={' '.join(sorted(keys)) or '-'}")
+                self.reply(status, headers, body)
+
+            def do_PURGE(self):
+                keys = set(self.headers.get(purge_header, "").split())
+                with lock:
+                    paths = [path for path, entry in store.items() if entry[3] & keys]
+                    for path in paths:
+                        del store[path]
+                write(f"PURGE keys={' '.join(sorted(keys))} dropped={len(paths)} {' '.join(paths)}")
+                self.reply(200, [], b"")
+
+            def fetch(self):
+                try:
+                    with urlopen(Request(upstream + self.path), timeout=30) as response:
+                        return response.status, list(response.getheaders()), response.read()
+                except HTTPError as e:
+                    return e.code, list(e.headers.items()), e.read()
+
+            def reply(self, status, headers, body):
+                self.send_response(status)
+                for name, value in headers:
+                    if name.lower() not in SKIPPED_HEADERS:
+                        self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        if purge_method != "PURGE":
+            setattr(Handler, f"do_{purge_method}", Handler.do_PURGE)
+
+        server = ThreadingHTTPServer(("127.0.0.1", options["port"]), Handler)
+        write(f"Caching {upstream} on http://127.0.0.1:{options['port']}, purge with {purge_method} + {purge_header}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,46 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.cache.managers.cache_stats import CacheStatsManager
+
+
+class Command(BaseCommand):
+    help = "Report Redis cache keys, memory, TTLs and stale share per key family and model"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-keys", type=int, help="Keys to sample (default: CACHE_STATS_MAX_KEYS)")
+        parser.add_argument(
+            "--families",
+            nargs="+",
+            help="Only report these families (e.g. response pagination version)",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    def handle(self, *args, **options):
+        report = CacheStatsManager.collect(max_keys=options["max_keys"], families=options["families"])
+        if report is None:
+            raise CommandError("Redis is unreachable")
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        coverage = "all" if report["complete"] else f"a sample of {report['scanned']}"
+        self.stdout.write(f"Scanned {coverage} of {report['dbsize']} keys, Redis used memory: {report['used_memory']}")
+        self.stdout.write(f"{'Family / model':<32}{'Keys':>8}{'Bytes':>12}{'Stale':>8}  TTLs")
+        for family, group in report["families"].items():
+            self.stdout.write(self.format_row(family, group))
+            for model, model_group in group["models"].items():
+                self.stdout.write(self.format_row(f"  {model}", model_group))
+
+        if report["versions"]:
+            self.stdout.write("")
+            self.stdout.write(f"{'Model':<32}{'Version':>8}{'Objects':>12}")
+            for model, version in report["versions"].items():
+                self.stdout.write(f"{model:<32}{version['version']:>8}{version['objects']:>12}")
+
+    def format_row(self, name, group):
+        stale = group["stale"] / group["count"] if group["count"] else 0
+        ttls = " ".join(f"{bucket}:{count}" for bucket, count in sorted(group["ttl"].items()))
+        return f"{name:<32}{group['count']:>8}{group['bytes']:>12}{stale:>8.0%}  {ttls}"
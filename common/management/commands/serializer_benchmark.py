@@ -0,0 +1,55 @@
+import itertools
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from common.models import Links, Skills
+from common.serializers import LinksSerializer, SkillsSerializer
+from info.models import Blogs, Experiences, Projects
+from info.serializers import BlogsSerializer, ExperiencesSerializer, ProjectsSerializer
+from utils.db.compiled_serializer import CompiledSerializerManager
+from utils.db.eager_loading import EagerLoadingManager
+
+
+class Command(BaseCommand):
+    help = "Compare DRF and compiled serializers on list pages of 10, 100 and 10,000 rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 10000], help="Rows per page")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per page, the fastest is reported")
+
+    def handle(self, *args, **options):
+        sources = [
+            ("blogs", BlogsSerializer, Blogs),
+            ("experiences", ExperiencesSerializer, Experiences),
+            ("projects", ProjectsSerializer, Projects),
+            ("skills", SkillsSerializer, Skills),
+            ("links", LinksSerializer, Links),
+        ]
+        self.stdout.write(f"{'Serializer':<14}{'Rows':>8}{'DRF ms':>11}{'Compiled ms':>13}{'Speedup':>9}  Output")
+        for name, serializer_class, model in sources:
+            # Rows are loaded once and repeated up to the page size, only serialization is timed
+            rows = list(EagerLoadingManager.apply(model.objects.order_by("pk"), serializer_class)[:max(options["sizes"])])
+            if not rows:
+                self.stdout.write(f"{name:<14}no rows")
+                continue
+            represent = CompiledSerializerManager.get_function(serializer_class)
+            for size in options["sizes"]:
+                page = list(itertools.islice(itertools.cycle(rows), size))
+                drf_ms = self.measure(lambda: serializer_class(page, many=True).data, options["repeat"])
+                compiled_ms = self.measure(lambda: [represent(obj) for obj in page], options["repeat"])
+                same = json.dumps(serializer_class(page, many=True).data) == json.dumps([represent(obj) for obj in page])
+                self.stdout.write(
+                    f"{name:<14}{size:>8}{drf_ms:>11.2f}{compiled_ms:>13.2f}{drf_ms / compiled_ms:>8.1f}x  "
+                    f"{'identical' if same else 'DIFFERENT'}"
+                )
+
+    def measure(self, func, repeat):
+        """Fastest run time of a function in milliseconds"""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from utils.cache.managers.cache_sweeper import CacheSweeperManager
+
+
+class Command(BaseCommand):
+    help = "Delete versioned cache keys orphaned by version bumps, and enforce the Redis memory budget"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-keys",
+            type=int,
+            help="Stop after scanning this many keys, the next run continues from there (default: full pass)",
+        )
+        parser.add_argument(
+            "--memory-budget",
+            type=int,
+            help="Bytes of Redis memory, overrides CACHE_SWEEP_MEMORY_BUDGET",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only count the keys that would be deleted")
+
+    def handle(self, *args, **options):
+        stats = CacheSweeperManager.sweep(
+            max_keys=options["max_keys"],
+            memory_budget=options["memory_budget"],
+            dry_run=options["dry_run"],
+        )
+        action = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            f"Scanned {stats['scanned']} keys. {action} {stats['orphaned']} orphaned "
+            f"and {stats['evicted']} over the memory budget"
+        )
+        if stats["used_memory"] is not None:
+            self.stdout.write(f"Redis used memory: {stats['used_memory']} bytes")
+        if stats["cursor"]:
+            self.stdout.write(f"Stopped at cursor {stats['cursor']}, run again to continue")
@@ -0,0 +1,34 @@
+from functools import partial
+
+from django.core.management.base import BaseCommand
+
+from utils.cache.managers.background_refresh import BackgroundRefreshManager
+from utils.cache.managers.cache_warmer import CacheWarmerManager
+from utils.cache.managers.versioned_cache import VersionedCacheManager
+
+
+class Command(BaseCommand):
+    help = "Render the first pages of cached list views so deploys start with a warm cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--models",
+            nargs="+",
+            help="Only warm views depending on these model versions (e.g. blogs projects)",
+        )
+
+    def handle(self, *args, **options):
+        tasks = CacheWarmerManager.get_tasks(options["models"])
+        if not tasks:
+            self.stdout.write("No views to warm")
+            return
+
+        for path, params, view_class in tasks:
+            versions = VersionedCacheManager.prefetch_versions(view_class.get_cache_model_names())
+            cache_key = CacheWarmerManager.get_warm_key(path, params, versions)
+            refresh = partial(CacheWarmerManager.warm, path, params, view_class.cache_warm_pages)
+            # Another node running the same deploy step may already be warming this version
+            if BackgroundRefreshManager.run_locked(cache_key, refresh):
+                self.stdout.write(f"Warmed {path} {params}")
+            else:
+                self.stdout.write(f"Skipped {path} {params}: already being warmed")
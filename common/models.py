@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from ckeditor.fields import RichTextField
 
@@ -38,14 +39,30 @@ class File(CommonBaseModel):
     file_type = models.CharField(max_length=50, choices=FILE_TYPES, default=OTHER_TYPE)
     uploaded_at = models.DateTimeField(null=False, blank=False)
     metadata = models.JSONField(blank=True, null=True)
+    # Delivery URLs stored when the file is saved, so reads need no computation
+    url = models.URLField(max_length=500, blank=True, default='')
+    derived_urls = models.JSONField(blank=True, default=dict)
     
     def get_full_url(self):
-        url, _ = CloudinaryService.get_url_from_public_id(self.public_id, {
-            'version': self.version,
-            'format': self.format,
-            'resource_type': self.resource_type,
-        })
-        return url
+        return CloudinaryService.build_url(self.public_id, self.version, self.format, self.resource_type or 'image')
+
+    def set_delivery_urls(self):
+        """Compute the secure URL and the CLOUDINARY_DERIVED_TRANSFORMATIONS URLs of the current version"""
+        self.url = self.get_full_url() or ''
+        self.derived_urls = {
+            name: CloudinaryService.build_url(
+                self.public_id, self.version, self.format, self.resource_type or 'image', transformation
+            )
+            for name, transformation in settings.CLOUDINARY_DERIVED_TRANSFORMATIONS.items()
+        } if self.public_id else {}
+
+    def save(self, *args, **kwargs):
+        # URLs only change with the uploaded version, which is set on this save
+        self.set_delivery_urls()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'url', 'derived_urls'}
+        super().save(*args, **kwargs)
     
     @staticmethod
     def update_or_create_file_with_cloudinary(file, cloudinary_upload_result, file_type: str = OTHER_TYPE):
@@ -123,4 +140,12 @@ class Contact(CommonBaseModel):
         ordering = ['-created_at']
     
     def __str__(self):
-        return f"{self.full_name} - {self.subject}"
\ No newline at end of file
+        return f"{self.full_name} - {self.subject}"
+
+class PendingCacheVersion(models.Model):
+    """Version bump that could not reach Redis, replayed by CircuitBreakerManager once it answers again"""
+    name = models.CharField(max_length=255, unique=True)
+    deferred_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "personal_common_pending_cache_versions"
@@ -8,9 +8,11 @@ class FileSerializer(serializers.ModelSerializer):
     class Meta:
         model = File
         fields = ['id', 'public_id', 'resource_type', 'file_type', 'full_url', 'uploaded_at']
+        eager_loading_fields = ['url', 'public_id', 'version', 'format', 'resource_type']  # Read by full_url
 
     def get_full_url(self, obj):
-        return obj.get_full_url()
+        # Rows saved before URLs were stored are computed until backfilled
+        return obj.url or obj.get_full_url()
 
 class SkillsSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,16 +1,8 @@
-from django.db.models.signals import post_delete, post_save
-from django.dispatch import receiver
-from common.models import File
-from utils.cache.managers.versioned_cache import VersionedCacheManager
+from common.models import File, Links, Skills
+from utils.cache.managers.invalidation import CacheInvalidationManager
 
-
-@receiver([post_save, post_delete], sender=File)
-def invalidate_files_cache(sender, instance, created=None, **kwargs):
-    """
-    Invalidate cache for files when File model changes
-    """
-    signal_type = "created" if created else "updated" if created is False else "deleted"
-    print(f"Signal received: File {instance.id} {signal_type}")
-
-    # Increment version for files
-    VersionedCacheManager.increment_version("files")
\ No newline at end of file
+# Each cached model declares the relations its serialized payload reads.
+# Saves, deletes and m2m changes along these paths bump the model version on commit.
+CacheInvalidationManager.register("files", File)
+CacheInvalidationManager.register("skills", Skills)
+CacheInvalidationManager.register("links", Links, track_objects=True)
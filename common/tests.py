@@ -1,3 +1,53 @@
-from django.test import TestCase
+from django.urls import URLPattern, URLResolver, get_resolver
 
-# Create your tests here.
+from info.tests import BUDGETS as INFO_BUDGETS
+from utils.testing.budget import EndpointBudgetTestCase
+from utils.testing.fixtures import seed_portfolio
+
+# (SQL queries, Redis round trips) per request, cold then warm, and the largest payload accepted
+BUDGETS = {
+    "common:all-configs": {"cold": (0, 0), "warm": (0, 0), "max_bytes": 512},
+    "common:skills-list": {"cold": (1, 14), "warm": (0, 1), "max_bytes": 1000},
+    "common:links-list": {"cold": (1, 14), "warm": (0, 1), "max_bytes": 300},
+    "common:links-detail": {"cold": (1, 10), "warm": (0, 1), "max_bytes": 200},
+}
+# Routes that do not answer GET
+NOT_BUDGETED = {"common:contact-create"}
+
+
+class CommonEndpointBudgetTests(EndpointBudgetTestCase):
+    budgets = BUDGETS
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portfolio = seed_portfolio()
+
+    def test_all_configs(self):
+        self.assert_within_budget("common:all-configs")
+
+    def test_skills_list(self):
+        self.assert_within_budget("common:skills-list")
+
+    def test_links_list(self):
+        self.assert_within_budget("common:links-list")
+
+    def test_links_detail(self):
+        self.assert_within_budget("common:links-detail", id=self.portfolio["projects"][0].link_github_id)
+
+    def test_every_v1_route_has_a_budget(self):
+        budgeted = set(BUDGETS) | set(INFO_BUDGETS) | NOT_BUDGETED
+        missing = sorted(set(get_v1_url_names()) - budgeted)
+        self.assertEqual(missing, [], "Declare a budget for every /v1/ route")
+
+
+def get_v1_url_names(patterns=None, prefix="", namespace=""):
+    """List the namespaced names of the routes under /v1/"""
+    names = []
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            child_namespace = f"{namespace}{pattern.namespace}:" if pattern.namespace else namespace
+            names.extend(get_v1_url_names(pattern.url_patterns, route, child_namespace))
+        elif isinstance(pattern, URLPattern) and route.startswith("v1/") and pattern.name:
+            names.append(f"{namespace}{pattern.name}")
+    return names
@@ -8,7 +8,7 @@ urlpatterns = [
 
     path('skills/list', views.SkillsListView.as_view(), name='skills-list'),
     path('links/list', views.LinksListView.as_view(), name='links-list'),
-    path('links/view/<str:name>', views.LinksDetailView.as_view(), name='links-detail'),
+    path('links/view/<int:id>', views.LinksDetailView.as_view(), name='links-detail'),
 
     path('contacts/create', views.ContactCreateView.as_view(), name='contact-create'),
 ]
\ No newline at end of file
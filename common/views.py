@@ -14,6 +14,16 @@ from .filters import SkillsFilter, LinksFilter
 from helpers import helper
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, JsonResponse
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+from utils.cache.managers.cache_stats import CacheStatsManager
+from utils.cache.managers.metrics import MetricsManager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 @api_view(["GET"])
 @csrf_exempt
@@ -26,6 +36,31 @@ def get_all_config(request):
         helper.print_log_error(func_name="get_all_config", error=ex)
         return response_data(status=status.HTTP_500_INTERNAL_SERVER_ERROR, data=None)
 
+@require_GET
+def get_metrics(request):
+    """Cache and request metrics in the Prometheus text format"""
+    token = settings.METRICS_TOKEN
+    if token:
+        if not constant_time_compare(request.META.get("HTTP_AUTHORIZATION", ""), f"Bearer {token}"):
+            return HttpResponse(status=status.HTTP_401_UNAUTHORIZED)
+    elif not settings.DEBUG:
+        return HttpResponse(status=status.HTTP_404_NOT_FOUND)
+    return HttpResponse(MetricsManager.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+@require_GET
+@staff_member_required
+def get_cache_stats(request):
+    """Redis keys, memory, TTLs and stale share per key family and model, for staff users"""
+    max_keys = request.GET.get("max_keys", "")
+    families = [family for family in request.GET.get("families", "").split(",") if family]
+    report = CacheStatsManager.collect(
+        max_keys=int(max_keys) if max_keys.isdigit() else None,
+        families=families or None,
+    )
+    if report is None:
+        return JsonResponse({"detail": "Cache statistics unavailable"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return JsonResponse(report)
+
 class SkillsListView(ResponseCacheMixin, QueryCacheMixin, generics.GenericAPIView):
     queryset = Skills.objects.all().order_by('id')
     serializer_class = SkillsSerializer
@@ -33,7 +68,9 @@ class SkillsListView(ResponseCacheMixin, QueryCacheMixin, generics.GenericAPIVie
     filterset_class = SkillsFilter
     pagination_class = CustomPagination
     page_size = 10
-    response_cache_timeout = 1800  # 30 minutes for skills (rarely change)
+    response_cache_timeout = 21600  # 6 hours for skills (invalidated on change)
+    response_cache_stale_ttl = 60  # Expired pages served 1 more minute while re-rendered in the background
+    cache_warm_pages = 3  # First 3 pages re-rendered after a change
 
     def get(self, request, *args, **kwargs):
         return self.handle_list_request(request)
@@ -45,7 +82,7 @@ class LinksListView(ResponseCacheMixin, QueryCacheMixin, generics.GenericAPIView
     filterset_class = LinksFilter
     pagination_class = CustomPagination
     page_size = 1
-    response_cache_timeout = 1800  # 30 minutes for links (rarely change)
+    response_cache_timeout = 21600  # 6 hours for links (invalidated on change)
 
     def get(self, request, *args, **kwargs):
         return self.handle_list_request(request)
@@ -53,17 +90,18 @@ class LinksListView(ResponseCacheMixin, QueryCacheMixin, generics.GenericAPIView
 class LinksDetailView(ResponseCacheMixin, QueryCacheMixin, generics.GenericAPIView):
     queryset = Links.objects.all().order_by('id')
     serializer_class = LinksSerializer
-    response_cache_timeout = 1800  # 30 minutes for link details
+    response_cache_timeout = 21600  # 6 hours for link details
+    cache_object_kwarg = 'id'  # Only edits touching this link invalidate it
 
     def get(self, request, id, *args, **kwargs):
-        print(f"Lấy chi tiết link [{id}]")
+        logger.event("view.detail", "Lấy chi tiết link", view=self.__class__.__name__, id=id)
         try:
             instance = self.get_queryset().get(id=id)
             serializer = self.serializer_class(instance)
-            print(f"Lấy link thành công [{id}]")
+            logger.event("view.detail", "Lấy link thành công", view=self.__class__.__name__, id=id)
             return response_data(data=serializer.data)
         except Links.DoesNotExist:
-            print(f"Link ID [{id}] không hợp lệ")
+            logger.event("view.detail", "Link ID không hợp lệ", view=self.__class__.__name__, id=id)
             return response_data(
                 status_code="ERROR",
                 message=_("Link ID [{id}] không hợp lệ").format(id=id),
@@ -75,19 +113,19 @@ class ContactCreateView(generics.CreateAPIView):
     serializer_class = ContactCreateSerializer
 
     def post(self, request, *args, **kwargs):
-        print("Tạo contact mới")
+        logger.event("view.contact", "Tạo contact mới")
         try:
             serializer = self.get_serializer(data=request.data, context={'request': request})
             if serializer.is_valid():
                 contact = serializer.save()
-                print(f"Tạo contact thành công [{contact.id}] - {contact.full_name}")
+                logger.event("view.contact", "Tạo contact thành công", id=contact.id)
                 return response_data(
                     message=_("Gửi tin nhắn thành công! Chúng tôi sẽ phản hồi sớm nhất có thể."),
                     data={"id": contact.id},
                     status=status.HTTP_201_CREATED
                 )
             else:
-                print(f"Lỗi validation: {serializer.errors}")
+                logger.event("view.contact", "Lỗi validation", errors=serializer.errors)
                 return response_data(
                     status_code="ERROR",
                     message=_("Dữ liệu không hợp lệ"),
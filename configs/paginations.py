@@ -1,12 +1,44 @@
+import base64
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import F, Q
+from django.http import StreamingHttpResponse
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from configs.variable_response import data_response
 from utils.cache.managers.versioned_cache import VersionedCacheManager
+from utils.cache.managers.cache_key import CacheKeyManager
+from utils.cache.managers.count_cache import CountCacheManager
+from utils.cache.managers.metrics import MetricsManager
 from utils.cache.managers.pagination_cache import PaginationCacheManager
+from utils.cache.managers.single_flight import SingleFlightManager
+from utils.cache.managers.stream_cache import StreamCacheManager
+from utils.db.compiled_serializer import CompiledSerializerManager
+from utils.db.count_strategy import CountStrategyManager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class CustomPagination(pagination.PageNumberPagination):
     page_size = 12
     page_size_query_param = 'pageSize'
     max_page_size = 10000
+    # Requested page sizes are rounded up to one of these values, None keeps them as requested.
+    # Off here: rounding up serves more rows than the client asked for, see get_effective_page_size
+    page_size_buckets = None
+    # "json" or "ndjson" streams the response, see get_streaming_response
+    stream_query_param = 'stream'
+    # Present (empty for the first page) switches to keyset pagination, see compute_cursor_data
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+    # How totals are computed on a count cache miss, views may set their own count_strategy
+    count_strategy = 'window'
 
     def paginate_queryset(self, queryset, request, view=None):
         # Ưu tiên page_size từ view nếu có
@@ -15,6 +47,223 @@ class CustomPagination(pagination.PageNumberPagination):
             return None
         return super().paginate_queryset(queryset, request, view)
 
+    def get_page_size(self, request):
+        return self.get_effective_page_size(request.query_params)
+
+    def get_effective_page_size(self, query_params):
+        """
+        Get the page size that will be used for the given query parameters
+
+        With `page_size_buckets` the page size is rounded up to the next bucket,
+        so fewer distinct page sizes reach the caches at the cost of serving
+        more rows than requested. It is unset on CustomPagination for that reason.
+        
+        Args:
+            query_params: Request query parameters
+            
+        Returns:
+            int: Page size
+        """
+        page_size = self.page_size
+        try:
+            requested = int(query_params[self.page_size_query_param])
+            if requested > 0:
+                page_size = min(requested, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        
+        if self.page_size_buckets:
+            page_size = next((size for size in sorted(self.page_size_buckets) if size >= page_size), page_size)
+        return page_size
+
+    def get_stream_format(self, request, view=None):
+        """
+        Get the format a list request is streamed in
+
+        `stream=ndjson` and `stream=json` stream any list. With `STREAM_ENABLED`,
+        noPagination and pages of at least `STREAM_MIN_PAGE_SIZE` rows are
+        streamed as JSON without being asked, unless the browsable API renders them.
+        ResponseCacheMixin asks before DRF wraps the request and the paginator
+        after, both must get the same answer, see `renders_json`.
+
+        Args:
+            request: DRF or Django request
+            view: View instance
+
+        Returns:
+            str|None: "json" or "ndjson", None to build the response in memory
+        """
+        query_params = getattr(request, 'query_params', request.GET)
+        requested = query_params.get(self.stream_query_param, '').strip().lower()
+        if requested in ('json', 'ndjson'):
+            return requested
+        # Cursor pages are bounded by the page size and built in memory
+        if not getattr(settings, 'STREAM_ENABLED', False) or self.cursor_query_param in query_params:
+            return None
+        if not self.renders_json(request):
+            return None
+
+        if query_params.get('noPagination', 'false').lower() == 'true':
+            return 'json'
+        self.page_size = getattr(view, 'page_size', self.page_size)
+        min_page_size = getattr(settings, 'STREAM_MIN_PAGE_SIZE', 1000)
+        if min_page_size and self.get_effective_page_size(query_params) >= min_page_size:
+            return 'json'
+        return None
+
+    def renders_json(self, request):
+        """
+        Check whether a request is rendered as JSON rather than by the browsable API
+
+        Read from the format parameter and the Accept header the way DRF
+        negotiates it, not from `accepted_renderer`, which a Django request
+        does not have yet.
+
+        Args:
+            request: DRF or Django request
+
+        Returns:
+            bool: True unless the request asks for another format or for HTML
+        """
+        query_params = getattr(request, 'query_params', request.GET)
+        requested = query_params.get(api_settings.URL_FORMAT_OVERRIDE)
+        if requested:
+            return requested == 'json'
+        return 'text/html' not in request.META.get('HTTP_ACCEPT', '')
+
+    def get_streaming_response(self, queryset, serializer_class, request, view=None, cache_timeout=300,
+                               stream_format='json'):
+        """
+        Stream a page, or the whole list with noPagination, without holding it in memory
+
+        Rows are fetched `STREAM_CHUNK_SIZE` at a time with `.iterator()`, then
+        serialized and written as they come. The same chunks are stored in
+        the versioned stream cache, and hits replay them. JSON keeps the
+        usual `data_list`/`paging` envelope, paging is written after the rows.
+        NDJSON is one row per line.
+
+        Args:
+            queryset: Django queryset
+            serializer_class: Serializer class
+            request: DRF request
+            view: View instance
+            cache_timeout: Cache timeout in seconds
+            stream_format: "json" or "ndjson"
+
+        Returns:
+            StreamingHttpResponse: Streamed response
+        """
+        model_name = queryset.model.__name__.lower()
+        view_name = view.__class__.__name__ if view is not None else ""
+        # Chunks are the same in both formats
+        filters = {
+            name: value for name, value in CacheKeyManager.get_canonical_params(request, view).items()
+            if name != self.stream_query_param
+        }
+        ordering = self.get_cache_ordering(queryset, view)
+        manifest = StreamCacheManager.get_manifest(model_name, filters, ordering)
+        cache_key = StreamCacheManager.get_versioned_cache_key(model_name, filters, ordering)
+        if manifest is not None:
+            logger.event("cache.hit", "Stream cache HIT", view=view_name, model=model_name, rows=manifest["rows"])
+            MetricsManager.record_cache("stream", "hit", view_name, model_name)
+            paging = manifest["paging"]
+            offset = (paging["page"] - 1) * paging["page_size"]
+            chunks = self.iter_cached_chunks(
+                cache_key, manifest, queryset[offset:offset + manifest["rows"]], serializer_class
+            )
+            get_paging = lambda rows: paging
+        else:
+            logger.event("cache.miss", "Stream cache MISS", view=view_name, model=model_name)
+            MetricsManager.record_cache("stream", "miss", view_name, model_name)
+            if request.query_params.get('noPagination', 'false').lower() == 'true':
+                rows_queryset = queryset
+                get_paging = lambda rows: {"total_rows": rows, "page": 1, "page_size": rows}
+            else:
+                page = self.get_counted_page(queryset, request, view, model_name, filters, cache_timeout, fetch_rows=False)
+                page_size = page.paginator.per_page
+                offset = (page.number - 1) * page_size
+                rows_queryset = queryset[offset:offset + page_size]
+                paging = {"total_rows": page.paginator.count, "page": page.number, "page_size": page_size}
+                get_paging = lambda rows: paging
+            chunks = StreamCacheManager.cache_chunks(
+                cache_key, model_name, self.iter_row_chunks(rows_queryset, serializer_class),
+                get_paging=get_paging, timeout=cache_timeout
+            )
+
+        content_type = 'application/x-ndjson' if stream_format == 'ndjson' else 'application/json'
+        return StreamingHttpResponse(self.render_stream(chunks, stream_format, get_paging), content_type=content_type)
+
+    def iter_row_chunks(self, queryset, serializer_class):
+        """
+        Serialize a queryset into chunks of `STREAM_CHUNK_SIZE` JSON rows, newline separated
+
+        Args:
+            queryset: Django queryset
+            serializer_class: Serializer class
+
+        Yields:
+            bytes: Rows of a chunk
+        """
+        chunk_size = getattr(settings, 'STREAM_CHUNK_SIZE', 500)
+        render = JSONRenderer().render
+        rows = []
+        for row in CompiledSerializerManager.iterate(serializer_class, queryset, chunk_size):
+            rows.append(render(row))
+            if len(rows) == chunk_size:
+                yield b"\n".join(rows)
+                rows = []
+        if rows:
+            yield b"\n".join(rows)
+
+    def iter_cached_chunks(self, cache_key, manifest, queryset, serializer_class):
+        """
+        Replay the chunks of a stored list, finishing it from the database if a chunk was evicted
+
+        Args:
+            cache_key: Versioned stream cache key
+            manifest: Manifest of the stored list
+            queryset: Queryset of the stored rows
+            serializer_class: Serializer class
+
+        Yields:
+            bytes: Rows of a chunk
+        """
+        sent = 0
+        for chunk in StreamCacheManager.iter_cached_chunks(cache_key, manifest):
+            sent += chunk.count(b"\n") + 1
+            yield chunk
+        if sent < manifest["rows"]:
+            yield from self.iter_row_chunks(queryset[sent:], serializer_class)
+
+    def render_stream(self, chunks, stream_format, get_paging):
+        """
+        Write chunks of rows as the body of a streamed response
+
+        Args:
+            chunks: Rows of each chunk, newline separated
+            stream_format: "json" or "ndjson"
+            get_paging: Returns the paging block from the number of rows sent
+
+        Yields:
+            bytes: Body parts
+        """
+        if stream_format == 'ndjson':
+            for chunk in chunks:
+                yield chunk + b"\n"
+            return
+
+        renderer = JSONRenderer()
+        # Same bytes as response_data(data={"data_list": ..., "paging": ...}) rendered at once
+        yield renderer.render(data_response())[:-1] + b',"data":{"data_list":['
+        rows = 0
+        separator = b""
+        for chunk in chunks:
+            # Encoded rows never contain a raw newline
+            yield separator + chunk.replace(b"\n", b",")
+            separator = b","
+            rows += chunk.count(b"\n") + 1
+        yield b'],"paging":' + renderer.render(get_paging(rows)) + b'}}'
+
     def get_paginated_response(self, data):
         return Response({
             "data_list": data,
@@ -25,6 +274,23 @@ class CustomPagination(pagination.PageNumberPagination):
             }
         })
 
+    def get_cache_ordering(self, queryset, view=None):
+        """
+        Get the ordering cache keys are built with
+
+        Views over the same model differ by their queryset's ordering (e.g.
+        BlogsListView by id, BlogsSearchView by -created_at), which keeps their
+        pages apart when the view does not declare `ordering`.
+
+        Args:
+            queryset: Django queryset
+            view: View instance
+
+        Returns:
+            list: Ordering fields
+        """
+        return getattr(view, 'ordering', None) or [str(field) for field in queryset.query.order_by]
+
     def get_paginated_data_with_cache(self, queryset, serializer_class, request, view=None, cache_timeout=300):
         """
         Get paginated data with caching support
@@ -40,8 +306,9 @@ class CustomPagination(pagination.PageNumberPagination):
             dict: Paginated response data
         """
         model_name = queryset.model.__name__.lower()
-        filters = request.GET.dict()
-        ordering = getattr(view, 'ordering', None)
+        view_name = view.__class__.__name__ if view is not None else ""
+        filters = CacheKeyManager.get_canonical_params(request, view)
+        ordering = self.get_cache_ordering(queryset, view)
         
         # Handle noPagination case
         if request.query_params.get('noPagination', 'false').lower() == 'true':
@@ -56,7 +323,8 @@ class CustomPagination(pagination.PageNumberPagination):
             
             if cached_data is not None:
                 version = VersionedCacheManager.get_current_version(model_name)
-                print(f"Query cache HIT for {model_name} noPagination v{version}")
+                logger.event("cache.hit", "Query cache HIT", layer="query", view=view_name, model=model_name, version=version)
+                MetricsManager.record_cache("query", "hit", view_name, model_name)
                 return {
                     "data_list": cached_data,
                     "paging": {
@@ -66,20 +334,20 @@ class CustomPagination(pagination.PageNumberPagination):
                     }
                 }
             
-            # Cache miss - serialize and cache
-            serializer = serializer_class(queryset, many=True)
-            data = serializer.data
+            # Cache miss - serialize and cache what is returned
+            data = CompiledSerializerManager.serialize(serializer_class, queryset)
             
-            QueryCacheManager.cache_versioned_queryset(
+            QueryCacheManager.cache_versioned_data(
                 model_name=model_name,
-                queryset=queryset,
+                data=data,
                 filters=filters,
                 ordering=ordering,
                 timeout=cache_timeout
             )
             
             version = VersionedCacheManager.get_current_version(model_name)
-            print(f"Query cache MISS for {model_name} noPagination v{version}")
+            logger.event("cache.miss", "Query cache MISS", layer="query", view=view_name, model=model_name, version=version)
+            MetricsManager.record_cache("query", "miss", view_name, model_name)
             
             return {
                 "data_list": data,
@@ -98,6 +366,11 @@ class CustomPagination(pagination.PageNumberPagination):
             page_number = int(page_number)
         except (ValueError, TypeError):
             page_number = 1
+
+        # Cursor pages are keyed by the cursor, part of the canonical filters
+        cursor_mode = self.cursor_query_param in request.query_params
+        if cursor_mode:
+            page_number = None
             
         # Try pagination cache first
         cached_response = PaginationCacheManager.get_cached_paginated_response(
@@ -110,26 +383,317 @@ class CustomPagination(pagination.PageNumberPagination):
         
         if cached_response:
             version = VersionedCacheManager.get_current_version(model_name)
-            print(f"Pagination cache HIT for {model_name} page {page_number} v{version}")
+            logger.event(
+                "cache.hit", "Pagination cache HIT",
+                view=view_name, model=model_name, page=page_number, version=version
+            )
+            MetricsManager.record_cache("pagination", "hit", view_name, model_name)
             return cached_response
         
-        # Cache miss - paginate and serialize
-        page = self.paginate_queryset(queryset, request, view)
+        MetricsManager.record_cache("pagination", "miss", view_name, model_name)
+        # Cache miss - only one request per versioned key computes the page
+        return SingleFlightManager.execute(
+            cache_key=PaginationCacheManager.get_versioned_cache_key(
+                model_name, filters, ordering, page_number, self.page_size
+            ),
+            compute=lambda: (self.compute_cursor_data if cursor_mode else self.compute_paginated_data)(
+                queryset, serializer_class, request, view, cache_timeout,
+                model_name, filters, ordering, page_number
+            ),
+            fetch=lambda: PaginationCacheManager.get_cached_paginated_response(
+                model_name=model_name,
+                filters=filters,
+                ordering=ordering,
+                page=page_number,
+                page_size=self.page_size
+            )
+        )
+
+    def get_counted_page(self, queryset, request, view, model_name, filters, cache_timeout=300, fetch_rows=True):
+        """
+        Get the requested page, its total read from the shared count cache when possible
+
+        Every page of a filter set has the same total, so it is cached once per
+        model version and reused by all of them. On a count cache miss it is
+        computed with the view's `count_strategy` (see CountStrategyManager):
+            exact: COUNT(*) of the filtered queryset
+            window: page and total in one query with COUNT(*) OVER ()
+            estimated: planner statistics for large unfiltered tables
+
+        Strategies that cannot apply (DISTINCT, empty page, filtered queryset)
+        fall back to an exact COUNT.
+
+        Args:
+            queryset: Django queryset
+            request: DRF request
+            view: View instance
+            model_name: Name of the model
+            filters: Canonical query parameters
+            cache_timeout: Cache timeout in seconds
+            fetch_rows: Let the window strategy load the page rows, False when they are streamed
+
+        Returns:
+            Page: Requested page, with its rows loaded when the window strategy fetched them
+
+        Raises:
+            NotFound: Page number out of range
+        """
+        self.page_size = getattr(view, 'page_size', self.page_size)
+        page_size = self.get_page_size(request)
+        paginator = self.django_paginator_class(queryset, page_size)
+        page_number = self.get_page_number(request, paginator)
+        view_name = view.__class__.__name__ if view is not None else ""
+        count_filters = self.get_count_filters(filters)
+
+        rows = None
+        count = CountCacheManager.get_count(model_name, view_name, count_filters)
+        if count is None:
+            strategy = getattr(view, 'count_strategy', self.count_strategy)
+            if strategy == 'estimated':
+                count = CountStrategyManager.get_estimated_count(queryset)
+            elif (strategy == 'window' and fetch_rows and str(page_number).isdigit()
+                  and CountStrategyManager.supports_window(queryset)):
+                offset = (max(int(page_number), 1) - 1) * page_size
+                rows, count = CountStrategyManager.get_window_page(queryset, offset, page_size)
+            if count is None:
+                count = queryset.count()
+            CountCacheManager.cache_count(model_name, view_name, count_filters, count, cache_timeout)
+        # Paginator.count is a cached_property, setting it skips the COUNT query
+        paginator.count = count
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        if rows:
+            self.page.object_list = rows
+        self.request = request
+        return self.page
+
+    def get_count_filters(self, filters):
+        """
+        Drop the parameters that select a page rather than rows
+
+        Args:
+            filters: Canonical query parameters
+
+        Returns:
+            dict: Parameters the total depends on
+        """
+        pagination_params = {
+            self.page_query_param, self.page_size_query_param, self.cursor_query_param,
+            self.stream_query_param, CacheKeyManager.NO_PAGINATION_PARAM, CacheKeyManager.FORMAT_PARAM
+        }
+        return {name: value for name, value in filters.items() if name not in pagination_params}
+
+    def compute_cursor_data(self, queryset, serializer_class, request, view, cache_timeout,
+                            model_name, filters, ordering, page_number=None):
+        """
+        Build and cache a keyset page on cache miss
+
+        Rows are ordered by the queryset's ordering with the primary key
+        appended as tie-breaker (`id` for most views, `-created_at, id` for
+        BlogsSearchView), and a page is the `page_size` rows after (or before)
+        the row its cursor points at. Each page costs one indexed range query,
+        there is no OFFSET scan and no COUNT, so `paging` has cursors instead
+        of `total_rows`/`page`.
+
+        Args:
+            queryset: Django queryset
+            serializer_class: Serializer class
+            request: HTTP request
+            view: View instance
+            cache_timeout: Cache timeout in seconds
+            model_name: Name of the model
+            filters: Query filters used in the cache key, the cursor included
+            ordering: Ordering used in the cache key
+            page_number: Unused, cursor pages have no number
+
+        Returns:
+            dict: Paginated response data
+        """
+        page_size = self.get_page_size(request)
+        fields = self.get_cursor_ordering(queryset)
+        position, reverse = self.decode_cursor(
+            request.query_params.get(self.cursor_query_param, ''), queryset.model, fields
+        )
+
+        # Ordering values are annotated, only() may defer the fields themselves
+        annotations = {f"cursor_position_{index}": F(field.lstrip('-')) for index, field in enumerate(fields)}
+        rows_queryset = queryset.annotate(**annotations).order_by(
+            *(self.reverse_ordering(field) for field in fields) if reverse else fields
+        )
+        if position is not None:
+            rows_queryset = rows_queryset.filter(self.get_keyset_filter(fields, position, reverse))
+        rows = list(rows_queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        def cursor_of(row, cursor_reverse):
+            return self.encode_cursor([getattr(row, name) for name in annotations], cursor_reverse)
+
+        if reverse:
+            next_cursor = cursor_of(rows[-1], False) if rows else None
+            previous_cursor = cursor_of(rows[0], True) if has_more else None
+        else:
+            next_cursor = cursor_of(rows[-1], False) if has_more else None
+            previous_cursor = cursor_of(rows[0], True) if rows and position is not None else None
+
+        response_data = {
+            "data_list": CompiledSerializerManager.serialize(serializer_class, rows),
+            "paging": {
+                "page_size": page_size,
+                "next_cursor": next_cursor,
+                "previous_cursor": previous_cursor
+            }
+        }
+        PaginationCacheManager.cache_paginated_response(
+            model_name=model_name,
+            filters=filters,
+            ordering=ordering,
+            page=page_number,
+            page_size=self.page_size,
+            response_data=response_data,
+            timeout=cache_timeout
+        )
+
+        version = VersionedCacheManager.get_current_version(model_name)
+        logger.event("cache.miss", "Cursor pagination cache MISS", model=model_name, version=version)
+        return response_data
+
+    def get_cursor_ordering(self, queryset):
+        """
+        Get the keyset ordering of a queryset: its ordering, then the primary key
+
+        Args:
+            queryset: Django queryset ordered by plain, non-null model fields
+
+        Returns:
+            list: Field names, "-" prefixed when descending
+        """
+        fields = [
+            field for field in (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(field, str)
+        ]
+        pk_name = queryset.model._meta.pk.name
+        if not any(field.lstrip('-') in (pk_name, 'pk') for field in fields):
+            fields.append(pk_name)
+        return fields
+
+    def reverse_ordering(self, field):
+        """Flip the direction of an ordering field"""
+        return field[1:] if field.startswith('-') else f"-{field}"
+
+    def get_keyset_filter(self, fields, position, reverse=False):
+        """
+        Build the condition selecting rows after a position in the ordering
+
+        For `-created_at, id` and position (c, i), rows after it are
+        `created_at < c OR (created_at = c AND id > i)`.
+
+        Args:
+            fields: Keyset ordering
+            position: Ordering values of the cursor's row
+            reverse: Select the rows before the position instead
+
+        Returns:
+            Q: Filter
+        """
+        condition = Q()
+        for index, field in enumerate(fields):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            step = Q(**{name: value for name, value in zip(
+                (other.lstrip('-') for other in fields[:index]), position[:index]
+            )})
+            step &= Q(**{f"{name}__{'lt' if descending else 'gt'}": position[index]})
+            condition |= step
+        return condition
+
+    def encode_cursor(self, position, reverse=False):
+        """
+        Encode a position in the ordering as an opaque cursor
+
+        Args:
+            position: Ordering values of the boundary row
+            reverse: Whether the cursor pages backwards
+
+        Returns:
+            str: URL-safe cursor
+        """
+        values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in position]
+        payload = json.dumps({"p": values, "r": int(reverse)}, separators=(',', ':'), default=str)
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor, model, fields):
+        """
+        Decode a cursor into a position in the ordering
+
+        Args:
+            cursor: Cursor from the query string, empty for the first page
+            model: Model of the queryset
+            fields: Keyset ordering
+
+        Returns:
+            tuple: (ordering values or None for the first page, reverse)
+
+        Raises:
+            NotFound: Cursor was not issued for this ordering
+        """
+        cursor = cursor.strip()
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            values = payload["p"]
+            if len(values) != len(fields):
+                raise ValueError(cursor)
+            position = [
+                model._meta.get_field(field.lstrip('-')).to_python(value) for field, value in zip(fields, values)
+            ]
+            return position, bool(payload.get("r"))
+        except (ValueError, TypeError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def compute_paginated_data(self, queryset, serializer_class, request, view, cache_timeout,
+                               model_name, filters, ordering, page_number):
+        """
+        Paginate, serialize and cache a page on cache miss
+        
+        Args:
+            queryset: Django queryset
+            serializer_class: Serializer class
+            request: HTTP request
+            view: View instance
+            cache_timeout: Cache timeout in seconds
+            model_name: Name of the model
+            filters: Query filters used in the cache key
+            ordering: Ordering used in the cache key
+            page_number: Requested page number
+            
+        Returns:
+            dict: Paginated response data
+        """
+        if request.query_params.get('noPagination', 'false').lower() == 'true':
+            page = None
+        else:
+            page = list(self.get_counted_page(queryset, request, view, model_name, filters, cache_timeout))
         if page is None:
             # Fallback if pagination fails
-            serializer = serializer_class(queryset, many=True)
+            data = CompiledSerializerManager.serialize(serializer_class, queryset)
             return {
-                "data_list": serializer.data,
+                "data_list": data,
                 "paging": {
-                    "total_rows": len(serializer.data),
+                    "total_rows": len(data),
                     "page": 1,
-                    "page_size": len(serializer.data)
+                    "page_size": len(data)
                 }
             }
         
-        serializer = serializer_class(page, many=True)
         response_data = {
-            "data_list": serializer.data,
+            "data_list": CompiledSerializerManager.serialize(serializer_class, page),
             "paging": {
                 "total_rows": self.page.paginator.count,
                 "page": self.page.number,
@@ -149,6 +713,6 @@ class CustomPagination(pagination.PageNumberPagination):
         )
         
         version = VersionedCacheManager.get_current_version(model_name)
-        print(f"Pagination cache MISS for {model_name} page {page_number} v{version}")
+        logger.event("cache.miss", "Pagination cache MISS", model=model_name, page=page_number, version=version)
         
         return response_data
@@ -1,4 +1,8 @@
 from datetime import datetime
 
-def print_log_error(func_name, error, now=datetime.now()):
-    print(f">>> ERROR [{now}][{func_name}] >> {error}")
\ No newline at end of file
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def print_log_error(func_name, error, now=None):
+    logger.error("error", str(error), exc_info=error, func_name=func_name, at=(now or datetime.now()).isoformat())
\ No newline at end of file
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from utils.logger import get_logger
 
 
 class InfoConfig(AppConfig):
@@ -7,4 +8,4 @@ class InfoConfig(AppConfig):
 
     def ready(self):
         import info.signals
-        print("Info signals loaded")
\ No newline at end of file
+        get_logger(__name__).event("app", "Info signals loaded")
\ No newline at end of file
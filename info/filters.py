@@ -7,6 +7,8 @@ class BlogsFilter(filters.FilterSet):
     kw = filters.CharFilter(method='filter_kw')
     skills = filters.CharFilter(method='filter_skills')
     skill_ids = filters.CharFilter(method='filter_skill_ids')
+    # How each param is normalized in cache keys, see utils/cache/managers/cache_key.py
+    cache_key_normalizers = {'kw': 'keyword', 'skills': 'list', 'skill_ids': 'int_list'}
 
     class Meta:
         model = Blogs
@@ -40,6 +42,7 @@ class BlogsFilter(filters.FilterSet):
 
 class ExperiencesFilter(filters.FilterSet):
     kw = filters.CharFilter(method='filter_kw')
+    cache_key_normalizers = {'kw': 'keyword'}
     
     class Meta:
         model = Experiences
@@ -52,6 +55,7 @@ class ExperiencesFilter(filters.FilterSet):
 
 class ProjectsFilter(filters.FilterSet):
     search = filters.CharFilter(method='filter_search')
+    cache_key_normalizers = {'search': 'keyword'}
     
     class Meta:
         model = Projects
@@ -1,75 +1,14 @@
-from django.db.models.signals import post_delete, post_save
-from django.dispatch import receiver
-
-from info.models import Blogs, Projects
-from utils.cache.managers.versioned_cache import VersionedCacheManager
-
-@receiver([post_save, post_delete], sender=Blogs)
-def invalidate_blogs_cache(sender, instance, created=None, **kwargs):
-    """
-    Invalidate cache for blogs
-
-    Args:
-        sender:
-        instance:
-        created:
-        **kwargs:
-
-    Returns:
-
-    """
-    signal_type = "created" if created else "updated" if created is False else "deleted"
-    print(f"Signal received: Blog {instance.id} {signal_type}")
-
-    # Increment version for blogs
-    VersionedCacheManager.increment_version("blogs")
-
-    # Increment version for related models
-    # VersionedCacheManager.increment_version("files")
-    VersionedCacheManager.increment_version("skills")
-
-@receiver([post_save, post_delete], sender=Projects)
-def invalidate_projects_cache(sender, instance, created=None, **kwargs):
-    """
-    Invalidate cache for projects
-
-    Args:
-        sender:
-        instance:
-        created:
-        **kwargs:
-
-    Returns:
-
-    """
-    signal_type = "created" if created else "updated" if created is False else "deleted"
-    print(f"Signal received: Project {instance.id} {signal_type}")
-
-    # Increment version for projects
-    VersionedCacheManager.increment_version("projects")
-
-    # Increment version for related models
-    # VersionedCacheManager.increment_version("files")
-    VersionedCacheManager.increment_version("skills")
-
-def invalidate_experiences_cache(sender, instance, created=None, **kwargs):
-    """
-    Invalidate cache for experiences
-
-    Args:
-        sender:
-        instance:
-        created:
-        **kwargs:
-
-    Returns:
-
-    """
-    signal_type = "created" if created else "updated" if created is False else "deleted"
-    print(f"Signal received: Experience {instance.id} {signal_type}")
-
-    # Increment version for experiences
-    VersionedCacheManager.increment_version("experiences")
-
-    # Increment version for related models
-    # VersionedCacheManager.increment_version("files")
\ No newline at end of file
+from info.models import Blogs, Experiences, Projects
+from utils.cache.managers.invalidation import CacheInvalidationManager
+
+# Each cached model declares the relations its serialized payload reads.
+# Saves, deletes and m2m changes along these paths bump the model version on commit,
+# and the object version of each affected row for the per-object detail caches.
+CacheInvalidationManager.register("blogs", Blogs, depends_on=["cover_img", "skills"], track_objects=True)
+CacheInvalidationManager.register("experiences", Experiences, depends_on=["company_img"], track_objects=True)
+CacheInvalidationManager.register(
+    "projects",
+    Projects,
+    depends_on=["link_github", "link_website", "skills", "images", "images__image"],
+    track_objects=True
+)
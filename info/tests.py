@@ -1,3 +1,129 @@
-from django.test import TestCase
-
-# Create your tests here.
+import json
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from info.views import BlogsListView
+from utils.cache.managers.circuit_breaker import CircuitBreakerManager
+from utils.testing.budget import EndpointBudgetTestCase
+from utils.testing.fixtures import seed_portfolio
+
+# (SQL queries, Redis round trips) per request, cold then warm, and the largest payload accepted
+BUDGETS = {
+    "info:blogs-list": {"cold": (2, 14), "warm": (0, 1), "max_bytes": 40000},
+    "info:blogs-list?noPagination=true": {"cold": (2, 10), "warm": (0, 1), "max_bytes": 96000},
+    # Streamed: no response or page cache, the stream cache reads the manifest then each chunk
+    "info:blogs-list?noPagination=true&stream=json": {"cold": (2, 3), "warm": (0, 2), "max_bytes": 96000},
+    "info:blogs-search": {"cold": (2, 14), "warm": (0, 1), "max_bytes": 40000},
+    # Keyset page: one range query and the skills prefetch, no COUNT
+    "info:blogs-search?cursor=": {"cold": (2, 12), "warm": (0, 1), "max_bytes": 40000},
+    "info:blogs-detail": {"cold": (2, 6), "warm": (0, 1), "max_bytes": 4000},
+    "info:experiences-list": {"cold": (1, 14), "warm": (0, 1), "max_bytes": 8000},
+    "info:experiences-detail": {"cold": (1, 6), "warm": (0, 1), "max_bytes": 1600},
+    "info:projects-list": {"cold": (3, 14), "warm": (0, 1), "max_bytes": 12000},
+    "info:projects-detail": {"cold": (3, 6), "warm": (0, 1), "max_bytes": 2400},
+}
+
+
+class InfoEndpointBudgetTests(EndpointBudgetTestCase):
+    budgets = BUDGETS
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portfolio = seed_portfolio()
+
+    def test_blogs_list(self):
+        self.assert_within_budget("info:blogs-list")
+
+    def test_blogs_list_last_page(self):
+        self.assert_within_budget("info:blogs-list", "page=3")
+
+    def test_blogs_list_without_pagination(self):
+        self.assert_within_budget("info:blogs-list", "noPagination=true")
+
+    def test_blogs_list_without_pagination_streamed(self):
+        self.assert_within_budget("info:blogs-list", "noPagination=true&stream=json")
+
+    def test_blogs_list_streamed_like_in_memory(self):
+        url = reverse("info:blogs-list")
+        in_memory = json.loads(self.measure(url)["content"])
+        streamed = self.measure(f"{url}?stream=json")
+        self.assertEqual(json.loads(streamed["content"]), in_memory)
+        ndjson = self.measure(f"{url}?stream=ndjson")["content"].decode().splitlines()
+        self.assertEqual([json.loads(line) for line in ndjson], in_memory["data"]["data_list"])
+
+    def test_blogs_search_cursor(self):
+        self.assert_within_budget("info:blogs-search", "cursor=")
+
+    def test_blogs_search(self):
+        self.assert_within_budget("info:blogs-search", "kw=post")
+
+    def test_blogs_detail(self):
+        self.assert_within_budget("info:blogs-detail", id=self.portfolio["blogs"][0].id)
+
+    def test_experiences_list(self):
+        self.assert_within_budget("info:experiences-list")
+
+    def test_experiences_detail(self):
+        self.assert_within_budget("info:experiences-detail", id=self.portfolio["experiences"][0].id)
+
+    def test_projects_list(self):
+        self.assert_within_budget("info:projects-list")
+
+    def test_projects_detail(self):
+        self.assert_within_budget("info:projects-detail", id=self.portfolio["projects"][0].id)
+
+
+class StreamedListTests(TestCase):
+    """Lists streamed by CustomPagination without ?stream="""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portfolio = seed_portfolio(blogs=3, projects=1, experiences=1, skills=2)
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+
+    def test_not_streamed_unasked_by_default(self):
+        response = self.client.get(reverse("info:blogs-list"), {"noPagination": "true"})
+        self.assertFalse(response.streaming)
+
+    @override_settings(STREAM_ENABLED=True)
+    def test_browsable_api_never_streamed(self):
+        url = reverse("info:blogs-list")
+        json_request = RequestFactory().get(url, {"noPagination": "true"})
+        html_request = RequestFactory().get(url, {"noPagination": "true"}, HTTP_ACCEPT="text/html")
+        self.assertTrue(BlogsListView.is_streamed(json_request))
+        self.assertFalse(BlogsListView.is_streamed(html_request))
+
+        # The paginator gives the same answers once DRF negotiated the renderer
+        self.assertTrue(self.client.get(url, {"noPagination": "true"}).streaming)
+        response = self.client.get(url, {"noPagination": "true"}, HTTP_ACCEPT="text/html")
+        self.assertFalse(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/html; charset=utf-8")
+
+
+class ListCacheKeyTests(TestCase):
+    """Cache entries of the list views over the blogs table"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portfolio = seed_portfolio(blogs=10, projects=1, experiences=1, skills=3)
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+
+    def get_ids(self, url_name, params):
+        return [row["id"] for row in self.client.get(reverse(url_name), params).json()["data"]["data_list"]]
+
+    def test_list_and_search_do_not_share_entries(self):
+        blogs = self.portfolio["blogs"]
+        published = [blog.id for blog in sorted(blogs, key=lambda blog: blog.created_at, reverse=True) if blog.status]
+        # Neither view declares `ordering`, their querysets differ by filter and order
+        for params in ({"noPagination": "true"}, {}):
+            self.assertEqual(self.get_ids("info:blogs-list", params), sorted(blog.id for blog in blogs))
+            self.assertEqual(self.get_ids("info:blogs-search", params), published[:10])
+
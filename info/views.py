@@ -7,11 +7,15 @@ from configs.paginations import CustomPagination
 from configs.variable_response import response_data
 from utils.cache.mixins.query_cache_mixin import QueryCacheMixin
 from utils.cache.mixins.response_cache_mixin import ResponseCacheMixin
+from utils.db.eager_loading import EagerLoadingMixin
+from utils.logger import get_logger
 from .models import Blogs, Experiences, Projects
 from .serializers import BlogsSerializer, ExperiencesSerializer, ProjectsSerializer
 from .filters import BlogsFilter, ExperiencesFilter, ProjectsFilter
 from django.utils.translation import gettext_lazy as _
 
+logger = get_logger(__name__)
+
 class BlogsListView(ResponseCacheMixin, QueryCacheMixin, generics.GenericAPIView):
     queryset = Blogs.objects.all().order_by('id')
     serializer_class = BlogsSerializer
@@ -19,26 +23,29 @@ class BlogsListView(ResponseCacheMixin, QueryCacheMixin, generics.GenericAPIView
     filterset_class = BlogsFilter
     pagination_class = CustomPagination
     page_size = 10
-    cache_timeout = 600 # 10 minutes for blogs
-    response_cache_timeout = 300 # 10 minutes for blogs
+    cache_timeout = 3600 # 1 hour for blogs (invalidated on change)
+    response_cache_timeout = 3600 # 1 hour for blogs
+    response_cache_stale_ttl = 60  # Expired pages served 1 more minute while re-rendered in the background
+    cache_warm_pages = 3  # First 3 pages re-rendered after a change
 
     def get(self, request, *args, **kwargs):
         return self.handle_list_request(request)
 
-class BlogsDetailView(ResponseCacheMixin, generics.GenericAPIView):
+class BlogsDetailView(ResponseCacheMixin, EagerLoadingMixin, generics.GenericAPIView):
     queryset = Blogs.objects.all().order_by('id')
     serializer_class = BlogsSerializer
-    response_cache_timeout = 600  # 10 minutes for blog details
+    response_cache_timeout = 3600  # 1 hour for blog details
+    cache_object_kwarg = 'id'  # Only edits touching this blog invalidate it
 
     def get(self, request, id, *args, **kwargs):
-        print(f"Lấy chi tiết blog [{id}]")
+        logger.event("view.detail", "Lấy chi tiết blog", view=self.__class__.__name__, id=id)
         try:
             instance = self.get_queryset().get(id=id)
             serializer = self.serializer_class(instance)
-            print(f"Lấy blog thành công [{id}]")
+            logger.event("view.detail", "Lấy blog thành công", view=self.__class__.__name__, id=id)
             return response_data(data=serializer.data)
         except Blogs.DoesNotExist:
-            print(f"Blog ID [{id}] không hợp lệ")
+            logger.event("view.detail", "Blog ID không hợp lệ", view=self.__class__.__name__, id=id)
             return response_data(
                 status_code="ERROR",
                 message=_("Blog ID [{id}] không hợp lệ").format(id=id),
@@ -62,12 +69,14 @@ class BlogsSearchView(ResponseCacheMixin, QueryCacheMixin, generics.GenericAPIVi
     filterset_class = BlogsFilter
     pagination_class = CustomPagination
     page_size = 10
-    cache_timeout = 300  # 5 minutes for search results
-    response_cache_timeout = 300  # 5 minutes for search results
+    cache_timeout = 3600  # 1 hour for search results
+    response_cache_timeout = 3600  # 1 hour for search results
+    response_cache_stale_ttl = 60  # Expired pages served 1 more minute while re-rendered in the background
+    cache_warm_pages = 1  # Default published listing re-rendered after a change
 
     def get(self, request, *args, **kwargs):
         """Xử lý tìm kiếm blog"""
-        print(f"Tìm kiếm blog với params: {request.query_params}")
+        logger.event("view.search", "Tìm kiếm blog", params=request.query_params.dict())
 
         # Lấy parameters
         keyword = request.query_params.get('kw', '').strip()
@@ -76,11 +85,11 @@ class BlogsSearchView(ResponseCacheMixin, QueryCacheMixin, generics.GenericAPIVi
 
         # Nếu không có tham số tìm kiếm nào, trả về tất cả blog đã publish
         if not any([keyword, skills, skill_ids]):
-            print("Không có tham số tìm kiếm, trả về tất cả blog")
+            logger.event("view.search", "Không có tham số tìm kiếm, trả về tất cả blog")
             return self.handle_list_request(request)
 
         # Áp dụng filter và trả về kết quả
-        print(f"Thực hiện tìm kiếm với: keyword='{keyword}', skills='{skills}', skill_ids='{skill_ids}'")
+        logger.event("view.search", "Thực hiện tìm kiếm", keyword=keyword, skills=skills, skill_ids=skill_ids)
         return self.handle_list_request(request)
 
 class ExperiencesListView(ResponseCacheMixin, QueryCacheMixin, generics.GenericAPIView):
@@ -90,26 +99,27 @@ class ExperiencesListView(ResponseCacheMixin, QueryCacheMixin, generics.GenericA
     filterset_class = ExperiencesFilter
     pagination_class = CustomPagination
     page_size = 10
-    cache_timeout = 900 # 15 minutes for experiences
-    response_cache_timeout = 900  # 15 minutes for experiences
+    cache_timeout = 3600 # 1 hour for experiences (invalidated on change)
+    response_cache_timeout = 3600  # 1 hour for experiences
     
     def get(self, request, *args, **kwargs):
         return self.handle_list_request(request)
 
-class ExperiencesDetailView(ResponseCacheMixin, generics.GenericAPIView):
+class ExperiencesDetailView(ResponseCacheMixin, EagerLoadingMixin, generics.GenericAPIView):
     queryset = Experiences.objects.all().order_by('id')
     serializer_class = ExperiencesSerializer
-    response_cache_timeout = 900  # 15 minutes for experience details
+    response_cache_timeout = 3600  # 1 hour for experience details
+    cache_object_kwarg = 'id'  # Only edits touching this experience invalidate it
 
     def get(self, request, id, *args, **kwargs):
-        print(f"Lấy chi tiết experience [{id}]")
+        logger.event("view.detail", "Lấy chi tiết experience", view=self.__class__.__name__, id=id)
         try:
             instance = self.get_queryset().get(id=id)
             serializer = self.serializer_class(instance)
-            print(f"Lấy experience thành công [{id}]")
+            logger.event("view.detail", "Lấy experience thành công", view=self.__class__.__name__, id=id)
             return response_data(data=serializer.data)
         except Experiences.DoesNotExist:
-            print(f"Experience ID [{id}] không hợp lệ")
+            logger.event("view.detail", "Experience ID không hợp lệ", view=self.__class__.__name__, id=id)
             return response_data(
                 status_code="ERROR",
                 message=_("Experience ID [{id}] không hợp lệ").format(id=id),
@@ -123,25 +133,29 @@ class ProjectsListView(ResponseCacheMixin, QueryCacheMixin, generics.GenericAPIV
     filterset_class = ProjectsFilter
     pagination_class = CustomPagination
     page_size = 5
-    response_cache_timeout = 600  # 10 minutes for projects
+    cache_timeout = 3600 # 1 hour for projects (invalidated on change)
+    response_cache_timeout = 3600  # 1 hour for projects
+    response_cache_stale_ttl = 60  # Expired pages served 1 more minute while re-rendered in the background
+    cache_warm_pages = 3  # First 3 pages re-rendered after a change
 
     def get(self, request, *args, **kwargs):
         return self.handle_list_request(request)
 
-class ProjectsDetailView(ResponseCacheMixin, generics.GenericAPIView):
+class ProjectsDetailView(ResponseCacheMixin, EagerLoadingMixin, generics.GenericAPIView):
     queryset = Projects.objects.all().order_by('id')
     serializer_class = ProjectsSerializer
-    response_cache_timeout = 600  # 10 minutes for project details
+    response_cache_timeout = 3600  # 1 hour for project details
+    cache_object_kwarg = 'id'  # Only edits touching this project invalidate it
 
     def get(self, request, id, *args, **kwargs):
-        print(f"Lấy chi tiết project [{id}]")
+        logger.event("view.detail", "Lấy chi tiết project", view=self.__class__.__name__, id=id)
         try:
             instance = self.get_queryset().get(id=id)
             serializer = self.serializer_class(instance)
-            print(f"Lấy project thành công [{id}]")
+            logger.event("view.detail", "Lấy project thành công", view=self.__class__.__name__, id=id)
             return response_data(data=serializer.data)
         except Projects.DoesNotExist:
-            print(f"Project ID [{id}] không hợp lệ")
+            logger.event("view.detail", "Project ID không hợp lệ", view=self.__class__.__name__, id=id)
             return response_data(
                 status_code="ERROR",
                 message=_("Project ID [{id}] không hợp lệ").format(id=id),
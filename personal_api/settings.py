@@ -100,6 +100,17 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
 }
 
+# List pages serialized by compiled functions instead of DRF serializers (see utils/db/compiled_serializer.py)
+SERIALIZER_COMPILE_ENABLED = config('SERIALIZER_COMPILE_ENABLED', default=True, cast=bool)
+
+# Streamed list responses, ?stream=json or ?stream=ndjson always streams (see configs/paginations.py)
+STREAM_ENABLED = config('STREAM_ENABLED', default=False, cast=bool) # Also stream noPagination and large pages unasked
+STREAM_MIN_PAGE_SIZE = 1000 # Smallest page size streamed unasked, 0 only streams noPagination
+STREAM_CHUNK_SIZE = 500 # Rows per query and per cached chunk
+
+# Planner estimates replace COUNT(*) for views with count_strategy = 'estimated' (see utils/db/count_strategy.py)
+COUNT_ESTIMATE_MIN_ROWS = 100000 # Smaller unfiltered tables are counted exactly
+
 # CLOUDINARY
 CLOUDINARY_CLOUD_NAME = config('CLOUDINARY_CLOUD_NAME')
 
@@ -112,6 +123,12 @@ cloudinary.config(
     api_secret=config('CLOUDINARY_API_SECRET'),
 )
 
+CLOUDINARY_URL_MEMO_SIZE = 4096 # Delivery URLs memoized per worker (see utils/services/cloudinary_service.py)
+# Derived URLs stored on each File, run manage.py backfill_file_urls --force after changing them
+CLOUDINARY_DERIVED_TRANSFORMATIONS = {
+    "thumbnail": {"width": 400, "crop": "limit", "quality": "auto"},
+}
+
 CLOUDINARY_PATH = "https://res.cloudinary.com/" + CLOUDINARY_CLOUD_NAME + "/image/upload/v{0}/" # type: ignore
 
 CLOUDINARY_DIRECTORY = {
@@ -171,23 +188,138 @@ CACHES = {
         'BACKEND': 'django_redis.cache.RedisCache',
         'LOCATION': REDIS_URL,
         'OPTIONS': {
-            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            # Falls back to a local cache while Redis is down (see utils/cache/clients/resilient_client.py)
+            'CLIENT_CLASS': 'utils.cache.clients.resilient_client.ResilientRedisClient',
+            # Values are written in the compact codec once, not pickled on top of it (see utils/cache/managers/cache_codec.py)
+            'SERIALIZER': 'utils.cache.clients.codec_serializer.CodecSerializer',
+            # Fail fast so a slow Redis is treated like a down one
+            'SOCKET_CONNECT_TIMEOUT': config('REDIS_SOCKET_CONNECT_TIMEOUT', default=0.2, cast=float),
+            'SOCKET_TIMEOUT': config('REDIS_SOCKET_TIMEOUT', default=0.2, cast=float),
         },
         'TIMEOUT': 300, # 5 minutes
         'KEY_PREFIX': f'{APP_ENVIRONMENT}_cache',
     }
 }
 
+# Circuit breaker in front of Redis (see utils/cache/managers/circuit_breaker.py)
+CACHE_BREAKER_FAILURE_THRESHOLD = config('CACHE_BREAKER_FAILURE_THRESHOLD', default=5, cast=int) # Consecutive failures that open the circuit
+CACHE_BREAKER_RECOVERY_TIMEOUT = config('CACHE_BREAKER_RECOVERY_TIMEOUT', default=10, cast=int) # Seconds before Redis is probed again
+CACHE_BREAKER_REPLAY_INTERVAL = 60 # Seconds between background replays of version bumps stored by workers that may have died, 0 leaves it to the sweeper
+CACHE_FALLBACK_MAX_BYTES = config('CACHE_FALLBACK_MAX_BYTES', default=16 * 1024 * 1024, cast=int) # 16 MB
+CACHE_FALLBACK_MAX_ENTRIES = 1024
+CACHE_FALLBACK_TIMEOUT = 30 # Values written while Redis is down live at most 30 seconds
+
+# Latency and failures injected into Redis commands, local testing only (see utils/cache/clients/fault_injection.py)
+CACHE_FAULT_INJECTION = config('CACHE_FAULT_INJECTION', default=False, cast=bool)
+CACHE_FAULT_LATENCY = config('CACHE_FAULT_LATENCY', default=0.0, cast=float) # Seconds per command
+CACHE_FAULT_FAILURE_RATE = config('CACHE_FAULT_FAILURE_RATE', default=0.0, cast=float) # 0 to 1
+if CACHE_FAULT_INJECTION:
+    CACHES['default']['OPTIONS']['CONNECTION_POOL_CLASS'] = 'utils.cache.clients.fault_injection.FaultInjectingConnectionPool'
+
+# Per-worker L1 cache in front of Redis (see utils/cache/managers/local_cache.py)
+CACHE_L1_ENABLED = config('CACHE_L1_ENABLED', default=False, cast=bool)
+CACHE_L1_MAX_BYTES = config('CACHE_L1_MAX_BYTES', default=32 * 1024 * 1024, cast=int) # 32 MB
+CACHE_L1_MAX_ENTRIES = config('CACHE_L1_MAX_ENTRIES', default=1024, cast=int)
+CACHE_L1_TIMEOUT = config('CACHE_L1_TIMEOUT', default=60, cast=int) # 1 minute
+CACHE_L1_VERSION_TTL = config('CACHE_L1_VERSION_TTL', default=5, cast=int) # Re-read versions every 5 seconds
+
+# Single-flight protection for cache misses (see utils/cache/managers/single_flight.py)
+CACHE_SINGLE_FLIGHT_LOCK_TIMEOUT = 10 # Lock expires if the computing worker dies
+CACHE_SINGLE_FLIGHT_WAIT_TIMEOUT = 5 # Waiters compute themselves after this many seconds
+
+# Background refresh pool for stale-while-revalidate (see utils/cache/managers/background_refresh.py)
+CACHE_BACKGROUND_REFRESH_WORKERS = config('CACHE_BACKGROUND_REFRESH_WORKERS', default=2, cast=int)
+CACHE_BACKGROUND_REFRESH_MAX_PENDING = 100
+
+# Full-page cache of rendered responses (see utils/cache/middlewares/page_cache_middleware.py)
+CACHE_PAGE_ENABLED = config('CACHE_PAGE_ENABLED', default=True, cast=bool)
+
+# Re-render list pages in the background after a version bump (see utils/cache/managers/cache_warmer.py)
+CACHE_WARM_ENABLED = config('CACHE_WARM_ENABLED', default=True, cast=bool)
+
+# Incremental sweep of versioned keys orphaned by version bumps (see utils/cache/managers/cache_sweeper.py)
+CACHE_SWEEP_INTERVAL = config('CACHE_SWEEP_INTERVAL', default=600, cast=int) # Seconds between background sweeps, 0 leaves it to manage.py sweep_cache
+CACHE_SWEEP_MAX_KEYS = 10000 # Keys scanned per background sweep
+CACHE_SWEEP_BATCH_SIZE = 500 # SCAN COUNT hint
+CACHE_SWEEP_PAUSE = 0.01 # Seconds between batches
+CACHE_SWEEP_MEMORY_BUDGET = config('CACHE_SWEEP_MEMORY_BUDGET', default=0, cast=int) # Bytes of Redis memory above which current entries are swept too, 0 disables
+
+# Keys sampled per report by manage.py cache_stats and /admin/cache-stats (see utils/cache/managers/cache_stats.py)
+CACHE_STATS_MAX_KEYS = 50000
+
+# Surrogate keys (cache tags) on cached responses for a CDN or reverse proxy (see utils/cache/managers/surrogate_key.py)
+CACHE_SURROGATE_KEYS_ENABLED = config('CACHE_SURROGATE_KEYS_ENABLED', default=True, cast=bool)
+CACHE_SURROGATE_KEY_HEADER = config('CACHE_SURROGATE_KEY_HEADER', default='Surrogate-Key') # Fastly and nginx, Varnish xkey reads xkey
+CACHE_SURROGATE_KEY_MAX = 256 # Larger responses are only tagged with their model names
+CACHE_SURROGATE_MAX_AGE = config('CACHE_SURROGATE_MAX_AGE', default=0, cast=int) # Surrogate-Control lifetime, 0 leaves it to Cache-Control
+
+# Tag purges sent to the CDN or reverse proxy after invalidation (see utils/cache/managers/cache_purge.py)
+CACHE_PURGE_URL = config('CACHE_PURGE_URL', default='') # Empty disables purging
+CACHE_PURGE_METHOD = config('CACHE_PURGE_METHOD', default='PURGE')
+CACHE_PURGE_KEY_HEADER = config('CACHE_PURGE_KEY_HEADER', default='Surrogate-Key')
+CACHE_PURGE_TOKEN = config('CACHE_PURGE_TOKEN', default='')
+CACHE_PURGE_TOKEN_HEADER = config('CACHE_PURGE_TOKEN_HEADER', default='Authorization') # Fastly uses Fastly-Key
+CACHE_PURGE_BATCH_SIZE = 256 # Keys per purge request
+CACHE_PURGE_DELAY = 0.5 # Seconds to coalesce the keys of a burst of saves
+CACHE_PURGE_TIMEOUT = 5
+CACHE_PURGE_RETRY_INTERVAL = 5 # Seconds before failed purges are retried
+CACHE_PURGE_MAX_PENDING = 10000
+
+# Encoding of cached payloads (see utils/cache/managers/cache_codec.py)
+CACHE_VALUE_CODEC = config('CACHE_VALUE_CODEC', default='msgpack') # msgpack, json or pickle
+CACHE_VALUE_COMPRESS_MIN_BYTES = 1024 # zlib compress payloads from 1 KB
+CACHE_VALUE_COMPRESS_LEVEL = 1
+CACHE_VALUE_CHUNK_BYTES = 512 * 1024 # Split payloads into 512 KB chunks
+
+# Prometheus metrics aggregated in Redis and served on /metrics (see utils/cache/managers/metrics.py)
+CACHE_METRICS_ENABLED = config('CACHE_METRICS_ENABLED', default=True, cast=bool)
+CACHE_METRICS_FLUSH_INTERVAL = 10 # Seconds between flushes of a worker's values to Redis
+METRICS_TOKEN = config('METRICS_TOKEN', default='') # Bearer token for scrapes, /metrics is only open in DEBUG without it
+
+# Logging, records are formatted and written by a background thread (see utils/logger.py)
+LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+LOG_JSON = config('LOG_JSON', default=not DEBUG, cast=bool) # JSON lines in production, readable text in DEBUG
+LOG_QUEUE_SIZE = 10000 # Records beyond this are dropped rather than blocking requests
+
+# Sample rate per event category, the longest matching prefix wins, 0 turns a category off
+LOG_EVENTS = {
+    "cache.hit": config('LOG_CACHE_HIT_SAMPLE_RATE', default=0.01, cast=float),
+    "cache.store": config('LOG_CACHE_STORE_SAMPLE_RATE', default=0.1, cast=float),
+    "cache": 1.0,
+    "view": config('LOG_VIEW_SAMPLE_RATE', default=0.1, cast=float),
+    "error": 1.0,
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "async": {
+            "()": "utils.logger.AsyncQueueHandler",
+            "json_format": LOG_JSON,
+            "queue_size": LOG_QUEUE_SIZE,
+        },
+    },
+    "loggers": {
+        name: {"handlers": ["async"], "level": LOG_LEVEL, "propagate": False}
+        for name in ("common", "configs", "helpers", "info", "utils")
+    },
+}
+
 # Session configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
 
 # Middleware configuration
 MIDDLEWARE = [
+    # Measures every request, including page cache hits
+    "utils.cache.middlewares.metrics_middleware.MetricsMiddleware",
     "csp.middleware.CSPMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    # Serves pre-rendered cached pages before sessions, CSRF and auth run
+    "utils.cache.middlewares.page_cache_middleware.PageCacheMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -0,0 +1,38 @@
+"""
+Settings for the test suite: in-memory SQLite and an in-process fake Redis, so tests run offline.
+
+    pip install -r requirements-dev.txt
+    python manage.py test --settings=personal_api.test_settings
+"""
+import os
+
+# Values the base settings require without defaults
+os.environ.setdefault("DATABASE_URL", "sqlite://:memory:")
+os.environ.setdefault("CLOUDINARY_CLOUD_NAME", "test")
+os.environ.setdefault("CLOUDINARY_API_KEY", "test")
+os.environ.setdefault("CLOUDINARY_API_SECRET", "test")
+
+from fakeredis import FakeRedisConnection, FakeServer
+
+from personal_api.settings import *  # noqa: E402,F401,F403
+from personal_api.settings import CACHES
+
+CACHES["default"]["OPTIONS"]["CONNECTION_POOL_KWARGS"] = {
+    "connection_class": FakeRedisConnection,
+    "server": FakeServer(),
+}
+
+ALLOWED_HOSTS = ["*"]
+SECURE_SSL_REDIRECT = False
+
+# Nothing may touch Redis outside the request being measured
+CACHE_WARM_ENABLED = False
+CACHE_METRICS_ENABLED = False
+CACHE_SWEEP_INTERVAL = 0
+CACHE_PURGE_URL = ""
+CACHE_L1_ENABLED = False
+# No replay thread reading the test database, tests replay stored version bumps themselves
+CACHE_BREAKER_REPLAY_INTERVAL = 0
+
+# Keep test output readable, errors are still logged
+LOG_EVENTS = {"app": 0, "cache": 0, "view": 0, "error": 1.0}
@@ -18,8 +18,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
+from common.views import get_cache_stats, get_metrics
+
 urlpatterns = [
+    path("admin/cache-stats", get_cache_stats, name="cache-stats"),
     path("admin/", admin.site.urls),
     path('v1/', include('common.urls')),
     path('v1/', include('info.urls')),
+    path("metrics", get_metrics, name="metrics"),
 ]
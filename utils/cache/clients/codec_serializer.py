@@ -0,0 +1,22 @@
+from django_redis.serializers.base import BaseSerializer
+
+from utils.cache.managers.cache_codec import CacheCodecManager, EncodedBytes
+
+
+class CodecSerializer(BaseSerializer):
+    """
+    django-redis serializer encoding values with `CacheCodecManager`
+
+    Values already encoded by `CacheCodecManager` (to measure or chunk them
+    before writing) are written as they are instead of being serialized a
+    second time. Configure it as `SERIALIZER`, without a `COMPRESSOR`: the
+    codec compresses large payloads itself.
+    """
+
+    def dumps(self, value):
+        if isinstance(value, EncodedBytes):
+            return bytes(value)
+        return bytes(CacheCodecManager.encode(value))
+
+    def loads(self, value):
+        return CacheCodecManager.decode(value)
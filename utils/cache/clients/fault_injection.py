@@ -0,0 +1,78 @@
+import random
+import time
+
+from django.conf import settings
+from redis.connection import Connection, ConnectionPool
+from redis.exceptions import ConnectionError, TimeoutError
+
+
+class FaultInjectionMixin:
+    """
+    Redis connection mixin that adds latency and drops commands on purpose
+
+    Used to exercise the circuit breaker against a local Redis (or a fake
+    one) without taking the server down. Latency above the socket timeout
+    ends in a `TimeoutError`, like a hung server would.
+
+    The defaults come from `CACHE_FAULT_LATENCY` and `CACHE_FAULT_FAILURE_RATE`
+    and can be changed at runtime on `FaultInjectionMixin` to simulate an
+    outage and its recovery.
+
+    Example:
+        FaultInjectionMixin.failure_rate = 1.0  # Redis is "down"
+        FaultInjectionMixin.failure_rate = 0.0  # and back
+    """
+    latency = None
+    failure_rate = None
+
+    def send_packed_command(self, command, check_health=True):
+        latency = FaultInjectionMixin.get_latency()
+        if latency:
+            socket_timeout = getattr(self, "socket_timeout", None)
+            if socket_timeout is not None and latency >= socket_timeout:
+                time.sleep(socket_timeout)
+                self.disconnect()
+                raise TimeoutError("Injected timeout")
+            time.sleep(latency)
+        if random.random() < FaultInjectionMixin.get_failure_rate():
+            self.disconnect()
+            raise ConnectionError("Injected connection failure")
+        return super().send_packed_command(command, check_health=check_health)
+
+    @staticmethod
+    def get_latency():
+        """Get injected latency per command
+
+        Returns:
+            float: Seconds
+        """
+        if FaultInjectionMixin.latency is not None:
+            return FaultInjectionMixin.latency
+        return getattr(settings, "CACHE_FAULT_LATENCY", 0.0)
+
+    @staticmethod
+    def get_failure_rate():
+        """Get the share of commands that fail
+
+        Returns:
+            float: Rate between 0 and 1
+        """
+        if FaultInjectionMixin.failure_rate is not None:
+            return FaultInjectionMixin.failure_rate
+        return getattr(settings, "CACHE_FAULT_FAILURE_RATE", 0.0)
+
+
+class FaultInjectingConnectionPool(ConnectionPool):
+    """
+    Connection pool whose connections inject faults
+
+    Set as `CONNECTION_POOL_CLASS`, the configured connection class (TCP, SSL,
+    unix socket or fakeredis) gets `FaultInjectionMixin` mixed in.
+    """
+
+    def __init__(self, connection_class=Connection, **kwargs):
+        if not issubclass(connection_class, FaultInjectionMixin):
+            connection_class = type(
+                f"FaultInjecting{connection_class.__name__}", (FaultInjectionMixin, connection_class), {}
+            )
+        super().__init__(connection_class=connection_class, **kwargs)
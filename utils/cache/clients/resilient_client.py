@@ -0,0 +1,223 @@
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.client import DefaultClient
+
+from utils.cache.managers.cache_codec import EncodedBytes
+from utils.cache.managers.circuit_breaker import CircuitBreakerManager
+
+
+class ResilientRedisClient(DefaultClient):
+    """
+    django-redis client that keeps serving while Redis is down or slow
+
+    Every command goes through `CircuitBreakerManager`. When a command fails
+    with a connection error or timeout, or the circuit is open, the call is
+    answered by the bounded per-process fallback cache instead: reads hit it
+    (a miss sends the request to the database), writes are kept there for at
+    most `CACHE_FALLBACK_TIMEOUT` seconds, and commands with no local meaning
+    return an empty result.
+
+    Configure it as `CLIENT_CLASS` together with short `SOCKET_CONNECT_TIMEOUT`
+    and `SOCKET_TIMEOUT` options so a hung Redis costs milliseconds, not seconds.
+    """
+
+    def get(self, key, default=None, version=None, client=None):
+        def fallback():
+            value = self.get_fallback().get(self.get_fallback_key(key, version))
+            return default if value is None else self.decode_fallback(value)
+
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).get(key, default=default, version=version, client=client),
+            fallback,
+        )
+
+    def get_many(self, keys, version=None, client=None):
+        def fallback():
+            found = {}
+            for key in keys:
+                value = self.get_fallback().get(self.get_fallback_key(key, version))
+                if value is not None:
+                    found[key] = self.decode_fallback(value)
+            return found
+
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).get_many(keys, version=version, client=client),
+            fallback,
+        )
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None, nx=False, xx=False):
+        def fallback():
+            fallback_key = self.get_fallback_key(key, version)
+            if nx:
+                return self.get_fallback().add(fallback_key, value, self.get_fallback_timeout(timeout))
+            return self.set_fallback(fallback_key, value, timeout)
+
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).set(
+                key, value, timeout=timeout, version=version, client=client, nx=nx, xx=xx
+            ),
+            fallback,
+        )
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).add(key, value, timeout=timeout, version=version, client=client),
+            lambda: self.get_fallback().add(
+                self.get_fallback_key(key, version), value, self.get_fallback_timeout(timeout)
+            ),
+        )
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        def fallback():
+            for key, value in data.items():
+                self.set_fallback(self.get_fallback_key(key, version), value, timeout)
+
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).set_many(data, timeout=timeout, version=version, client=client),
+            fallback,
+        )
+
+    def delete(self, key, version=None, prefix=None, client=None):
+        # The local copy goes too, so it cannot outlive the Redis one
+        self.get_fallback().delete(self.get_fallback_key(key, version))
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).delete(key, version=version, prefix=prefix, client=client),
+            lambda: 0,
+        )
+
+    def delete_many(self, keys, version=None, client=None):
+        for key in keys:
+            self.get_fallback().delete(self.get_fallback_key(key, version))
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).delete_many(keys, version=version, client=client),
+            lambda: 0,
+        )
+
+    def delete_pattern(self, pattern, version=None, prefix=None, client=None, itersize=None):
+        def fallback():
+            self.get_fallback().clear()
+            return 0
+
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).delete_pattern(
+                pattern, version=version, prefix=prefix, client=client, itersize=itersize
+            ),
+            fallback,
+        )
+
+    def incr(self, key, delta=1, version=None, client=None, ignore_key_check=False):
+        def fallback():
+            fallback_key = self.get_fallback_key(key, version)
+            value = self.get_fallback().get(fallback_key)
+            if value is None:
+                raise ValueError(f"Key '{key}' not found")
+            self.get_fallback().set(fallback_key, value + delta)
+            return value + delta
+
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).incr(
+                key, delta=delta, version=version, client=client, ignore_key_check=ignore_key_check
+            ),
+            fallback,
+        )
+
+    def decr(self, key, delta=1, version=None, client=None):
+        return self.incr(key, delta=-delta, version=version, client=client)
+
+    def has_key(self, key, version=None, client=None):
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).has_key(key, version=version, client=client),
+            lambda: self.get_fallback().get(self.get_fallback_key(key, version)) is not None,
+        )
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None, client=None):
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).touch(key, timeout=timeout, version=version, client=client),
+            lambda: False,
+        )
+
+    def ttl(self, key, version=None, client=None):
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).ttl(key, version=version, client=client)
+        )
+
+    def expire(self, key, timeout, version=None, client=None):
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).expire(key, timeout, version=version, client=client),
+            lambda: False,
+        )
+
+    def keys(self, search, version=None, client=None):
+        return CircuitBreakerManager.call(
+            lambda: super(ResilientRedisClient, self).keys(search, version=version, client=client),
+            list,
+        )
+
+    def clear(self, client=None):
+        self.get_fallback().clear()
+        return CircuitBreakerManager.call(lambda: super(ResilientRedisClient, self).clear(client=client))
+
+    def get_fallback(self):
+        """Get the per-process cache used while Redis is unavailable
+
+        Returns:
+            LocalLRUCache: Fallback cache
+        """
+        return CircuitBreakerManager.get_fallback_cache()
+
+    def decode_fallback(self, value):
+        """Decode a value kept in the fallback cache the way a Redis read would
+
+        Args:
+            value (any): Stored value, bytes already encoded by the codec are decoded
+
+        Returns:
+            any: Value
+        """
+        if isinstance(value, EncodedBytes):
+            return self.decode(bytes(value))
+        return value
+
+    def get_fallback_key(self, key, version=None):
+        """Get the fallback cache key, the same string Redis would store
+
+        Args:
+            key (str): Cache key
+            version (int, optional): Cache version
+
+        Returns:
+            str: Prefixed key
+        """
+        return str(self.make_key(key, version=version))
+
+    def get_fallback_timeout(self, timeout):
+        """Cap a timeout to the fallback cache lifetime
+
+        Args:
+            timeout (int|None): Requested timeout, None for no expiry
+
+        Returns:
+            int|None: Timeout in seconds, None for the fallback default
+        """
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self._backend.default_timeout
+        limit = self.get_fallback().default_timeout
+        if timeout is None or timeout > limit:
+            return None
+        return timeout
+
+    def set_fallback(self, fallback_key, value, timeout):
+        """Store a value in the fallback cache, a non-positive timeout deletes it
+
+        Args:
+            fallback_key (str): Prefixed key
+            value (any): Value to store
+            timeout (int|None): Requested timeout
+
+        Returns:
+            bool: True if stored
+        """
+        timeout = self.get_fallback_timeout(timeout)
+        if timeout is not None and timeout <= 0:
+            self.get_fallback().delete(fallback_key)
+            return False
+        return self.get_fallback().set(fallback_key, value, timeout)
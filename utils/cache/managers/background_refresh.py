@@ -0,0 +1,163 @@
+import io
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connections
+from django.utils.http import urlencode
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BackgroundRefreshManager:
+    """
+    Bounded background thread pool for refreshing cache entries off the request path
+
+    Refreshes are deduplicated per key inside a process (a key already queued is
+    not queued again) and across processes (a short-lived Redis lock per key,
+    a worker that does not get it skips the refresh).
+    """
+    _executor = None
+    _pid = None
+    _pending = set()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_lock_key(cache_key):
+        """Generate lock key for a background refresh
+
+        Args:
+            cache_key (str): Cache key being refreshed
+
+        Returns:
+            str: Lock key
+        """
+        return f"refresh_lock_{cache_key}"
+
+    @staticmethod
+    def get_executor():
+        """Get the worker-local thread pool, rebuilding it after a fork
+
+        Returns:
+            ThreadPoolExecutor: Thread pool
+        """
+        pid = os.getpid()
+        if BackgroundRefreshManager._executor is None or BackgroundRefreshManager._pid != pid:
+            with BackgroundRefreshManager._lock:
+                if BackgroundRefreshManager._executor is None or BackgroundRefreshManager._pid != pid:
+                    BackgroundRefreshManager._executor = ThreadPoolExecutor(
+                        max_workers=getattr(settings, "CACHE_BACKGROUND_REFRESH_WORKERS", 2),
+                        thread_name_prefix="cache-refresh",
+                    )
+                    BackgroundRefreshManager._pending = set()
+                    BackgroundRefreshManager._pid = pid
+        return BackgroundRefreshManager._executor
+
+    @staticmethod
+    def build_request(path, params, host, secure=False, accept="application/json"):
+        """
+        Build an anonymous GET request for work done off the request path
+
+        A background task must not hold on to the request being answered: its
+        body, session and user belong to a response that may already be sent.
+        The request is built from a minimal WSGI environ, the same way a WSGI
+        server hands one to the handler.
+
+        Args:
+            path (str): URL path
+            params (dict|QueryDict): Query parameters
+            host (str): Host name accepted by ALLOWED_HOSTS
+            secure (bool): Build an HTTPS request, so SECURE_SSL_REDIRECT lets it through
+            accept (str): Accept header
+
+        Returns:
+            WSGIRequest: New request
+        """
+        return WSGIRequest({
+            "REQUEST_METHOD": "GET",
+            "SCRIPT_NAME": "",
+            # WSGI carries the path as UTF-8 bytes decoded as latin-1
+            "PATH_INFO": path.encode().decode("iso-8859-1"),
+            "QUERY_STRING": urlencode(params or {}, doseq=True),
+            "SERVER_NAME": host,
+            "SERVER_PORT": "443" if secure else "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "REMOTE_ADDR": "127.0.0.1",
+            "HTTP_HOST": host,
+            "HTTP_ACCEPT": accept,
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "https" if secure else "http",
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": True,
+            "wsgi.run_once": False,
+        })
+
+    @staticmethod
+    def submit(cache_key, refresh):
+        """
+        Queue a refresh unless one is already queued or running for the key
+
+        Args:
+            cache_key (str): Cache key being refreshed
+            refresh (callable): Recomputes and stores the entry
+
+        Returns:
+            bool: True if queued
+        """
+        executor = BackgroundRefreshManager.get_executor()
+        max_pending = getattr(settings, "CACHE_BACKGROUND_REFRESH_MAX_PENDING", 100)
+        with BackgroundRefreshManager._lock:
+            pending = BackgroundRefreshManager._pending
+            if cache_key in pending or len(pending) >= max_pending:
+                return False
+            pending.add(cache_key)
+
+        executor.submit(BackgroundRefreshManager.run, cache_key, refresh)
+        return True
+
+    @staticmethod
+    def run(cache_key, refresh):
+        """Run a refresh under the cross-process lock
+
+        Args:
+            cache_key (str): Cache key being refreshed
+            refresh (callable): Recomputes and stores the entry
+        """
+        try:
+            BackgroundRefreshManager.run_locked(cache_key, refresh)
+        except Exception as e:
+            logger.error("cache.refresh", "Background refresh failed", exc_info=e, key=cache_key[:50])
+        finally:
+            with BackgroundRefreshManager._lock:
+                BackgroundRefreshManager._pending.discard(cache_key)
+            connections.close_all()
+
+    @staticmethod
+    def run_locked(cache_key, refresh):
+        """Run a refresh in the calling thread if no other process is refreshing the key
+
+        Args:
+            cache_key (str): Cache key being refreshed
+            refresh (callable): Recomputes and stores the entry
+
+        Returns:
+            bool: True if this process ran the refresh
+        """
+        lock_key = BackgroundRefreshManager.get_lock_key(cache_key)
+        lock_timeout = getattr(settings, "CACHE_SINGLE_FLIGHT_LOCK_TIMEOUT", 10)
+        if not cache.add(lock_key, 1, timeout=lock_timeout):
+            return False
+        try:
+            logger.event("cache.refresh", "Background refresh started", key=cache_key[:50])
+            refresh()
+        finally:
+            cache.delete(lock_key)
+        return True
@@ -0,0 +1,273 @@
+import json
+import pickle
+import zlib
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# Types msgpack and JSON give back unchanged, or as the plain dict/list they compare equal to
+SCALAR_TYPES = {str, int, float, bool, type(None)}
+DICT_TYPES = {dict, OrderedDict, ReturnDict}
+LIST_TYPES = {list, ReturnList}
+
+
+class EncodedBytes(bytes):
+    """Bytes produced by `CacheCodecManager.encode`, written to Redis as they are by `CodecSerializer`"""
+
+
+class ChunkedValue:
+    """Manifest of a value split into chunks by `CacheCodecManager.set`, as read back from the cache
+
+    Attributes:
+        count (int): Number of chunks
+    """
+
+    def __init__(self, count):
+        self.count = count
+
+
+class CacheCodecManager:
+    """
+    Compact byte encoding for cached payloads
+
+    Values are stored as bytes with a two byte header: the codec and the
+    compression. Payloads are encoded with msgpack (or JSON when msgpack is not
+    installed) when they only hold dicts with str keys, lists, str, int,
+    float, bool and None, see `is_plain`. Anything else (tuples, int keys,
+    datetimes, model instances, str subclasses such as SafeString) is pickled,
+    so every value reads back exactly as it was set. Bytes are stored as they are.
+    Payloads above `CACHE_VALUE_COMPRESS_MIN_BYTES` are zlib compressed, and
+    payloads above `CACHE_VALUE_CHUNK_BYTES` are split into chunk keys
+    referenced by a small manifest stored under the original key.
+
+    The codec is the serializer of the django-redis client (see
+    `utils/cache/clients/codec_serializer.py`), so every value is encoded
+    exactly once. Values pickled by django-redis before are still read.
+
+    Settings:
+        CACHE_VALUE_CODEC: "msgpack", "json" or "pickle" (default: "msgpack")
+        CACHE_VALUE_COMPRESS_MIN_BYTES: Compression threshold, 0 disables it (default: 1024)
+        CACHE_VALUE_COMPRESS_LEVEL: zlib level (default: 1)
+        CACHE_VALUE_CHUNK_BYTES: Chunk size, 0 disables chunking (default: 512 KB)
+    """
+    MSGPACK = b"M"
+    JSON = b"J"
+    PICKLE = b"P"
+    BYTES = b"B"
+    CHUNKED = b"C"
+    RAW = b"0"
+    ZLIB = b"z"
+
+    @staticmethod
+    def get_codec():
+        """Get the configured codec, JSON when msgpack is not installed
+
+        Returns:
+            bytes: Codec marker
+        """
+        codec = getattr(settings, "CACHE_VALUE_CODEC", "msgpack")
+        if codec == "pickle":
+            return CacheCodecManager.PICKLE
+        if codec == "msgpack" and msgpack is not None:
+            return CacheCodecManager.MSGPACK
+        return CacheCodecManager.JSON
+
+    @staticmethod
+    def encode(data, codec=None):
+        """
+        Encode a value to bytes
+
+        Args:
+            data (any): Value to encode
+            codec (bytes, optional): Codec marker, configured codec when omitted
+
+        Returns:
+            EncodedBytes: Header followed by the (compressed) payload
+        """
+        if codec is None and isinstance(data, bytes):
+            codec = CacheCodecManager.BYTES
+        codec = codec or CacheCodecManager.get_codec()
+        if codec in (CacheCodecManager.MSGPACK, CacheCodecManager.JSON) and not CacheCodecManager.is_plain(data):
+            codec = CacheCodecManager.PICKLE
+        payload = None
+        try:
+            if codec == CacheCodecManager.BYTES:
+                payload = bytes(data)
+            elif codec == CacheCodecManager.MSGPACK:
+                payload = msgpack.packb(data, use_bin_type=True)
+            elif codec == CacheCodecManager.JSON:
+                payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+        except (TypeError, ValueError, OverflowError):
+            payload = None
+        if payload is None:
+            codec = CacheCodecManager.PICKLE
+            payload = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+
+        compression = CacheCodecManager.RAW
+        min_bytes = getattr(settings, "CACHE_VALUE_COMPRESS_MIN_BYTES", 1024)
+        if min_bytes and len(payload) >= min_bytes:
+            compressed = zlib.compress(payload, getattr(settings, "CACHE_VALUE_COMPRESS_LEVEL", 1))
+            if len(compressed) < len(payload):
+                payload, compression = compressed, CacheCodecManager.ZLIB
+        return EncodedBytes(codec + compression + payload)
+
+    @staticmethod
+    def is_plain(data):
+        """
+        Check whether msgpack and JSON give a value back unchanged
+
+        Args:
+            data (any): Value to encode
+
+        Returns:
+            bool: True for dicts with str keys, lists, str, int, float, bool and None, nested
+        """
+        stack = [data]
+        while stack:
+            value = stack.pop()
+            value_type = type(value)
+            if value_type in SCALAR_TYPES:
+                continue
+            if value_type in LIST_TYPES:
+                stack.extend(value)
+            elif value_type in DICT_TYPES:
+                if any(type(key) is not str for key in value):
+                    return False
+                stack.extend(value.values())
+            else:
+                return False
+        return True
+
+    @staticmethod
+    def decode(value):
+        """
+        Decode bytes produced by `encode`
+
+        Args:
+            value (bytes): Encoded value
+
+        Returns:
+            any: Decoded value, a `ChunkedValue` for the manifest of a chunked value
+        """
+        codec, compression, payload = value[:1], value[1:2], value[2:]
+        if compression not in (CacheCodecManager.RAW, CacheCodecManager.ZLIB):
+            return CacheCodecManager.decode_legacy(value)
+        if compression == CacheCodecManager.ZLIB:
+            payload = zlib.decompress(payload)
+        if codec == CacheCodecManager.MSGPACK:
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+        if codec == CacheCodecManager.JSON:
+            return json.loads(payload)
+        if codec == CacheCodecManager.BYTES:
+            return payload
+        if codec == CacheCodecManager.CHUNKED:
+            return ChunkedValue(int(payload))
+        if codec == CacheCodecManager.PICKLE:
+            return pickle.loads(payload)
+        return CacheCodecManager.decode_legacy(value)
+
+    @staticmethod
+    def decode_legacy(value):
+        """
+        Decode a value pickled by the default django-redis serializer
+
+        Args:
+            value (bytes): Pickled value
+
+        Returns:
+            any: Unpickled value, decoded again when it holds a payload of this codec
+        """
+        data = pickle.loads(value)
+        if isinstance(data, bytes) and data[1:2] in (CacheCodecManager.RAW, CacheCodecManager.ZLIB):
+            return CacheCodecManager.decode(data)
+        return data
+
+    @staticmethod
+    def get_chunk_key(key, index):
+        """Generate cache key of one chunk
+
+        Args:
+            key (str): Cache key of the value
+            index (int): Chunk index
+
+        Returns:
+            str: Chunk cache key
+        """
+        return f"{key}_chunk{index}"
+
+    @staticmethod
+    def set(key, data, timeout=None):
+        """
+        Encode and store a value, split into chunks when large
+
+        The value is encoded here rather than by the client, so its size is
+        known before writing it. Chunks are written before the manifest, so a
+        reader never sees a manifest whose chunks were not stored.
+
+        Args:
+            key (str): Cache key
+            data (any): Value to store
+            timeout (int, optional): Timeout in seconds
+
+        Returns:
+            int: Stored size in bytes
+        """
+        value = CacheCodecManager.encode(data)
+        chunk_bytes = getattr(settings, "CACHE_VALUE_CHUNK_BYTES", 512 * 1024)
+        if not chunk_bytes or len(value) <= chunk_bytes:
+            cache.set(key, value, timeout=timeout)
+            return len(value)
+
+        # Slices of an encoded payload, stored as bytes without compressing them again
+        chunks = {
+            CacheCodecManager.get_chunk_key(key, index): EncodedBytes(
+                CacheCodecManager.BYTES + CacheCodecManager.RAW + value[start:start + chunk_bytes]
+            )
+            for index, start in enumerate(range(0, len(value), chunk_bytes))
+        }
+        cache.set_many(chunks, timeout=timeout)
+        manifest = CacheCodecManager.CHUNKED + CacheCodecManager.RAW + str(len(chunks)).encode()
+        cache.set(key, EncodedBytes(manifest), timeout=timeout)
+        return len(value)
+
+    @staticmethod
+    def get(key):
+        """
+        Get and decode a value
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            any: Decoded value or None on miss
+        """
+        return CacheCodecManager.load(key, cache.get(key))
+
+    @staticmethod
+    def load(key, value):
+        """
+        Complete a value read from the cache, fetching its chunks if needed
+
+        Args:
+            key (str): Cache key the value was read from
+            value (any): Value decoded by the client
+
+        Returns:
+            any: Decoded value, None on miss or when a chunk was evicted
+        """
+        if not isinstance(value, ChunkedValue):
+            return value
+
+        chunk_keys = [CacheCodecManager.get_chunk_key(key, index) for index in range(value.count)]
+        chunks = cache.get_many(chunk_keys)
+        if len(chunks) != len(chunk_keys):
+            return None
+        return CacheCodecManager.decode(b"".join(chunks[chunk_key] for chunk_key in chunk_keys))
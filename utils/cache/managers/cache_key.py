@@ -0,0 +1,171 @@
+from django.urls import Resolver404, resolve
+from django_filters import MultipleChoiceFilter
+
+
+class CacheKeyManager:
+    """
+    Canonical query parameters for cache keys
+
+    Only parameters that can change a view's output are kept: the fields of
+    its `filterset_class`, the pagination parameters of its `pagination_class`
+    and DRF's `format` override. Values are normalized with the filterset's
+    `cache_key_normalizers`, pagination values are reduced to what the
+    paginator will actually use (the streamed format included), and defaults are dropped. Requests that
+    produce the same response therefore share one cache entry.
+
+    Normalizers:
+        keyword: trim and lowercase (case-insensitive lookups only)
+        list: comma separated values, trimmed, deduplicated and sorted (AND semantics only)
+        int_list: like list, sorted numerically when every value is an integer
+    """
+    FORMAT_PARAM = "format"
+    NO_PAGINATION_PARAM = "noPagination"
+
+    @staticmethod
+    def get_canonical_params(request, view=None):
+        """
+        Get canonical query parameters of a request, computed once per request
+
+        Args:
+            request: HTTP or DRF request object
+            view: View class or instance, resolved from the path when omitted
+
+        Returns:
+            dict: Canonical query parameters
+        """
+        http_request = getattr(request, "_request", request)
+        params = getattr(http_request, "_canonical_cache_params", None)
+        if params is not None:
+            return params
+
+        if view is None:
+            view = CacheKeyManager.get_view_class(http_request)
+        if view is None:
+            params = http_request.GET.dict()
+        else:
+            params = CacheKeyManager.canonicalize(http_request.GET, view)
+        http_request._canonical_cache_params = params
+        return params
+
+    @staticmethod
+    def get_view_class(request):
+        """
+        Resolve the view class handling a request
+
+        Args:
+            request: HTTP request object
+
+        Returns:
+            type|None: View class or None if the path does not resolve to a class-based view
+        """
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            try:
+                match = resolve(request.path_info)
+            except Resolver404:
+                return None
+        return getattr(match.func, "view_class", None)
+
+    @staticmethod
+    def canonicalize(query_params, view):
+        """
+        Reduce query parameters to their canonical form for a view
+
+        Args:
+            query_params (QueryDict): Raw query parameters
+            view: View class or instance
+
+        Returns:
+            dict: Canonical query parameters
+        """
+        params = {}
+
+        filterset_class = getattr(view, "filterset_class", None)
+        if filterset_class is not None:
+            normalizers = getattr(filterset_class, "cache_key_normalizers", {})
+            for name, filter_ in filterset_class.base_filters.items():
+                if name not in query_params:
+                    continue
+                if isinstance(filter_, MultipleChoiceFilter):
+                    value = ",".join(sorted({value.strip() for value in query_params.getlist(name)} - {""}))
+                else:
+                    value = CacheKeyManager.normalize(query_params.get(name, ""), normalizers.get(name))
+                if value:
+                    params[name] = value
+
+        pagination_class = getattr(view, "pagination_class", None)
+        if pagination_class is not None:
+            params.update(CacheKeyManager.canonicalize_pagination(query_params, view, pagination_class))
+
+        if query_params.get(CacheKeyManager.FORMAT_PARAM):
+            params[CacheKeyManager.FORMAT_PARAM] = query_params.get(CacheKeyManager.FORMAT_PARAM).strip()
+        return params
+
+    @staticmethod
+    def canonicalize_pagination(query_params, view, pagination_class):
+        """
+        Reduce pagination parameters to the values the paginator will use
+
+        Args:
+            query_params (QueryDict): Raw query parameters
+            view: View class or instance
+            pagination_class: Pagination class of the view
+
+        Returns:
+            dict: Canonical pagination parameters, defaults omitted
+        """
+        params = {}
+        # Cursor pages are addressed by their cursor alone
+        cursor_param = getattr(pagination_class, "cursor_query_param", None)
+        cursor_mode = cursor_param is not None and cursor_param in query_params
+        if cursor_mode:
+            params[cursor_param] = query_params.get(cursor_param).strip()
+
+        stream_param = getattr(pagination_class, "stream_query_param", None)
+        if stream_param and query_params.get(stream_param, "").strip().lower() in ("json", "ndjson"):
+            params[stream_param] = query_params.get(stream_param).strip().lower()
+
+        if query_params.get(CacheKeyManager.NO_PAGINATION_PARAM, "false").lower() == "true":
+            params[CacheKeyManager.NO_PAGINATION_PARAM] = "true"
+            return params
+
+        paginator = pagination_class()
+        paginator.page_size = getattr(view, "page_size", paginator.page_size)
+
+        page = query_params.get(paginator.page_query_param, "").strip()
+        if page.isdigit():
+            page = str(int(page))
+        if page and page != "1" and not cursor_mode:
+            params[paginator.page_query_param] = page
+
+        page_size_param = getattr(paginator, "page_size_query_param", None)
+        if page_size_param and hasattr(paginator, "get_effective_page_size"):
+            page_size = paginator.get_effective_page_size(query_params)
+            if page_size != paginator.page_size:
+                params[page_size_param] = str(page_size)
+        return params
+
+    @staticmethod
+    def normalize(value, normalizer=None):
+        """
+        Normalize a single query parameter value
+
+        Args:
+            value (str): Raw value
+            normalizer (str): One of "keyword", "list", "int_list" or None to only trim
+
+        Returns:
+            str: Normalized value, empty if the parameter has no effect
+        """
+        value = value.strip()
+        if normalizer == "keyword":
+            return value.lower()
+        if normalizer in ("list", "int_list"):
+            items = {item.strip() for item in value.split(",")}
+            if normalizer == "int_list":
+                try:
+                    return ",".join(str(item) for item in sorted({int(item) for item in items}))
+                except ValueError:
+                    pass
+            return ",".join(sorted(items)) or value
+        return value
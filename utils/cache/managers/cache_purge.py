@@ -0,0 +1,152 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from urllib.error import URLError
+from urllib.request import Request, urlopen
+
+from django.conf import settings
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CachePurgeManager:
+    """
+    Batched surrogate-key purges sent to the shared HTTP cache
+
+    Invalidation queues the keys of what changed, a background thread waits
+    `CACHE_PURGE_DELAY` seconds to coalesce the keys of one admin save (or a
+    burst of saves) and sends them to `CACHE_PURGE_URL`, at most
+    `CACHE_PURGE_BATCH_SIZE` keys per request, space separated in the
+    `CACHE_PURGE_KEY_HEADER` header. Failed batches are retried with the next
+    ones. Purging is off while `CACHE_PURGE_URL` is empty.
+
+    Example:
+        PURGE /  HTTP/1.1
+        Surrogate-Key: blogs blogs:5 files:7
+    """
+    _pending = set()
+    _lock = threading.Lock()
+    _wakeup = threading.Event()
+    _worker = None
+    _pid = None
+
+    @staticmethod
+    def is_enabled():
+        """Check whether purges are sent
+
+        Returns:
+            bool: True if a purge endpoint is configured
+        """
+        return bool(getattr(settings, "CACHE_PURGE_URL", ""))
+
+    @staticmethod
+    def queue(keys):
+        """
+        Queue surrogate keys for purging
+
+        Args:
+            keys (iterable): Surrogate keys
+
+        Returns:
+            int: Number of keys waiting to be sent
+        """
+        if not CachePurgeManager.is_enabled():
+            return 0
+        max_pending = getattr(settings, "CACHE_PURGE_MAX_PENDING", 10000)
+        with CachePurgeManager._lock:
+            CachePurgeManager._ensure_worker()
+            pending = CachePurgeManager._pending
+            for key in keys:
+                if len(pending) >= max_pending:
+                    logger.event("cache.purge", "Purge queue full, key dropped", level=logging.WARNING, key=key)
+                    break
+                pending.add(key)
+            size = len(pending)
+        CachePurgeManager._wakeup.set()
+        return size
+
+    @staticmethod
+    def flush():
+        """
+        Send every queued key
+
+        Returns:
+            int: Number of keys purged
+        """
+        with CachePurgeManager._lock:
+            keys = sorted(CachePurgeManager._pending)
+            CachePurgeManager._pending.clear()
+
+        batch_size = getattr(settings, "CACHE_PURGE_BATCH_SIZE", 256)
+        purged = 0
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start:start + batch_size]
+            try:
+                CachePurgeManager.send(batch)
+            except (URLError, OSError) as e:
+                # Keep the unsent keys for the next attempt
+                with CachePurgeManager._lock:
+                    CachePurgeManager._pending.update(keys[start:])
+                logger.event("cache.purge", "Purge failed", level=logging.WARNING, keys=len(keys) - start, error=str(e))
+                break
+            purged += len(batch)
+        if purged:
+            logger.event("cache.purge", "Surrogate keys purged", keys=purged)
+        return purged
+
+    @staticmethod
+    def send(keys):
+        """
+        Send one purge request
+
+        Args:
+            keys (list): Surrogate keys
+
+        Raises:
+            URLError: On connection errors and non-2xx responses
+        """
+        headers = {getattr(settings, "CACHE_PURGE_KEY_HEADER", "Surrogate-Key"): " ".join(keys)}
+        token = getattr(settings, "CACHE_PURGE_TOKEN", "")
+        if token:
+            headers[getattr(settings, "CACHE_PURGE_TOKEN_HEADER", "Authorization")] = token
+        request = Request(
+            settings.CACHE_PURGE_URL,
+            method=getattr(settings, "CACHE_PURGE_METHOD", "PURGE"),
+            headers=headers,
+        )
+        with urlopen(request, timeout=getattr(settings, "CACHE_PURGE_TIMEOUT", 5)) as response:
+            if response.status >= 300:
+                raise URLError(f"Purge endpoint answered {response.status}")
+
+    @staticmethod
+    def _ensure_worker():
+        # Called with _lock held. A forked worker starts its own thread and drops the parent's keys.
+        pid = os.getpid()
+        if CachePurgeManager._pid == pid:
+            return
+        CachePurgeManager._pending = set()
+        CachePurgeManager._pid = pid
+        CachePurgeManager._worker = threading.Thread(
+            target=CachePurgeManager._run_worker,
+            name="cache-purge",
+            daemon=True,
+        )
+        CachePurgeManager._worker.start()
+
+    @staticmethod
+    def _run_worker():
+        atexit.register(CachePurgeManager.flush)
+        delay = getattr(settings, "CACHE_PURGE_DELAY", 0.5)
+        retry_interval = getattr(settings, "CACHE_PURGE_RETRY_INTERVAL", 5)
+        while True:
+            CachePurgeManager._wakeup.wait()
+            time.sleep(delay)
+            CachePurgeManager._wakeup.clear()
+            CachePurgeManager.flush()
+            if CachePurgeManager._pending:
+                time.sleep(retry_interval)
+                CachePurgeManager._wakeup.set()
@@ -0,0 +1,222 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from utils.cache.managers.cache_sweeper import STALE_KEY, VERSIONED_KEY, CacheSweeperManager
+from utils.cache.managers.circuit_breaker import CircuitBreakerManager
+from utils.cache.managers.versioned_cache import VersionedCacheManager
+
+# Key families by prefix, the first match wins
+FAMILIES = (
+    ("refresh_lock_", "lock"),
+    ("lock_", "lock"),
+    ("warm_", "warm"),
+    ("version_", "version"),
+    ("response_", "response"),
+    ("pagination_", "pagination"),
+    ("query_", "query"),
+    ("stream_", "stream"),
+    ("count_", "count"),
+    ("cloudinary_url_", "cloudinary_url"),
+    ("page_", "page"),
+    ("metrics", "metrics"),
+)
+# Upper bounds in seconds of the TTL buckets
+TTL_BUCKETS = ((60, "<1m"), (300, "<5m"), (3600, "<1h"), (21600, "<6h"), (86400, "<1d"))
+
+
+class CacheStatsManager:
+    """
+    Keyspace statistics of the Redis cache, grouped by key family and model
+
+    Keys are sampled with SCAN (at most `CACHE_STATS_MAX_KEYS` per report),
+    their size read with MEMORY USAGE and their TTL with PTTL in pipelined
+    batches. Versioned entries are attributed to the model of their version
+    name, and counted as stale when written under an old version.
+
+    Example:
+        {"families": {"response": {"count": 120, "bytes": 981234, "stale": 31,
+            "ttl": {"<6h": 118, "none": 2}, "models": {"blogs": {...}}}},
+         "versions": {"blogs": {"version": 23, "objects": 12}}}
+    """
+
+    @staticmethod
+    def get_family(key):
+        """Get the family of a cache key
+
+        Args:
+            key (str): Unprefixed cache key
+
+        Returns:
+            str: Family name, "other" when no prefix matches
+        """
+        for prefix, family in FAMILIES:
+            if key.startswith(prefix):
+                return family
+        return "other"
+
+    @staticmethod
+    def get_model(key, family):
+        """Get the model a cache key belongs to
+
+        Args:
+            key (str): Unprefixed cache key
+            family (str): Family of the key
+
+        Returns:
+            str: Model name, "-" when the key does not name one
+        """
+        if family == "version":
+            return VersionedCacheManager.get_model_name(key[len("version_"):])
+        match = VERSIONED_KEY.match(key)
+        if match is not None and match.group("name"):
+            return VersionedCacheManager.get_model_name(match.group("name"))
+        if STALE_KEY.match(key):
+            return "stale_copy"
+        return "-"
+
+    @staticmethod
+    def get_ttl_bucket(ttl_ms):
+        """Get the TTL bucket of a remaining lifetime
+
+        Args:
+            ttl_ms (int|None): PTTL result, negative when the key has no expiry
+
+        Returns:
+            str: Bucket label
+        """
+        if ttl_ms is None or ttl_ms == -2:
+            return "gone"
+        if ttl_ms < 0:
+            return "none"
+        for bound, label in TTL_BUCKETS:
+            if ttl_ms < bound * 1000:
+                return label
+        return ">=1d"
+
+    @staticmethod
+    def collect(max_keys=None, families=None):
+        """
+        Sample the keyspace and aggregate per family and model
+
+        Args:
+            max_keys (int): Keys to sample, defaults to `CACHE_STATS_MAX_KEYS`
+            families (list): Only report these families
+
+        Returns:
+            dict|None: Report, None when Redis is unreachable
+        """
+        connection = get_redis_connection("default")
+        if max_keys is None:
+            max_keys = getattr(settings, "CACHE_STATS_MAX_KEYS", 50000)
+        batch_size = getattr(settings, "CACHE_SWEEP_BATCH_SIZE", 500)
+        prefix = cache.make_key("")
+
+        def new_group():
+            return {"count": 0, "bytes": 0, "stale": 0, "stale_bytes": 0, "ttl": defaultdict(int)}
+
+        groups = defaultdict(lambda: dict(new_group(), models=defaultdict(new_group)))
+        version_keys = []
+        scanned = 0
+        cursor = 0
+        while scanned < max_keys:
+            result = CircuitBreakerManager.call(
+                lambda: connection.scan(cursor, match=f"{prefix}*", count=batch_size)
+            )
+            if result is None:
+                return None
+            cursor, raw_keys = result
+            keys = [key.decode()[len(prefix):] for key in raw_keys][:max_keys - scanned]
+            scanned += len(keys)
+            if families:
+                keys = [key for key in keys if CacheStatsManager.get_family(key) in families]
+
+            sizes = CacheStatsManager.get_sizes(connection, [prefix + key for key in keys])
+            stale = set(CacheSweeperManager.get_orphaned_keys(keys))
+            for key, (size, ttl_ms) in zip(keys, sizes):
+                family = CacheStatsManager.get_family(key)
+                if family == "version":
+                    version_keys.append(key)
+                family_group = groups[family]
+                for group in (family_group, family_group["models"][CacheStatsManager.get_model(key, family)]):
+                    group["count"] += 1
+                    group["bytes"] += size or 0
+                    group["ttl"][CacheStatsManager.get_ttl_bucket(ttl_ms)] += 1
+                    if key in stale:
+                        group["stale"] += 1
+                        group["stale_bytes"] += size or 0
+            if not cursor:
+                break
+
+        dbsize = CircuitBreakerManager.call(connection.dbsize)
+        return {
+            "scanned": scanned,
+            "dbsize": dbsize,
+            "complete": not cursor,
+            "used_memory": CacheSweeperManager.get_used_memory(connection),
+            "families": {
+                family: dict(group, ttl=dict(group["ttl"]), models={
+                    model: dict(model_group, ttl=dict(model_group["ttl"]))
+                    for model, model_group in sorted(group["models"].items())
+                })
+                for family, group in sorted(groups.items())
+            },
+            "versions": CacheStatsManager.get_versions(version_keys),
+        }
+
+    @staticmethod
+    def get_sizes(connection, raw_keys):
+        """
+        Read size and remaining lifetime of keys in one pipeline
+
+        Args:
+            connection (Redis): Raw connection
+            raw_keys (list): Prefixed keys
+
+        Returns:
+            list: (bytes, TTL in ms) per key. Without MEMORY USAGE (e.g. disabled on
+                managed Redis) bytes is the value length, None for non-string keys.
+        """
+        if not raw_keys:
+            return []
+
+        def read():
+            pipeline = connection.pipeline(transaction=False)
+            for raw_key in raw_keys:
+                pipeline.memory_usage(raw_key, samples=0)
+                pipeline.strlen(raw_key)
+                pipeline.pttl(raw_key)
+            return pipeline.execute(raise_on_error=False)
+
+        results = CircuitBreakerManager.call(read) or []
+        sizes = []
+        for index in range(len(raw_keys)):
+            memory, length, ttl_ms = results[3 * index:3 * index + 3] or (None, None, None)
+            size = memory if isinstance(memory, int) else length if isinstance(length, int) else None
+            sizes.append((size, ttl_ms if isinstance(ttl_ms, int) else None))
+        return sizes
+
+    @staticmethod
+    def get_versions(version_keys):
+        """
+        Get the current versions of models, object versions are only counted
+
+        Args:
+            version_keys (list): Unprefixed version keys
+
+        Returns:
+            dict: Model name -> {"version": int, "objects": number of object versions}
+        """
+        model_keys = [key for key in version_keys if ":" not in key]
+        found = cache.get_many(model_keys) if model_keys else {}
+        versions = {
+            key[len("version_"):]: {"version": found.get(key) or 1, "objects": 0}
+            for key in model_keys
+        }
+        for key in version_keys:
+            if ":" in key:
+                model_name = VersionedCacheManager.get_model_name(key[len("version_"):])
+                versions.setdefault(model_name, {"version": 1, "objects": 0})["objects"] += 1
+        return dict(sorted(versions.items()))
@@ -0,0 +1,212 @@
+import logging
+import os
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django_redis import get_redis_connection
+
+from utils.cache.managers.circuit_breaker import CircuitBreakerManager
+from utils.cache.managers.metrics import MetricsManager
+from utils.cache.managers.versioned_cache import VersionedCacheManager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Versioned entries and their chunks, e.g. "response_<md5>_blogs:5_v3_chunk0".
+# Keys written before the version name was part of the key have no name and are unreachable.
+VERSIONED_KEY = re.compile(
+    r"^(?P<base>(?:response|page|pagination|query|stream|count|cloudinary_url)_[0-9a-f]{32})"
+    r"(?:_(?P<name>.+?))?_v(?P<version>\d+)(?:_chunk\d+)?$"
+)
+# Unversioned copies kept for stale-while-revalidate and their chunks, only dropped over the memory budget
+STALE_KEY = re.compile(r"^response_[0-9a-f]{32}_stale(?:_chunk\d+)?$")
+
+
+class CacheSweeperManager:
+    """
+    Incremental SCAN-based sweeper of versioned keys orphaned by version bumps
+
+    A bump makes every `{base}_{name}_v{old}` entry unreachable, but it stays
+    in Redis until its TTL runs out (forever without one). The sweeper walks
+    the keyspace with SCAN, `CACHE_SWEEP_BATCH_SIZE` keys at a time, reads the
+    current versions of the names it finds with one MGET and UNLINKs every
+    entry written under another version. The SCAN cursor is kept in Redis,
+    so each run continues where the previous one stopped.
+
+    While Redis `used_memory` is above `CACHE_SWEEP_MEMORY_BUDGET`, current
+    entries and stale copies are dropped as well, so memory is bounded by the
+    budget instead of growing with the edit rate. Version keys and locks are
+    never touched.
+    """
+    CURSOR_KEY = "cache_sweep_cursor"
+    LOCK_KEY = "lock_cache_sweep"
+
+    _worker = None
+    _pid = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def sweep(max_keys=None, memory_budget=None, dry_run=False):
+        """
+        Run one incremental sweep
+
+        Args:
+            max_keys (int): Keys to scan before stopping, None for a full pass
+            memory_budget (int): Bytes of Redis memory, overrides `CACHE_SWEEP_MEMORY_BUDGET`
+            dry_run (bool): Count the keys that would be deleted without deleting them
+
+        Returns:
+            dict: Counters "scanned", "orphaned", "evicted", "used_memory" and the
+                next "cursor" (0 when the pass reached the end of the keyspace)
+        """
+        stats = {"scanned": 0, "orphaned": 0, "evicted": 0, "used_memory": None, "cursor": 0}
+        connection = get_redis_connection("default")
+        if memory_budget is None:
+            memory_budget = getattr(settings, "CACHE_SWEEP_MEMORY_BUDGET", 0)
+        batch_size = getattr(settings, "CACHE_SWEEP_BATCH_SIZE", 500)
+        pause = getattr(settings, "CACHE_SWEEP_PAUSE", 0.01)
+        prefix = cache.make_key("")
+        cursor_key = cache.make_key(CacheSweeperManager.CURSOR_KEY)
+
+        cursor = CircuitBreakerManager.call(lambda: int(connection.get(cursor_key) or 0))
+        if cursor is None:
+            return stats
+        while True:
+            result = CircuitBreakerManager.call(
+                lambda: connection.scan(cursor, match=f"{prefix}*", count=batch_size)
+            )
+            if result is None:
+                break
+            cursor, raw_keys = result
+            keys = [key.decode()[len(prefix):] for key in raw_keys]
+            stats["scanned"] += len(keys)
+
+            orphaned = CacheSweeperManager.get_orphaned_keys(keys)
+            stats["orphaned"] += len(orphaned)
+            evicted = []
+            if memory_budget:
+                stats["used_memory"] = CacheSweeperManager.get_used_memory(connection)
+                if stats["used_memory"] is not None and stats["used_memory"] > memory_budget:
+                    evicted = CacheSweeperManager.get_evictable_keys(keys, orphaned)
+                    stats["evicted"] += len(evicted)
+            if not dry_run and (orphaned or evicted):
+                raw_deleted = [prefix + key for key in orphaned + evicted]
+                CircuitBreakerManager.call(lambda: connection.unlink(*raw_deleted))
+
+            if not cursor or (max_keys is not None and stats["scanned"] >= max_keys):
+                break
+            time.sleep(pause)
+
+        stats["cursor"] = cursor
+        if not dry_run:
+            CircuitBreakerManager.call(lambda: connection.set(cursor_key, cursor))
+            MetricsManager.inc("cache_swept_keys_total", {"reason": "orphaned"}, stats["orphaned"])
+            MetricsManager.inc("cache_swept_keys_total", {"reason": "memory_budget"}, stats["evicted"])
+        logger.event("cache.sweep", "Cache swept", **stats)
+        return stats
+
+    @staticmethod
+    def get_orphaned_keys(keys):
+        """
+        Get the versioned keys written under a version that is no longer current
+
+        Args:
+            keys (list): Unprefixed cache keys
+
+        Returns:
+            list: Orphaned keys
+        """
+        parsed = []
+        for key in keys:
+            match = VERSIONED_KEY.match(key)
+            if match is not None:
+                parsed.append((key, match.group("name"), int(match.group("version"))))
+        if not parsed:
+            return []
+
+        names = {name for _, name, _ in parsed if name is not None}
+        version_keys = {VersionedCacheManager.get_version_key(name): name for name in names}
+        found = cache.get_many(list(version_keys))
+        # A missing version key reads as version 1, like VersionedCacheManager does
+        current = {name: found.get(version_key) or 1 for version_key, name in version_keys.items()}
+        return [key for key, name, version in parsed if name is None or current[name] != version]
+
+    @staticmethod
+    def get_evictable_keys(keys, orphaned):
+        """
+        Get the current entries that may be dropped to get back under the memory budget
+
+        Args:
+            keys (list): Unprefixed cache keys
+            orphaned (list): Keys already being deleted
+
+        Returns:
+            list: Versioned entries and stale copies not in `orphaned`
+        """
+        orphaned = set(orphaned)
+        return [
+            key for key in keys
+            if key not in orphaned and (VERSIONED_KEY.match(key) or STALE_KEY.match(key))
+        ]
+
+    @staticmethod
+    def get_used_memory(connection):
+        """Get Redis memory usage
+
+        Args:
+            connection (Redis): Raw connection
+
+        Returns:
+            int|None: Bytes, None when Redis is unreachable or INFO is disabled
+        """
+        from redis.exceptions import ResponseError
+
+        try:
+            info = CircuitBreakerManager.call(lambda: connection.info("memory"))
+        except ResponseError:
+            return None
+        return info.get("used_memory") if info else None
+
+    @staticmethod
+    def schedule():
+        """Start the periodic sweeper of this process if it is enabled
+
+        Called after version bumps, the moment keys become orphaned. One
+        process at a time sweeps, coordinated through a Redis lock.
+        """
+        if not getattr(settings, "CACHE_SWEEP_INTERVAL", 0):
+            return
+        pid = os.getpid()
+        if CacheSweeperManager._pid == pid:
+            return
+        with CacheSweeperManager._lock:
+            # A forked worker starts its own thread
+            if CacheSweeperManager._pid == pid:
+                return
+            CacheSweeperManager._pid = pid
+            CacheSweeperManager._worker = threading.Thread(
+                target=CacheSweeperManager._run_worker,
+                name="cache-sweeper",
+                daemon=True,
+            )
+            CacheSweeperManager._worker.start()
+
+    @staticmethod
+    def _run_worker():
+        interval = settings.CACHE_SWEEP_INTERVAL
+        max_keys = getattr(settings, "CACHE_SWEEP_MAX_KEYS", 10000)
+        while True:
+            time.sleep(interval)
+            try:
+                if cache.add(CacheSweeperManager.LOCK_KEY, os.getpid(), timeout=interval):
+                    # Bumps deferred by a worker that died before Redis answered again
+                    CircuitBreakerManager.replay_stored_versions()
+                    CacheSweeperManager.sweep(max_keys=max_keys)
+            except Exception as e:
+                logger.event("cache.sweep", "Cache sweep failed", level=logging.WARNING, error=str(e))
+            finally:
+                close_old_connections()
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import threading
+from functools import partial
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from utils.cache.managers.background_refresh import BackgroundRefreshManager
+from utils.cache.mixins.response_cache_mixin import ResponseCacheMixin
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheWarmerManager:
+    """
+    Re-render the most requested pages of cached views after a version bump
+
+    Views opt in with `cache_warm_pages` (first N pages, stopping early at the
+    last page) and `cache_warm_params` (query parameter sets, default the
+    unfiltered list). Pages are requested through the full middleware stack,
+    so the response, pagination and page caches are all filled.
+
+    Each warm task is keyed by view, parameters and the model versions it
+    warms, and runs under the background refresh lock: only one process warms
+    a given version, and a newer bump queues a new task.
+    """
+    _handler = None
+    _targets = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def is_enabled():
+        """Check whether post-invalidation warming is enabled
+
+        Returns:
+            bool: True if enabled
+        """
+        return getattr(settings, "CACHE_WARM_ENABLED", True)
+
+    @staticmethod
+    def get_targets():
+        """
+        Get the warmable views of the URLconf, discovered once per process
+
+        Returns:
+            list: (path, view class) pairs for views with `cache_warm_pages`
+        """
+        if CacheWarmerManager._targets is None:
+            targets = []
+            CacheWarmerManager._collect_targets(get_resolver(), "/", targets)
+            CacheWarmerManager._targets = targets
+        return CacheWarmerManager._targets
+
+    @staticmethod
+    def get_warm_key(path, params, versions):
+        """
+        Generate key identifying one warm task
+
+        Args:
+            path (str): URL path
+            params (dict): Query parameters
+            versions (dict): Model name -> version being warmed
+
+        Returns:
+            str: Warm key
+        """
+        key_data = {"path": path, "params": params, "versions": versions}
+        key_string = json.dumps(key_data, sort_keys=True)
+        return f"warm_{hashlib.md5(key_string.encode()).hexdigest()}"
+
+    @staticmethod
+    def get_tasks(model_names=None):
+        """
+        Get warm tasks for the views depending on the given models
+
+        Args:
+            model_names (iterable): Model names, None for every warmable view
+
+        Returns:
+            list: (path, params, view class) tuples
+        """
+        tasks = []
+        for path, view_class in CacheWarmerManager.get_targets():
+            if model_names is not None and not set(view_class.get_cache_model_names()) & set(model_names):
+                continue
+            for params in view_class.cache_warm_params:
+                tasks.append((path, params, view_class))
+        return tasks
+
+    @staticmethod
+    def schedule(versions):
+        """
+        Queue background warming for the views affected by a version bump
+
+        Args:
+            versions (dict): Model name -> new version
+
+        Returns:
+            int: Number of queued tasks
+        """
+        if not CacheWarmerManager.is_enabled():
+            return 0
+
+        queued = 0
+        for path, params, view_class in CacheWarmerManager.get_tasks(versions):
+            warmed_versions = {
+                name: versions[name] for name in view_class.get_cache_model_names() if name in versions
+            }
+            cache_key = CacheWarmerManager.get_warm_key(path, params, warmed_versions)
+            refresh = partial(CacheWarmerManager.warm, path, params, view_class.cache_warm_pages)
+            if BackgroundRefreshManager.submit(cache_key, refresh):
+                queued += 1
+        logger.event("cache.warm", "Cache warming queued", views=queued, models=sorted(versions))
+        return queued
+
+    @staticmethod
+    def warm(path, params, pages):
+        """
+        Request the first pages of a view until the last page is reached
+
+        Args:
+            path (str): URL path
+            params (dict): Query parameters
+            pages (int): Maximum number of pages
+
+        Returns:
+            int: Number of pages warmed
+        """
+        warmed = 0
+        for page in range(1, pages + 1):
+            page_params = dict(params, page=str(page)) if page > 1 else params
+            response = CacheWarmerManager.request(path, page_params)
+            if response.status_code != 200:
+                logger.event("cache.warm", "Cache warming stopped", path=path, page=page, status=response.status_code)
+                break
+            warmed += 1
+            if CacheWarmerManager.is_last_page(response):
+                break
+        logger.event("cache.warm", "Cache warmed", path=path, params=params, pages=warmed)
+        return warmed
+
+    @staticmethod
+    def request(path, params):
+        """
+        Run an anonymous GET request through the middleware stack
+
+        The request is flagged so cached views compute a fresh response
+        instead of answering from a stale entry. It is made over HTTPS, the
+        scheme clients use, so SECURE_SSL_REDIRECT does not answer it with a
+        redirect.
+
+        Args:
+            path (str): URL path
+            params (dict): Query parameters
+
+        Returns:
+            HttpResponse: Rendered response
+        """
+        request = BackgroundRefreshManager.build_request(path, params, host=CacheWarmerManager.get_host(), secure=True)
+        request.is_cache_warming = True
+        response = CacheWarmerManager.get_handler().get_response(request)
+        response.close()
+        return response
+
+    @staticmethod
+    def is_last_page(response):
+        """Check whether a paginated response holds the last page
+
+        Args:
+            response: Rendered response
+
+        Returns:
+            bool: True if there is no next page, or the body has no paging data
+        """
+        try:
+            paging = json.loads(response.content)["data"]["paging"]
+            return paging["page"] * paging["page_size"] >= paging["total_rows"]
+        except (ValueError, KeyError, TypeError):
+            return True
+
+    @staticmethod
+    def get_handler():
+        """Get a request handler with the project middleware loaded
+
+        Returns:
+            BaseHandler: Request handler
+        """
+        if CacheWarmerManager._handler is None:
+            with CacheWarmerManager._lock:
+                if CacheWarmerManager._handler is None:
+                    handler = BaseHandler()
+                    handler.load_middleware()
+                    CacheWarmerManager._handler = handler
+        return CacheWarmerManager._handler
+
+    @staticmethod
+    def get_host():
+        """Get a host name accepted by ALLOWED_HOSTS
+
+        Returns:
+            str: Host name
+        """
+        for host in settings.ALLOWED_HOSTS:
+            host = host.lstrip(".")
+            if host and host != "*":
+                return host
+        return "localhost"
+
+    @staticmethod
+    def _collect_targets(resolver, prefix, targets):
+        for pattern in resolver.url_patterns:
+            route = prefix + str(pattern.pattern)
+            if isinstance(pattern, URLResolver):
+                CacheWarmerManager._collect_targets(pattern, route, targets)
+                continue
+            # Only parameterless routes (list views) can be warmed
+            if not isinstance(pattern, URLPattern) or getattr(pattern.pattern, "converters", None):
+                continue
+            view_class = getattr(pattern.callback, "view_class", None)
+            if view_class is None or not issubclass(view_class, ResponseCacheMixin):
+                continue
+            if view_class.cache_warm_pages:
+                targets.append((route, view_class))
@@ -0,0 +1,323 @@
+import logging
+import os
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from utils.cache.managers.local_cache import LocalCacheManager, LocalLRUCache
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CircuitBreakerManager:
+    """
+    Per-process circuit breaker in front of Redis
+
+    After `CACHE_BREAKER_FAILURE_THRESHOLD` consecutive connection errors or
+    timeouts the circuit opens and Redis is skipped entirely: cache reads
+    miss (the request goes to the DB) unless the bounded fallback cache has
+    the key, and writes land in that fallback cache with a short timeout.
+    After `CACHE_BREAKER_RECOVERY_TIMEOUT` seconds a single caller probes Redis
+    (half-open); success closes the circuit, failure opens it again.
+
+    Version bumps that could not reach Redis are replayed by the next
+    successful call of the process that deferred them, so entries cached
+    before the outage are not served afterwards. They are also stored in the
+    database (`PendingCacheVersion`) in case that worker dies first: a
+    background thread, started after a deferral or an outage, and the cache
+    sweeper replay stored bumps every `CACHE_BREAKER_REPLAY_INTERVAL` seconds.
+    Redis calls themselves never touch the database.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    _state = CLOSED
+    _failures = 0
+    _opened_at = 0.0
+    _probing = False
+    _fallback_cache = None
+    _pending_versions = set()
+    _replay_pid = None
+    _lock = threading.Lock()
+    _local = threading.local()
+
+    @staticmethod
+    def allow_request():
+        """
+        Check whether a Redis call may be attempted
+
+        Returns:
+            bool: True when closed, or when this caller is the half-open probe
+        """
+        if CircuitBreakerManager._state == CircuitBreakerManager.CLOSED:
+            return True
+        with CircuitBreakerManager._lock:
+            if CircuitBreakerManager._state == CircuitBreakerManager.CLOSED:
+                return True
+            if CircuitBreakerManager._probing:
+                return False
+            recovery_timeout = getattr(settings, "CACHE_BREAKER_RECOVERY_TIMEOUT", 10)
+            if time.monotonic() - CircuitBreakerManager._opened_at < recovery_timeout:
+                return False
+            CircuitBreakerManager._state = CircuitBreakerManager.HALF_OPEN
+            CircuitBreakerManager._probing = True
+            return True
+
+    @staticmethod
+    def record_success():
+        """
+        Close the circuit after a successful call and replay the version bumps this process deferred
+
+        Bumps are deferred by a single failed call too, while the circuit
+        stays closed, so they are replayed whenever some are pending. Bumps
+        stored by other processes are left to the replay thread.
+
+        Returns:
+            bool: True if deferred version bumps were replayed
+        """
+        recovered = False
+        if CircuitBreakerManager._state != CircuitBreakerManager.CLOSED or CircuitBreakerManager._failures:
+            with CircuitBreakerManager._lock:
+                recovered = CircuitBreakerManager._state != CircuitBreakerManager.CLOSED
+                CircuitBreakerManager._state = CircuitBreakerManager.CLOSED
+                CircuitBreakerManager._failures = 0
+                CircuitBreakerManager._probing = False
+        if recovered:
+            logger.event("cache.breaker", "Redis circuit closed", level=logging.WARNING)
+            # Other workers may have deferred bumps during the outage
+            CircuitBreakerManager.schedule_replay()
+        if not CircuitBreakerManager._pending_versions:
+            return False
+        return CircuitBreakerManager.replay_pending_versions()
+
+    @staticmethod
+    def record_failure(error):
+        """
+        Count a failed call and open the circuit past the threshold
+
+        Args:
+            error (Exception): Connection error or timeout
+        """
+        threshold = getattr(settings, "CACHE_BREAKER_FAILURE_THRESHOLD", 5)
+        with CircuitBreakerManager._lock:
+            CircuitBreakerManager._failures += 1
+            CircuitBreakerManager._probing = False
+            if CircuitBreakerManager._state == CircuitBreakerManager.OPEN:
+                return
+            if CircuitBreakerManager._state == CircuitBreakerManager.CLOSED and CircuitBreakerManager._failures < threshold:
+                return
+            CircuitBreakerManager._state = CircuitBreakerManager.OPEN
+            CircuitBreakerManager._opened_at = time.monotonic()
+        logger.event("cache.breaker", "Redis circuit opened", level=logging.WARNING, error=str(error))
+
+    @staticmethod
+    def get_state():
+        """Get the circuit state of this process
+
+        Returns:
+            str: "closed", "open" or "half_open"
+        """
+        return CircuitBreakerManager._state
+
+    @staticmethod
+    def is_connection_error(error):
+        """
+        Check whether an error means Redis is unreachable or too slow
+
+        Command errors (e.g. a wrong type) do not count against the circuit.
+
+        Args:
+            error (Exception): Raised error, django-redis wraps it in ConnectionInterrupted
+
+        Returns:
+            bool: True for connection errors and timeouts
+        """
+        from redis.exceptions import ConnectionError, TimeoutError
+
+        cause = error.__cause__ or error
+        return isinstance(cause, (ConnectionError, TimeoutError, socket.timeout, ConnectionRefusedError))
+
+    @staticmethod
+    def call(func, fallback=None):
+        """
+        Run a Redis call through the circuit
+
+        Calls nested in another one on the same thread (django-redis `add`
+        calls `set`) run directly, the outer call accounts for the result.
+        When the call closes the circuit and deferred version bumps are
+        replayed, its result may predate them, so `fallback` answers instead.
+
+        Args:
+            func (callable): Redis call
+            fallback (callable): Called instead when the circuit is open or the call fails
+
+        Returns:
+            any: Result of `func`, or of `fallback` (None without one)
+        """
+        if getattr(CircuitBreakerManager._local, "active", False):
+            return func()
+        if not CircuitBreakerManager.allow_request():
+            return fallback() if fallback else None
+
+        CircuitBreakerManager._local.active = True
+        try:
+            result = func()
+            error = None
+        except Exception as e:
+            error = e
+        finally:
+            CircuitBreakerManager._local.active = False
+
+        if error is not None:
+            if not CircuitBreakerManager.is_connection_error(error):
+                CircuitBreakerManager.record_success()
+                raise error
+            CircuitBreakerManager.record_failure(error)
+            return fallback() if fallback else None
+        if CircuitBreakerManager.record_success() and fallback:
+            return fallback()
+        return result
+
+    @staticmethod
+    def get_fallback_cache():
+        """Get the bounded cache used while Redis is unavailable
+
+        Returns:
+            LocalLRUCache: Fallback cache
+        """
+        if CircuitBreakerManager._fallback_cache is None:
+            with CircuitBreakerManager._lock:
+                if CircuitBreakerManager._fallback_cache is None:
+                    CircuitBreakerManager._fallback_cache = LocalLRUCache(
+                        max_bytes=getattr(settings, "CACHE_FALLBACK_MAX_BYTES", 16 * 1024 * 1024),
+                        max_entries=getattr(settings, "CACHE_FALLBACK_MAX_ENTRIES", 1024),
+                        default_timeout=getattr(settings, "CACHE_FALLBACK_TIMEOUT", 30),
+                    )
+        return CircuitBreakerManager._fallback_cache
+
+    @staticmethod
+    def add_pending_versions(model_names):
+        """
+        Remember version bumps that could not reach Redis
+
+        They are kept in this process and stored in the database for the
+        other processes. The fallback and L1 caches are cleared so this
+        process stops serving entries computed before the change.
+
+        Args:
+            model_names (iterable): Names of the models
+        """
+        from common.models import PendingCacheVersion
+
+        model_names = sorted(model_names)
+        with CircuitBreakerManager._lock:
+            CircuitBreakerManager._pending_versions.update(model_names)
+        deferred_at = timezone.now()
+        try:
+            # A bump deferred again moves forward, so a replay reading the older one does not delete it
+            PendingCacheVersion.objects.bulk_create(
+                [PendingCacheVersion(name=name, deferred_at=deferred_at) for name in model_names],
+                update_conflicts=True,
+                unique_fields=["name"],
+                update_fields=["deferred_at"],
+            )
+        except DatabaseError as e:
+            logger.event("cache.breaker", "Version bump not stored", level=logging.WARNING, error=str(e))
+        else:
+            CircuitBreakerManager.schedule_replay()
+        CircuitBreakerManager.get_fallback_cache().clear()
+        if LocalCacheManager.is_enabled():
+            LocalCacheManager.clear()
+        logger.event("cache.breaker", "Version bump deferred", level=logging.WARNING, models=model_names)
+
+    @staticmethod
+    def replay_pending_versions():
+        """
+        Bump the versions deferred by this process
+
+        A bump that fails again is deferred again by `increment_versions`.
+        Its stored row is left for `replay_stored_versions`, which bumps it
+        once more: one extra miss, but no database query on the Redis path.
+
+        Returns:
+            bool: True if any version was bumped
+        """
+        from utils.cache.managers.versioned_cache import VersionedCacheManager
+
+        with CircuitBreakerManager._lock:
+            model_names = sorted(CircuitBreakerManager._pending_versions)
+            CircuitBreakerManager._pending_versions.clear()
+        if not model_names:
+            return False
+        versions = VersionedCacheManager.increment_versions(model_names)
+        if versions:
+            logger.event("cache.breaker", "Deferred version bumps replayed", level=logging.WARNING, models=model_names)
+        return bool(versions)
+
+    @staticmethod
+    def replay_stored_versions():
+        """
+        Bump the versions stored by any process, then delete their rows
+
+        Runs outside of requests (replay thread, cache sweeper). Only the rows
+        read are deleted, a bump deferred again meanwhile moved forward and stays.
+
+        Returns:
+            int: Stored bumps left, 0 when none remain
+        """
+        from common.models import PendingCacheVersion
+        from utils.cache.managers.versioned_cache import VersionedCacheManager
+
+        stored = list(PendingCacheVersion.objects.values_list("name", "deferred_at"))
+        if not stored:
+            return 0
+        versions = VersionedCacheManager.increment_versions(sorted({name for name, _ in stored}))
+        if not versions:
+            return len(stored)
+        replayed = Q(pk__in=[])
+        for name, deferred_at in stored:
+            replayed |= Q(name=name, deferred_at=deferred_at)
+        PendingCacheVersion.objects.filter(replayed).delete()
+        logger.event("cache.breaker", "Stored version bumps replayed", level=logging.WARNING, models=sorted(versions))
+        return PendingCacheVersion.objects.count()
+
+    @staticmethod
+    def schedule_replay():
+        """Start the replay thread of this process if it is enabled and not running
+
+        The thread replays stored bumps every `CACHE_BREAKER_REPLAY_INTERVAL`
+        seconds while the circuit is closed, and stops once none are left.
+        """
+        if not getattr(settings, "CACHE_BREAKER_REPLAY_INTERVAL", 60):
+            return
+        pid = os.getpid()
+        if CircuitBreakerManager._replay_pid == pid:
+            return
+        with CircuitBreakerManager._lock:
+            # A forked worker starts its own thread
+            if CircuitBreakerManager._replay_pid == pid:
+                return
+            CircuitBreakerManager._replay_pid = pid
+        threading.Thread(target=CircuitBreakerManager._run_replay_worker, name="cache-breaker-replay", daemon=True).start()
+
+    @staticmethod
+    def _run_replay_worker():
+        remaining = 1
+        while remaining:
+            time.sleep(settings.CACHE_BREAKER_REPLAY_INTERVAL)
+            if CircuitBreakerManager._state != CircuitBreakerManager.CLOSED:
+                continue
+            try:
+                remaining = CircuitBreakerManager.replay_stored_versions()
+            except Exception as e:
+                logger.event("cache.breaker", "Stored version bumps not replayed", level=logging.WARNING, error=str(e))
+            finally:
+                close_old_connections()
+        CircuitBreakerManager._replay_pid = None
@@ -0,0 +1,67 @@
+import hashlib
+import json
+
+from utils.cache.managers.versioned_cache import VersionedCacheManager
+
+
+class CountCacheManager:
+    """
+    Versioned cache of list totals, shared by every page of a filter set
+
+    All pages of one view and filter set have the same total, so the count
+    is keyed by view, model version and the canonical filters without the
+    pagination parameters, and computed once per version instead of once
+    per page miss.
+    """
+
+    @staticmethod
+    def get_cache_key(model_name, view_name, filters=None):
+        """
+        Generate base cache key for a total (without version)
+
+        Args:
+            model_name (str): Name of the model
+            view_name (str): Name of the view class, views filter the same model differently
+            filters (dict): Canonical filters, pagination parameters removed
+
+        Returns:
+            str: Base cache key
+        """
+        key_data = {
+            "model": model_name,
+            "view": view_name,
+            "filters": filters or {}
+        }
+        key_string = json.dumps(key_data, sort_keys=True)
+        return f"count_{hashlib.md5(key_string.encode()).hexdigest()}"
+
+    @staticmethod
+    def get_count(model_name, view_name, filters=None):
+        """
+        Get a cached total
+
+        Args:
+            model_name (str): Name of the model
+            view_name (str): Name of the view class
+            filters (dict): Canonical filters, pagination parameters removed
+
+        Returns:
+            int|None: Total, None on miss
+        """
+        base_key = CountCacheManager.get_cache_key(model_name, view_name, filters)
+        return VersionedCacheManager.get_versioned_data(base_key, model_name)
+
+    @staticmethod
+    def cache_count(model_name, view_name, filters, count, timeout=300):
+        """
+        Cache a total under the current model version
+
+        Args:
+            model_name (str): Name of the model
+            view_name (str): Name of the view class
+            filters (dict): Canonical filters, pagination parameters removed
+            count (int): Total
+            timeout (int): Cache timeout in seconds
+        """
+        base_key = CountCacheManager.get_cache_key(model_name, view_name, filters)
+        VersionedCacheManager.set_versioned_data(base_key, model_name, count, timeout=timeout)
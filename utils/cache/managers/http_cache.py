@@ -0,0 +1,120 @@
+import hashlib
+import json
+
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+
+from utils.cache.managers.response_cache import ResponseCacheManager
+from utils.cache.managers.versioned_cache import VersionedCacheManager
+
+
+class HttpCacheManager:
+    @staticmethod
+    def get_etag(request, view_name, model_names, view=None):
+        """
+        Generate strong ETag from model versions and the canonical request key
+
+        The body of a cached view only changes when one of its model versions
+        is bumped, so the ETag can be computed without touching the DB.
+
+        Args:
+            request: HTTP request object
+            view_name (str): Name of the view class
+            model_names (list): Names of the models the response depends on
+            view: View class the query parameters are canonicalized for, resolved from the path when omitted
+
+        Returns:
+            str: Quoted ETag
+        """
+        versions = VersionedCacheManager.prefetch_versions(model_names)
+        key_data = {
+            "request": ResponseCacheManager.get_response_cache_key(request, view_name, view),
+            "accept": request.META.get("HTTP_ACCEPT", ""),
+            "versions": versions
+        }
+        key_string = json.dumps(key_data, sort_keys=True)
+        return f'"{hashlib.md5(key_string.encode()).hexdigest()}"'
+
+    @staticmethod
+    def is_not_modified(request, etag):
+        """
+        Check If-None-Match against an ETag (weak comparison, as for GET)
+
+        `*` is not matched here: the ETag is derived from versions alone, it
+        does not prove that a representation exists (a detail ID may be a 404).
+        See `matches_any`.
+
+        Args:
+            request: HTTP request object
+            etag (str): Quoted ETag
+
+        Returns:
+            bool: True if the client already has this representation
+        """
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if not if_none_match:
+            return False
+        etag = etag.removeprefix("W/")
+        return any(value.removeprefix("W/") == etag for value in parse_etags(if_none_match))
+
+    @staticmethod
+    def matches_any(request):
+        """
+        Check for `If-None-Match: *`, only answered once a current representation was found
+
+        Args:
+            request: HTTP request object
+
+        Returns:
+            bool: True if the client asked for any current representation
+        """
+        return "*" in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", ""))
+
+    @staticmethod
+    def get_cache_control(max_age=0, stale_ttl=0):
+        """
+        Build Cache-Control header value
+
+        Args:
+            max_age (int): Seconds a client may reuse the response without asking
+            stale_ttl (int): Seconds a client may reuse it while revalidating
+
+        Returns:
+            str: Cache-Control header value
+        """
+        if stale_ttl:
+            return f"public, max-age={max_age}, stale-while-revalidate={stale_ttl}"
+        return f"public, max-age={max_age}, must-revalidate"
+
+    @staticmethod
+    def set_headers(response, etag, cache_control):
+        """
+        Set validator and freshness headers on a response
+
+        Args:
+            response: HTTP response
+            etag (str): Quoted ETag
+            cache_control (str): Cache-Control header value
+
+        Returns:
+            HttpResponse: Same response
+        """
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    @staticmethod
+    def not_modified_response(etag, cache_control):
+        """
+        Build a 304 Not Modified response
+
+        Args:
+            etag (str): Quoted ETag
+            cache_control (str): Cache-Control header value
+
+        Returns:
+            HttpResponseNotModified: Empty response
+        """
+        return HttpCacheManager.set_headers(HttpResponseNotModified(), etag, cache_control)
@@ -0,0 +1,296 @@
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from utils.cache.managers.cache_purge import CachePurgeManager
+from utils.cache.managers.cache_sweeper import CacheSweeperManager
+from utils.cache.managers.cache_warmer import CacheWarmerManager
+from utils.cache.managers.surrogate_key import SurrogateKeyManager
+from utils.cache.managers.versioned_cache import VersionedCacheManager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheInvalidationManager:
+    """
+    Declarative dependency graph between cached models and the rows they contain
+
+    Each cached model registers the relations its serialized payload reads
+    (forward FK/O2O, M2M, reverse relations, chained with `__`). Any save or
+    delete on a model along those paths, and any `m2m_changed` on the M2M
+    through tables, marks the cached model as stale. Stale names are collected
+    for the current transaction and bumped together in `transaction.on_commit`,
+    so a single admin save costs one version bump per cached model. Names
+    collected by a transaction that rolls back are dropped with its callback.
+
+    With `track_objects`, every change also bumps the object version (e.g.
+    "blogs:5") of each cached row it touches, found by querying the cached
+    model along the registered path. Detail views keyed by object versions
+    stay cached through edits of other rows.
+
+    The same names, plus the surrogate key of each changed row, are purged
+    from the shared HTTP cache by `CachePurgeManager` after the bump.
+
+    Example:
+        CacheInvalidationManager.register("projects", Projects, depends_on=["skills", "images__image"])
+    """
+    M2M_ACTIONS = ("post_add", "post_remove", "post_clear")
+
+    _dependents = defaultdict(set)
+    _m2m_dependents = defaultdict(set)
+    # Model -> (cache name, cached model, lookup from the cached model to it), lookup is None for the cached model itself
+    _object_dependents = defaultdict(set)
+    # Through model -> (cache name, cached model, lookup to the M2M field, model owning the M2M field)
+    _m2m_object_dependents = defaultdict(set)
+    _pending = threading.local()
+
+    @staticmethod
+    def register(cache_name, model, depends_on=None, track_objects=False):
+        """
+        Register a cached model and the relation paths it depends on
+
+        Args:
+            cache_name (str): Version name used by VersionedCacheManager
+            model (Model): Cached model class
+            depends_on (list): Relation paths from `model`, e.g. "cover_img" or "images__image"
+            track_objects (bool): Also bump the object version of every affected row
+        """
+        CacheInvalidationManager._add_dependent(model, cache_name)
+        SurrogateKeyManager.register_model(model, cache_name)
+        if track_objects:
+            CacheInvalidationManager._object_dependents[model].add((cache_name, model, None))
+        for path in depends_on or []:
+            current = model
+            lookup = None
+            for name in path.split("__"):
+                owner = current
+                field = current._meta.get_field(name)
+                current = field.related_model
+                lookup = f"{lookup}__{name}" if lookup else name
+                if field.many_to_many:
+                    through = field.remote_field.through if not field.auto_created else field.through
+                    CacheInvalidationManager._add_m2m_dependent(through, cache_name)
+                    if track_objects:
+                        CacheInvalidationManager._m2m_object_dependents[through].add(
+                            (cache_name, model, lookup, owner)
+                        )
+                CacheInvalidationManager._add_dependent(current, cache_name)
+                if track_objects:
+                    CacheInvalidationManager._object_dependents[current].add((cache_name, model, lookup))
+
+    @staticmethod
+    def get_dependents(model):
+        """Get cache names invalidated by a change on a model
+
+        Args:
+            model (Model): Model class
+
+        Returns:
+            set: Cache names
+        """
+        return set(CacheInvalidationManager._dependents.get(model, ()))
+
+    @staticmethod
+    def get_object_names(instance):
+        """Get object version names of the cached rows that read an instance
+
+        Args:
+            instance (Model): Changed instance
+
+        Returns:
+            set: Object version names, e.g. {"blogs:5"}
+        """
+        return CacheInvalidationManager.get_objects_names(type(instance), [instance.pk])
+
+    @staticmethod
+    def get_objects_names(changed_model, changed_pks):
+        """Get object version names of the cached rows that read any of several rows, one query per relation
+
+        Args:
+            changed_model (Model): Model of the changed rows
+            changed_pks (list): Primary keys of the changed rows
+
+        Returns:
+            set: Object version names
+        """
+        names = set()
+        for cache_name, model, lookup in CacheInvalidationManager._object_dependents.get(changed_model, ()):
+            if lookup is None:
+                pks = changed_pks
+            else:
+                pks = model._default_manager.filter(**{f"{lookup}__in": changed_pks}).values_list("pk", flat=True)
+            names.update(VersionedCacheManager.get_object_version_name(cache_name, pk) for pk in pks)
+        return names
+
+    @staticmethod
+    def get_m2m_object_names(sender, instance, model, pk_set):
+        """Get object version names of the cached rows affected by an M2M change
+
+        Args:
+            sender (Model): Through model
+            instance (Model): Instance whose relation changed
+            model (Model): Model of the instances added or removed
+            pk_set (set): Primary keys added or removed, None on clear
+
+        Returns:
+            set: Object version names
+        """
+        names = set()
+        for cache_name, cached_model, lookup, owner in CacheInvalidationManager._m2m_object_dependents.get(sender, ()):
+            owner_lookup = lookup.rpartition("__")[0]
+            if isinstance(instance, owner):
+                # Forward change, the owner of the M2M field is what the cached rows read
+                if owner_lookup:
+                    pks = cached_model._default_manager.filter(**{owner_lookup: instance}).values_list("pk", flat=True)
+                else:
+                    pks = [instance.pk]
+            else:
+                # Reverse change, the added or removed pks are owners
+                pks = set(cached_model._default_manager.filter(**{lookup: instance}).values_list("pk", flat=True))
+                if not owner_lookup and model is cached_model and pk_set:
+                    pks.update(pk_set)
+            names.update(VersionedCacheManager.get_object_version_name(cache_name, pk) for pk in pks)
+        return names
+
+    @staticmethod
+    def get_purge_keys(instance, model=None, pk_set=None):
+        """Get surrogate keys of the rows a change touched directly
+
+        Args:
+            instance (Model): Changed instance
+            model (Model): Model of the instances added or removed by an M2M change
+            pk_set (set): Primary keys added or removed by an M2M change
+
+        Returns:
+            set: Surrogate keys
+        """
+        keys = {SurrogateKeyManager.get_instance_key(instance)}
+        for pk in pk_set or ():
+            keys.add(SurrogateKeyManager.get_object_key(model, pk))
+        keys.discard(None)
+        return keys
+
+    @staticmethod
+    def mark_stale(cache_names, purge_keys=()):
+        """
+        Queue cache names for a version bump when the current transaction commits
+
+        Outside of a transaction the bump happens immediately. A single flush
+        is queued per transaction; when the transaction (or the savepoint that
+        queued it) rolled back, its callback is gone and so are its names.
+
+        Args:
+            cache_names (iterable): Cache names to bump
+            purge_keys (iterable): Extra surrogate keys to purge, e.g. of the changed rows
+        """
+        queued = CacheInvalidationManager._is_flush_queued()
+        if not queued:
+            CacheInvalidationManager._get_pending().clear()
+            CacheInvalidationManager._get_pending_purge_keys().clear()
+        CacheInvalidationManager._get_pending().update(cache_names)
+        CacheInvalidationManager._get_pending_purge_keys().update(purge_keys)
+        if not queued:
+            # A callback of its own, so it can be found among the transaction's hooks
+            callback = CacheInvalidationManager._pending.callback = lambda: CacheInvalidationManager.flush()
+            transaction.on_commit(callback)
+
+    @staticmethod
+    def flush():
+        """Bump every queued cache name in a single round trip, then warm and purge the affected views
+
+        Returns:
+            dict: Cache name -> new version
+        """
+        CacheInvalidationManager._pending.callback = None
+        pending = CacheInvalidationManager._get_pending()
+        if not pending:
+            return {}
+        cache_names = sorted(pending)
+        pending.clear()
+        purge_keys = CacheInvalidationManager._get_pending_purge_keys()
+        purge_keys.update(cache_names)
+        versions = VersionedCacheManager.increment_versions(cache_names)
+        CacheWarmerManager.schedule(versions)
+        CacheSweeperManager.schedule()
+        # After the bump, so the shared cache refetches the new version
+        CachePurgeManager.queue(sorted(purge_keys))
+        purge_keys.clear()
+        return versions
+
+    @staticmethod
+    def _is_flush_queued():
+        callback = getattr(CacheInvalidationManager._pending, "callback", None)
+        if callback is None:
+            return False
+        return any(func is callback for _, func, _ in transaction.get_connection().run_on_commit)
+
+    @staticmethod
+    def _get_pending():
+        pending = getattr(CacheInvalidationManager._pending, "names", None)
+        if pending is None:
+            pending = CacheInvalidationManager._pending.names = set()
+        return pending
+
+    @staticmethod
+    def _get_pending_purge_keys():
+        purge_keys = getattr(CacheInvalidationManager._pending, "purge_keys", None)
+        if purge_keys is None:
+            purge_keys = CacheInvalidationManager._pending.purge_keys = set()
+        return purge_keys
+
+    @staticmethod
+    def _add_dependent(model, cache_name):
+        CacheInvalidationManager._dependents[model].add(cache_name)
+        uid = f"cache_invalidation_{model._meta.label_lower}"
+        post_save.connect(CacheInvalidationManager._on_model_changed, sender=model, dispatch_uid=uid)
+        pre_delete.connect(CacheInvalidationManager._on_model_deleting, sender=model, dispatch_uid=uid)
+        post_delete.connect(CacheInvalidationManager._on_model_changed, sender=model, dispatch_uid=uid)
+
+    @staticmethod
+    def _add_m2m_dependent(through, cache_name):
+        CacheInvalidationManager._m2m_dependents[through].add(cache_name)
+        m2m_changed.connect(
+            CacheInvalidationManager._on_m2m_changed,
+            sender=through,
+            dispatch_uid=f"cache_invalidation_m2m_{through._meta.label_lower}",
+        )
+
+    @staticmethod
+    def _on_model_changed(sender, instance, created=None, **kwargs):
+        signal_type = "created" if created else "updated" if created is False else "deleted"
+        logger.event("cache.invalidation", "Signal received", model=sender.__name__, pk=instance.pk, action=signal_type)
+        cache_names = set(CacheInvalidationManager._dependents[sender])
+        if signal_type == "deleted":
+            # The relations are gone after the delete, they were resolved in pre_delete
+            cache_names.update(getattr(instance, "_cache_object_names", ()))
+        else:
+            cache_names.update(CacheInvalidationManager.get_object_names(instance))
+        CacheInvalidationManager.mark_stale(cache_names, CacheInvalidationManager.get_purge_keys(instance))
+
+    @staticmethod
+    def _on_model_deleting(sender, instance, **kwargs):
+        instance._cache_object_names = CacheInvalidationManager.get_object_names(instance)
+
+    @staticmethod
+    def _on_m2m_changed(sender, instance, action, model=None, pk_set=None, **kwargs):
+        if action == "pre_clear":
+            # The relations are gone after the clear, resolve the affected rows now
+            instance._cache_object_names = CacheInvalidationManager.get_m2m_object_names(
+                sender, instance, model, pk_set
+            )
+            return
+        if action not in CacheInvalidationManager.M2M_ACTIONS:
+            return
+        logger.event(
+            "cache.invalidation", "Signal received",
+            model=sender.__name__, pk=instance.pk, action=action, instance_model=instance.__class__.__name__
+        )
+        cache_names = set(CacheInvalidationManager._m2m_dependents[sender])
+        if action == "post_clear":
+            cache_names.update(getattr(instance, "_cache_object_names", ()))
+        else:
+            cache_names.update(CacheInvalidationManager.get_m2m_object_names(sender, instance, model, pk_set))
+        CacheInvalidationManager.mark_stale(cache_names, CacheInvalidationManager.get_purge_keys(instance, model, pk_set))
@@ -0,0 +1,336 @@
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LocalLRUCache:
+    """
+    Size-bounded, thread-safe in-process LRU cache with byte accounting
+
+    Values are stored pickled, so every hit returns a private copy and the
+    byte budget reflects what the worker actually holds in memory.
+
+    Attributes:
+        max_bytes (int): Upper bound for the sum of stored payload sizes
+        max_entries (int): Upper bound for the number of stored entries
+        default_timeout (int): Timeout in seconds used when none is given
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, max_entries=1024, default_timeout=60):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.default_timeout = default_timeout
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def current_bytes(self):
+        return self._bytes
+
+    def get(self, key, default=None):
+        """Get value and mark it as most recently used
+
+        Args:
+            key (str): Cache key
+            default (any): Value returned on miss
+
+        Returns:
+            any: Cached value or default
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, payload = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                self._pop(key)
+                return default
+            self._data.move_to_end(key)
+        return pickle.loads(payload)
+
+    def set(self, key, value, timeout=None):
+        """Store value, evicting least recently used entries over budget
+
+        Args:
+            key (str): Cache key
+            value (any): Picklable value
+            timeout (int, optional): Timeout in seconds. Defaults to default_timeout.
+
+        Returns:
+            bool: True if stored, False if the value alone exceeds the budget
+        """
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            self.delete(key)
+            return False
+
+        timeout = self.default_timeout if timeout is None else timeout
+        expires_at = time.monotonic() + timeout if timeout else None
+
+        with self._lock:
+            self._store(key, expires_at, payload)
+        return True
+
+    def add(self, key, value, timeout=None):
+        """Store value only if the key is missing or expired
+
+        Args:
+            key (str): Cache key
+            value (any): Picklable value
+            timeout (int, optional): Timeout in seconds. Defaults to default_timeout.
+
+        Returns:
+            bool: True if stored
+        """
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return False
+
+        timeout = self.default_timeout if timeout is None else timeout
+        expires_at = time.monotonic() + timeout if timeout else None
+
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                return False
+            self._store(key, expires_at, payload)
+        return True
+
+    def delete(self, key):
+        """Delete a key if present
+
+        Args:
+            key (str): Cache key
+        """
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _store(self, key, expires_at, payload):
+        # Called with _lock held
+        self._pop(key)
+        self._data[key] = (expires_at, payload)
+        self._bytes += len(payload)
+        while self._data and (self._bytes > self.max_bytes or len(self._data) > self.max_entries):
+            oldest_key = next(iter(self._data))
+            self._pop(oldest_key)
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+
+class LocalCacheManager:
+    """
+    Per-worker L1 cache sitting in front of the Redis backend
+
+    Cached payloads are keyed by their versioned key, so an entry can only be
+    served while the local view of the model version is current. Versions are
+    kept fresh two ways: a Redis pub/sub listener applies every bump published
+    by `VersionedCacheManager.increment_version` as soon as it happens, and each
+    locally known version is re-read from Redis after `CACHE_L1_VERSION_TTL`
+    seconds in case a message was missed while the listener was reconnecting.
+    """
+    VERSION_CHANNEL = "cache_versions"
+
+    _cache = None
+    _versions = {}
+    _lock = threading.Lock()
+    _listener = None
+    _pid = None
+
+    @staticmethod
+    def is_enabled():
+        """Check whether the L1 cache is turned on
+
+        Returns:
+            bool: True if enabled in settings
+        """
+        return getattr(settings, "CACHE_L1_ENABLED", False)
+
+    @staticmethod
+    def get_cache():
+        """Get the worker-local LRU cache, rebuilding it after a fork
+
+        Returns:
+            LocalLRUCache: Local cache instance
+        """
+        pid = os.getpid()
+        if LocalCacheManager._cache is None or LocalCacheManager._pid != pid:
+            with LocalCacheManager._lock:
+                if LocalCacheManager._cache is None or LocalCacheManager._pid != pid:
+                    LocalCacheManager._cache = LocalLRUCache(
+                        max_bytes=getattr(settings, "CACHE_L1_MAX_BYTES", 32 * 1024 * 1024),
+                        max_entries=getattr(settings, "CACHE_L1_MAX_ENTRIES", 1024),
+                        default_timeout=getattr(settings, "CACHE_L1_TIMEOUT", 60),
+                    )
+                    LocalCacheManager._versions = {}
+                    LocalCacheManager._listener = None
+                    LocalCacheManager._pid = pid
+        return LocalCacheManager._cache
+
+    @staticmethod
+    def clear():
+        """Drop every payload and version known to this worker"""
+        LocalCacheManager.get_cache().clear()
+        LocalCacheManager._versions.clear()
+
+    @staticmethod
+    def get(key):
+        """Get value from the local cache
+
+        Args:
+            key (str): Versioned cache key
+
+        Returns:
+            any: Cached value or None
+        """
+        return LocalCacheManager.get_cache().get(key)
+
+    @staticmethod
+    def set(key, value, timeout=None):
+        """Store value in the local cache
+
+        The local timeout never exceeds `CACHE_L1_TIMEOUT`, so a worker does not
+        keep an entry noticeably longer than Redis would.
+
+        Args:
+            key (str): Versioned cache key
+            value (any): Data to cache
+            timeout (int, optional): Redis timeout in seconds
+        """
+        local_cache = LocalCacheManager.get_cache()
+        if timeout:
+            timeout = min(timeout, local_cache.default_timeout)
+        local_cache.set(key, value, timeout=timeout)
+
+    @staticmethod
+    def get_version(model_name):
+        """Get locally known version of a model
+
+        Args:
+            model_name (str): Name of the model
+
+        Returns:
+            int|None: Version, or None if unknown or due for a refresh
+        """
+        LocalCacheManager.get_cache()
+        LocalCacheManager._ensure_listener()
+        entry = LocalCacheManager._versions.get(model_name)
+        if entry is None:
+            return None
+        version, fetched_at = entry
+        if time.monotonic() - fetched_at > getattr(settings, "CACHE_L1_VERSION_TTL", 5):
+            return None
+        return version
+
+    @staticmethod
+    def set_version(model_name, version):
+        """Remember the current version of a model
+
+        Versions only move forward while the known one is fresh: a request
+        that read the version just before a bump must not write it back over
+        the one the listener applied. Past `CACHE_L1_VERSION_TTL` the version
+        read from Redis wins, e.g. after Redis lost its version keys.
+
+        Args:
+            model_name (str): Name of the model
+            version (int): Current version
+        """
+        version = int(version)
+        now = time.monotonic()
+        with LocalCacheManager._lock:
+            entry = LocalCacheManager._versions.get(model_name)
+            if entry is not None and entry[0] > version:
+                if now - entry[1] <= getattr(settings, "CACHE_L1_VERSION_TTL", 5):
+                    return
+            LocalCacheManager._versions[model_name] = (version, now)
+
+    @staticmethod
+    def publish_version(model_name, version):
+        """Broadcast a version bump to every worker
+
+        Args:
+            model_name (str): Name of the model
+            version (int): New version
+        """
+        LocalCacheManager.set_version(model_name, version)
+        try:
+            from utils.cache.managers.circuit_breaker import CircuitBreakerManager
+
+            connection = get_redis_connection("default")
+            CircuitBreakerManager.call(
+                lambda: connection.publish(LocalCacheManager.get_channel(), f"{model_name}:{version}")
+            )
+        except Exception as e:
+            logger.event("cache.l1", "L1 version publish failed", level=logging.WARNING, model=model_name, error=str(e))
+
+    @staticmethod
+    def get_channel():
+        """Get pub/sub channel name, prefixed like regular cache keys
+
+        Returns:
+            str: Channel name
+        """
+        return cache.make_key(LocalCacheManager.VERSION_CHANNEL)
+
+    @staticmethod
+    def _ensure_listener():
+        listener = LocalCacheManager._listener
+        if listener is not None and listener.is_alive():
+            return
+        with LocalCacheManager._lock:
+            listener = LocalCacheManager._listener
+            if listener is not None and listener.is_alive():
+                return
+            listener = threading.Thread(
+                target=LocalCacheManager._listen,
+                name="cache-l1-version-listener",
+                daemon=True,
+            )
+            LocalCacheManager._listener = listener
+            listener.start()
+
+    @staticmethod
+    def _listen():
+        try:
+            pubsub = get_redis_connection("default").pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(LocalCacheManager.get_channel())
+            # Bumps may have been missed while (re)connecting
+            LocalCacheManager._versions.clear()
+            while True:
+                # Poll instead of blocking on listen(), which would hit the socket timeout when idle
+                message = pubsub.get_message(timeout=1.0)
+                if message is None:
+                    continue
+                data = message.get("data")
+                if isinstance(data, bytes):
+                    data = data.decode()
+                model_name, _, version = str(data).rpartition(":")
+                if model_name and version.isdigit():
+                    LocalCacheManager.set_version(model_name, version)
+        except Exception as e:
+            logger.event("cache.l1", "L1 version listener stopped", level=logging.WARNING, error=str(e))
+            LocalCacheManager._versions.clear()
+            time.sleep(1)
@@ -0,0 +1,307 @@
+import atexit
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from utils.cache.managers.circuit_breaker import CircuitBreakerManager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bucket bound of a histogram sample, `le` sorts between the other labels
+LE_LABEL = re.compile(r'le="([^"]+)",?')
+
+
+class MetricsManager:
+    """
+    Cache and request metrics in the Prometheus text format
+
+    Counters and histograms are accumulated in process memory (a dict update
+    per event, no I/O on the request path) and added to a shared Redis hash by
+    a background thread every `CACHE_METRICS_FLUSH_INTERVAL` seconds, and at
+    exit. Every gunicorn worker on every node adds to the same hash, so the
+    scrape endpoint reports totals whichever worker answers it.
+
+    Hash fields are Prometheus sample names with their labels, e.g.
+    `cache_requests_total{layer="response",model="blogs",result="hit",view="BlogsListView"}`.
+    """
+    METRICS_KEY = "metrics"
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+    METRICS = {
+        "cache_requests_total": ("counter", "Cache lookups by layer and result (hit, miss, stale, not_modified)"),
+        "cache_stores_total": ("counter", "Values written to the versioned cache"),
+        "cache_store_bytes": ("histogram", "Encoded size of values written to the versioned cache"),
+        "cache_version_bumps_total": ("counter", "Model version increments"),
+        "cache_swept_keys_total": ("counter", "Keys deleted by the cache sweeper, orphaned or over the memory budget"),
+        "http_request_duration_seconds": ("histogram", "Request latency by view"),
+        "db_query_duration_seconds": ("histogram", "Database time spent per request by view"),
+        "db_queries_total": ("counter", "Database queries by view"),
+    }
+
+    _values = defaultdict(float)
+    _lock = threading.Lock()
+    _flusher = None
+    _pid = None
+
+    @staticmethod
+    def is_enabled():
+        """Check whether metrics are collected
+
+        Returns:
+            bool: True if enabled in settings
+        """
+        return getattr(settings, "CACHE_METRICS_ENABLED", True)
+
+    @staticmethod
+    def inc(name, labels=None, value=1):
+        """
+        Increment a counter
+
+        Args:
+            name (str): Metric name
+            labels (dict): Label values
+            value (float): Increment
+        """
+        if not MetricsManager.is_enabled():
+            return
+        field = MetricsManager.get_field(name, labels)
+        with MetricsManager._lock:
+            MetricsManager._get_values()[field] += value
+
+    @staticmethod
+    def observe(name, value, labels=None, buckets=LATENCY_BUCKETS):
+        """
+        Record an observation in a histogram
+
+        Args:
+            name (str): Metric name
+            value (float): Observed value
+            labels (dict): Label values
+            buckets (tuple): Upper bounds of the histogram buckets
+        """
+        if not MetricsManager.is_enabled():
+            return
+        labels = labels or {}
+        fields = [
+            MetricsManager.get_field(f"{name}_bucket", dict(labels, le=str(bound)))
+            for bound in buckets if value <= bound
+        ]
+        fields.append(MetricsManager.get_field(f"{name}_bucket", dict(labels, le="+Inf")))
+        with MetricsManager._lock:
+            values = MetricsManager._get_values()
+            for field in fields:
+                values[field] += 1
+            values[MetricsManager.get_field(f"{name}_sum", labels)] += value
+            values[MetricsManager.get_field(f"{name}_count", labels)] += 1
+
+    @staticmethod
+    def record_cache(layer, result, view_name, model_name):
+        """
+        Count a cache lookup
+
+        Args:
+            layer (str): Cache layer, e.g. "response", "page", "pagination"
+            result (str): "hit", "miss", "stale" or "not_modified"
+            view_name (str): Name of the view class
+            model_name (str): Name of the model
+        """
+        MetricsManager.inc(
+            "cache_requests_total",
+            {"layer": layer, "result": result, "view": view_name, "model": model_name}
+        )
+
+    @staticmethod
+    def record_store(base_key, model_name, size):
+        """
+        Count a versioned cache write and its size
+
+        Args:
+            base_key (str): Base cache key, its prefix is used as the key family
+            model_name (str): Name of the model
+            size (int): Encoded size in bytes
+        """
+        labels = {"family": base_key.split("_", 1)[0], "model": model_name}
+        MetricsManager.inc("cache_stores_total", labels)
+        MetricsManager.observe("cache_store_bytes", size, labels, MetricsManager.BYTES_BUCKETS)
+
+    @staticmethod
+    def record_request(view_name, duration, db_duration, db_queries):
+        """
+        Record latency and database time of a request
+
+        Args:
+            view_name (str): Name of the view
+            duration (float): Request latency in seconds
+            db_duration (float): Database time in seconds
+            db_queries (int): Number of database queries
+        """
+        labels = {"view": view_name}
+        MetricsManager.observe("http_request_duration_seconds", duration, labels)
+        MetricsManager.observe("db_query_duration_seconds", db_duration, labels)
+        if db_queries:
+            MetricsManager.inc("db_queries_total", labels, db_queries)
+
+    @staticmethod
+    def get_field(name, labels=None):
+        """Build a Prometheus sample name with sorted labels
+
+        Args:
+            name (str): Metric name
+            labels (dict): Label values
+
+        Returns:
+            str: Sample name, e.g. `name{a="1",b="2"}`
+        """
+        if not labels:
+            return name
+        pairs = ",".join(
+            f'{key}="{MetricsManager.escape(value)}"' for key, value in sorted(labels.items())
+        )
+        return f"{name}{{{pairs}}}"
+
+    @staticmethod
+    def escape(value):
+        """Escape a label value for the text format
+
+        Args:
+            value (any): Label value
+
+        Returns:
+            str: Escaped value
+        """
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @staticmethod
+    def flush():
+        """Add the values accumulated by this process to the shared hash
+
+        Returns:
+            int: Number of fields written
+        """
+        if CircuitBreakerManager.get_state() != CircuitBreakerManager.CLOSED:
+            # Kept until Redis is back, a request probes it first
+            return 0
+
+        with MetricsManager._lock:
+            values = MetricsManager._get_values()
+            if not values:
+                return 0
+            pending = dict(values)
+            values.clear()
+
+        try:
+            pipeline = get_redis_connection("default").pipeline(transaction=False)
+            key = cache.make_key(MetricsManager.METRICS_KEY)
+            for field, value in pending.items():
+                pipeline.hincrbyfloat(key, field, value)
+            pipeline.execute()
+        except Exception as e:
+            # Keep the values for the next flush
+            with MetricsManager._lock:
+                values = MetricsManager._get_values()
+                for field, value in pending.items():
+                    values[field] += value
+            logger.event("cache.metrics", "Metrics flush failed", level=logging.WARNING, error=str(e))
+            return 0
+        return len(pending)
+
+    @staticmethod
+    def collect():
+        """
+        Get the aggregated values of every process
+
+        Returns:
+            dict: Sample name -> value
+        """
+        MetricsManager.flush()
+        connection = get_redis_connection("default")
+        stored = CircuitBreakerManager.call(lambda: connection.hgetall(cache.make_key(MetricsManager.METRICS_KEY)))
+        if stored is None:
+            # Only this process's values are available
+            with MetricsManager._lock:
+                return dict(MetricsManager._get_values())
+        return {field.decode(): float(value) for field, value in stored.items()}
+
+    @staticmethod
+    def render():
+        """
+        Render aggregated metrics in the Prometheus text exposition format
+
+        Returns:
+            str: Exposition text
+        """
+        samples = defaultdict(list)
+        for field, value in MetricsManager.collect().items():
+            samples[MetricsManager.get_family(field)].append((field, value))
+
+        lines = []
+        for name, (metric_type, help_text) in MetricsManager.METRICS.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for field, value in sorted(samples.get(name, []), key=MetricsManager.get_sort_key):
+                lines.append(f"{field} {int(value) if value.is_integer() else value}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def get_family(field):
+        """Get the metric a sample belongs to
+
+        Args:
+            field (str): Sample name with labels
+
+        Returns:
+            str: Metric name
+        """
+        name = field.split("{", 1)[0]
+        for suffix in ("_bucket", "_sum", "_count"):
+            base = name.removesuffix(suffix)
+            if base != name and MetricsManager.METRICS.get(base, ("",))[0] == "histogram":
+                return base
+        return name
+
+    @staticmethod
+    def get_sort_key(sample):
+        """Order samples by labels, histogram buckets by increasing bound
+
+        Args:
+            sample (tuple): (sample name, value)
+
+        Returns:
+            tuple: Sort key
+        """
+        field = sample[0]
+        match = LE_LABEL.search(field)
+        if match is None:
+            return field, 0.0
+        return LE_LABEL.sub("", field), float(match.group(1).replace("+Inf", "inf"))
+
+    @staticmethod
+    def _get_values():
+        # Called with _lock held. A forked worker must not re-send its parent's values.
+        pid = os.getpid()
+        if MetricsManager._pid != pid:
+            MetricsManager._values = defaultdict(float)
+            MetricsManager._pid = pid
+            MetricsManager._flusher = threading.Thread(
+                target=MetricsManager._run_flusher,
+                name="cache-metrics-flusher",
+                daemon=True,
+            )
+            MetricsManager._flusher.start()
+        return MetricsManager._values
+
+    @staticmethod
+    def _run_flusher():
+        atexit.register(MetricsManager.flush)
+        interval = getattr(settings, "CACHE_METRICS_FLUSH_INTERVAL", 10)
+        while True:
+            time.sleep(interval)
+            MetricsManager.flush()
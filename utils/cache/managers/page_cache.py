@@ -0,0 +1,98 @@
+import hashlib
+import json
+
+from django.http import HttpResponse
+
+from utils.cache.managers.cache_key import CacheKeyManager
+from utils.cache.managers.versioned_cache import VersionedCacheManager
+
+
+class PageCacheManager:
+    # Headers that must never be replayed to another client
+    EXCLUDED_HEADERS = {"set-cookie", "content-length"}
+
+    @staticmethod
+    def get_cache_key(request, view_name, view=None):
+        """
+        Generate base cache key for a rendered page (without version)
+
+        Args:
+            request: HTTP request object
+            view_name (str): Name of the view class
+            view: View class the query parameters are canonicalized for, resolved from the path when omitted
+
+        Returns:
+            str: Base cache key
+        """
+        key_data = {
+            "path": request.path,
+            "query_params": CacheKeyManager.get_canonical_params(request, view),
+            "view_name": view_name
+        }
+        key_string = json.dumps(key_data, sort_keys=True)
+        return f"page_{hashlib.md5(key_string.encode()).hexdigest()}"
+
+    @staticmethod
+    def cache_page(request, model_name, view_name, response, timeout=300, view=None):
+        """
+        Cache rendered response bytes and headers with versioning support
+
+        Args:
+            request: HTTP request object
+            model_name (str): Name of the model
+            view_name (str): Name of the view class
+            response: Rendered HTTP response
+            timeout (int): Cache timeout in seconds
+            view: View class, see `get_cache_key`
+
+        Returns:
+            dict: Cached page
+        """
+        cached_page = {
+            "status_code": response.status_code,
+            "headers": [
+                (name, value) for name, value in response.items()
+                if name.lower() not in PageCacheManager.EXCLUDED_HEADERS
+            ],
+            "content": response.content
+        }
+        VersionedCacheManager.set_versioned_data(
+            base_key=PageCacheManager.get_cache_key(request, view_name, view),
+            model_name=model_name,
+            data=cached_page,
+            timeout=timeout
+        )
+        return cached_page
+
+    @staticmethod
+    def get_cached_page(request, model_name, view_name, view=None):
+        """
+        Get versioned cached page
+
+        Args:
+            request: HTTP request object
+            model_name (str): Name of the model
+            view_name (str): Name of the view class
+            view: View class, see `get_cache_key`
+
+        Returns:
+            dict|None: Cached page or None if not found
+        """
+        base_key = PageCacheManager.get_cache_key(request, view_name, view)
+        return VersionedCacheManager.get_versioned_data(base_key, model_name)
+
+    @staticmethod
+    def build_response(cached_page):
+        """
+        Build an HTTP response from a cached page
+
+        Args:
+            cached_page (dict): Cached page
+
+        Returns:
+            HttpResponse: Response with the stored body and headers
+        """
+        response = HttpResponse(cached_page["content"], status=cached_page["status_code"])
+        for name, value in cached_page["headers"]:
+            response[name] = value
+        return response
@@ -68,6 +68,30 @@ class QueryCacheManager:
             timeout=timeout
         )
         return data
+
+    @staticmethod
+    def cache_versioned_data(model_name, data, filters=None, ordering=None, timeout=300):
+        """
+        Cache already serialized rows of a queryset with versioning support
+
+        Args:
+            model_name (str): Name of the model
+            data (list): Serialized rows, as returned to the client
+            filters (dict): Query filters used
+            ordering (list): Ordering fields used
+            timeout (int): Cache timeout in seconds
+
+        Returns:
+            list: Cached data
+        """
+        base_key = QueryCacheManager.get_cache_key(model_name, filters, ordering)
+        VersionedCacheManager.set_versioned_data(
+            base_key=base_key,
+            model_name=model_name,
+            data=data,
+            timeout=timeout
+        )
+        return data
     
     @staticmethod
     def get_versioned_cached_queryset(model_name, filters=None, ordering=None):
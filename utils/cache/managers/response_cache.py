@@ -1,19 +1,23 @@
 import hashlib
 import json
+import time
 from django.core.cache import cache
 from datetime import datetime
+from utils.cache.managers.cache_codec import CacheCodecManager
+from utils.cache.managers.cache_key import CacheKeyManager
 from utils.cache.managers.versioned_cache import VersionedCacheManager
 
 
 class ResponseCacheManager:
     @staticmethod
-    def get_response_cache_key(request, view_name=None):
+    def get_response_cache_key(request, view_name=None, view=None):
         """
         Generate base cache key for API response (without version)
 
         Args:
             request: HTTP request object
             view_name: Name of the view class
+            view: View class the query parameters are canonicalized for, resolved from the path when omitted
 
         Returns:
             str: Base cache key
@@ -21,7 +25,7 @@ class ResponseCacheManager:
         key_data = {
             "path": request.path,
             "method": request.method,
-            "query_params": request.GET.dict(),
+            "query_params": CacheKeyManager.get_canonical_params(request, view),
             "view_name": view_name or request.resolver_match.view_name
         }
         key_string = json.dumps(key_data, sort_keys=True)
@@ -44,9 +48,28 @@ class ResponseCacheManager:
         return VersionedCacheManager.get_versioned_key(base_key, model_name)
 
     @staticmethod
-    def cache_versioned_response(request, model_name, response_data, status_code=200, timeout=300, view_name=None):
+    def get_stale_cache_key(request, view_name=None):
+        """
+        Generate cache key for the last good response of any version
+
+        Args:
+            request: HTTP request object
+            view_name: Name of the view class
+
+        Returns:
+            str: Stale cache key
+        """
+        return f"{ResponseCacheManager.get_response_cache_key(request, view_name)}_stale"
+
+    @staticmethod
+    def cache_versioned_response(request, model_name, response_data, status_code=200, timeout=300, view_name=None,
+                                 stale_timeout=0, surrogate_keys=None):
         """
         Cache API response with versioning support
+
+        With `stale_timeout`, the response soft-expires after `timeout` but is kept
+        `stale_timeout` seconds longer, and a copy is kept under an unversioned
+        key as the fallback for the next version.
         
         Args:
             request: HTTP request object
@@ -55,6 +78,8 @@ class ResponseCacheManager:
             status_code (int): HTTP status code
             timeout (int): Cache timeout in seconds
             view_name: Name of the view class
+            stale_timeout (int): Seconds a stale response may still be served
+            surrogate_keys (list): Surrogate keys of the response, sent again on every hit
             
         Returns:
             dict: Cached response data
@@ -65,6 +90,11 @@ class ResponseCacheManager:
             "status_code": status_code,
             "cached_at": datetime.now().isoformat()
         }
+        if surrogate_keys:
+            cached_response["surrogate_keys"] = surrogate_keys
+        if stale_timeout:
+            cached_response["soft_expires_at"] = time.time() + timeout
+            timeout += stale_timeout
         
         VersionedCacheManager.set_versioned_data(
             base_key=base_key,
@@ -72,8 +102,38 @@ class ResponseCacheManager:
             data=cached_response,
             timeout=timeout
         )
+        if stale_timeout:
+            CacheCodecManager.set(f"{base_key}_stale", cached_response, timeout=timeout)
         return cached_response
 
+    @staticmethod
+    def get_stale_response(request, view_name=None):
+        """
+        Get the last good response cached for the request, whatever its version
+
+        Args:
+            request: HTTP request object
+            view_name: Name of the view class
+
+        Returns:
+            dict|None: Cached response data or None if not found
+        """
+        return CacheCodecManager.get(ResponseCacheManager.get_stale_cache_key(request, view_name))
+
+    @staticmethod
+    def is_soft_expired(cached_response):
+        """
+        Check whether a cached response should be refreshed
+
+        Args:
+            cached_response (dict): Cached response data
+
+        Returns:
+            bool: True if past its soft expiry
+        """
+        soft_expires_at = cached_response.get("soft_expires_at")
+        return soft_expires_at is not None and soft_expires_at <= time.time()
+
     @staticmethod
     def get_versioned_cached_response(request, model_name, view_name=None):
         """
@@ -129,10 +189,10 @@ class ResponseCacheManager:
     def invalidate_response_cache(cache_key):
         """
         Legacy method - versioned cache handles invalidation automatically
+
+        Matching keys are found with SCAN, which does not block Redis like KEYS.
         
         Args:
             cache_key (str): Cache key pattern to invalidate
         """
-        keys = cache.keys(f"*{cache_key}*")
-        if keys:
-            cache.delete_many(keys)
\ No newline at end of file
+        cache.delete_pattern(f"*{cache_key}*")
\ No newline at end of file
@@ -0,0 +1,146 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from utils.cache.managers.circuit_breaker import CircuitBreakerManager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Deletes the lock only if it is still held by the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlightManager:
+    """
+    Collapse concurrent cache misses on the same key into one computation
+
+    Inside a process, threads missing the same key wait for the first one.
+    Across processes, a short-lived Redis lock per versioned key picks a single
+    winner; the others poll the cache until the winner has stored its result.
+    A waiter that runs out of patience computes the value itself, so the lock
+    only ever reduces duplicate work and never blocks a request for long.
+    """
+    POLL_INTERVAL = 0.05
+
+    _flights = {}
+    _lock = threading.Lock()
+    _release_script = None
+
+    @staticmethod
+    def get_lock_key(cache_key):
+        """Generate lock key for a versioned cache key
+
+        Args:
+            cache_key (str): Versioned cache key
+
+        Returns:
+            str: Lock key
+        """
+        return f"lock_{cache_key}"
+
+    @staticmethod
+    def execute(cache_key, compute, fetch):
+        """
+        Return the cached value, computing it at most once per key
+
+        Args:
+            cache_key (str): Versioned cache key being filled
+            compute (callable): Computes the value and stores it in the cache
+            fetch (callable): Reads the value from the cache, returns None on miss
+
+        Returns:
+            any: Value from `compute` or `fetch`
+        """
+        wait_timeout = getattr(settings, "CACHE_SINGLE_FLIGHT_WAIT_TIMEOUT", 5)
+
+        with SingleFlightManager._lock:
+            flight = SingleFlightManager._flights.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = SingleFlightManager._flights[cache_key] = threading.Event()
+
+        if not leader:
+            flight.wait(wait_timeout)
+            result = fetch()
+            if result is not None:
+                logger.event("cache.single_flight", "Joined in-process computation", key=cache_key[:50])
+                return result
+            return compute()
+
+        try:
+            return SingleFlightManager.execute_with_lock(cache_key, compute, fetch, wait_timeout)
+        finally:
+            with SingleFlightManager._lock:
+                SingleFlightManager._flights.pop(cache_key, None)
+            flight.set()
+
+    @staticmethod
+    def execute_with_lock(cache_key, compute, fetch, wait_timeout):
+        """
+        Compute under a Redis lock, or wait for the process holding it
+
+        Args:
+            cache_key (str): Versioned cache key being filled
+            compute (callable): Computes the value and stores it in the cache
+            fetch (callable): Reads the value from the cache, returns None on miss
+            wait_timeout (float): Seconds to wait for another process
+
+        Returns:
+            any: Value from `compute` or `fetch`
+        """
+        lock_key = SingleFlightManager.get_lock_key(cache_key)
+        lock_timeout = getattr(settings, "CACHE_SINGLE_FLIGHT_LOCK_TIMEOUT", 10)
+        token = uuid.uuid4().hex
+
+        if cache.add(lock_key, token, timeout=lock_timeout):
+            try:
+                return compute()
+            finally:
+                SingleFlightManager.release(lock_key, token)
+
+        deadline = time.monotonic() + wait_timeout
+        while time.monotonic() < deadline:
+            time.sleep(SingleFlightManager.POLL_INTERVAL)
+            result = fetch()
+            if result is not None:
+                logger.event("cache.single_flight", "Received result from lock holder", key=cache_key[:50])
+                return result
+            if cache.get(lock_key) is None:
+                break
+
+        return compute()
+
+    @staticmethod
+    def release(lock_key, token):
+        """Release a lock if it is still ours
+
+        Args:
+            lock_key (str): Lock key
+            token (str): Token used when acquiring the lock
+        """
+        if SingleFlightManager._release_script is None:
+            SingleFlightManager._release_script = get_redis_connection("default").register_script(
+                RELEASE_LOCK_SCRIPT
+            )
+
+        def release_locally():
+            # Also covers a lock that was taken in the fallback cache while Redis was down
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+        CircuitBreakerManager.call(
+            lambda: SingleFlightManager._release_script(
+                keys=[cache.make_key(lock_key)], args=[cache.client.encode(token)]
+            ),
+            release_locally,
+        )
@@ -0,0 +1,136 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+
+from utils.cache.managers.cache_codec import CacheCodecManager
+from utils.cache.managers.metrics import MetricsManager
+from utils.cache.managers.versioned_cache import VersionedCacheManager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class StreamCacheManager:
+    """
+    Versioned cache of streamed lists, stored chunk by chunk
+
+    A streamed list is stored as it is sent: each chunk of encoded rows (one
+    JSON document per line) under its own key, then a small manifest with the
+    number of chunks and rows. The manifest is written last, so a reader never
+    finds a list whose chunks were not all stored, and a response abandoned
+    by its client leaves nothing to serve. Hits replay the chunks one at a
+    time, neither side ever holds the whole list.
+
+    Keys:
+        stream_<md5>_<model>_v<n>: {"chunks": int, "rows": int, "paging": dict|None}
+        stream_<md5>_<model>_v<n>_chunk<i>: Rows of chunk i, newline separated
+    """
+
+    @staticmethod
+    def get_cache_key(model_name, filters=None, ordering=None):
+        """
+        Generate base cache key for a streamed list (without version)
+
+        Args:
+            model_name (str): Name of the model
+            filters (dict): Canonical query parameters, pagination included
+            ordering (list): Ordering fields
+
+        Returns:
+            str: Base cache key
+        """
+        key_data = {
+            "model": model_name,
+            "filters": filters or {},
+            "ordering": ordering or []
+        }
+        key_string = json.dumps(key_data, sort_keys=True)
+        return f"stream_{hashlib.md5(key_string.encode()).hexdigest()}"
+
+    @staticmethod
+    def get_versioned_cache_key(model_name, filters=None, ordering=None):
+        """
+        Generate versioned cache key for a streamed list
+
+        Args:
+            model_name (str): Name of the model
+            filters (dict): Canonical query parameters, pagination included
+            ordering (list): Ordering fields
+
+        Returns:
+            str: Versioned cache key
+        """
+        base_key = StreamCacheManager.get_cache_key(model_name, filters, ordering)
+        return VersionedCacheManager.get_versioned_key(base_key, model_name)
+
+    @staticmethod
+    def get_manifest(model_name, filters=None, ordering=None):
+        """
+        Get the manifest of a stored list, read with the model version when it is not known yet
+
+        Args:
+            model_name (str): Name of the model
+            filters (dict): Canonical query parameters, pagination included
+            ordering (list): Ordering fields
+
+        Returns:
+            dict|None: Manifest, None on miss
+        """
+        base_key = StreamCacheManager.get_cache_key(model_name, filters, ordering)
+        return VersionedCacheManager.get_versioned_data(base_key, model_name)
+
+    @staticmethod
+    def iter_cached_chunks(cache_key, manifest):
+        """
+        Read the chunks of a stored list one at a time
+
+        Stops at the first chunk evicted since the manifest was read, the
+        caller finishes the list from the database.
+
+        Args:
+            cache_key (str): Versioned cache key
+            manifest (dict): Manifest of the list
+
+        Yields:
+            bytes: Rows of a chunk, newline separated
+        """
+        for index in range(manifest["chunks"]):
+            chunk_key = CacheCodecManager.get_chunk_key(cache_key, index)
+            chunk = CacheCodecManager.load(chunk_key, cache.get(chunk_key))
+            if chunk is None:
+                logger.event("cache.miss", "Streamed list chunk evicted", key=cache_key, chunk=index)
+                return
+            yield chunk
+
+    @staticmethod
+    def cache_chunks(cache_key, model_name, chunks, get_paging=None, timeout=300):
+        """
+        Store the chunks of a list while they are streamed
+
+        Args:
+            cache_key (str): Versioned cache key
+            model_name (str): Model or object version name
+            chunks (iterable): Rows of each chunk, newline separated
+            get_paging (callable): Returns the paging block stored in the manifest,
+                called with the number of rows once every chunk was sent
+            timeout (int): Cache timeout in seconds
+
+        Yields:
+            bytes: The chunks, unchanged
+        """
+        count = 0
+        rows = 0
+        size = 0
+        for chunk in chunks:
+            value = CacheCodecManager.encode(chunk)
+            cache.set(CacheCodecManager.get_chunk_key(cache_key, count), value, timeout=timeout)
+            count += 1
+            rows += chunk.count(b"\n") + 1
+            size += len(value)
+            yield chunk
+
+        manifest = {"chunks": count, "rows": rows, "paging": get_paging(rows) if get_paging else None}
+        size += CacheCodecManager.set(cache_key, manifest, timeout=timeout)
+        MetricsManager.record_store("stream", VersionedCacheManager.get_model_name(model_name), size)
+        logger.event("cache.store", "Streamed list stored", model=model_name, chunks=count, rows=rows, bytes=size)
@@ -0,0 +1,181 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from utils.cache.managers.versioned_cache import VersionedCacheManager
+
+
+class SurrogateKeyManager:
+    """
+    Surrogate keys (cache tags) naming the models and rows in a response
+
+    A shared HTTP cache (Varnish xkey, Fastly, nginx) stores them with the
+    response and later drops every response carrying a purged key. Keys use
+    the version names of the cache layer: "blogs" for anything built from the
+    blogs table (list pages), "blogs:5" for a row. Nested rows are tagged too,
+    e.g. "skills:2" and "files:7" on a blog.
+
+    Example:
+        Surrogate-Key: blogs blogs:5 files:7 skills:1 skills:2
+    """
+    _model_names = {}
+    _serializer_plans = {}
+
+    @staticmethod
+    def is_enabled():
+        """Check whether responses are tagged
+
+        Returns:
+            bool: True if enabled in settings
+        """
+        return getattr(settings, "CACHE_SURROGATE_KEYS_ENABLED", True)
+
+    @staticmethod
+    def register_model(model, cache_name):
+        """
+        Name the keys of a model's rows after its cache name
+
+        Args:
+            model (Model): Model class
+            cache_name (str): Version name used by VersionedCacheManager
+        """
+        SurrogateKeyManager._model_names[model] = cache_name
+
+    @staticmethod
+    def get_instance_key(instance):
+        """Get the key of a row
+
+        Args:
+            instance (Model): Model instance
+
+        Returns:
+            str|None: Key, None if the model is not registered
+        """
+        return SurrogateKeyManager.get_object_key(type(instance), instance.pk)
+
+    @staticmethod
+    def get_object_key(model, pk):
+        """Get the key of a row from its model and primary key
+
+        Args:
+            model (Model): Model class
+            pk (any): Primary key
+
+        Returns:
+            str|None: Key, None if the model is not registered
+        """
+        cache_name = SurrogateKeyManager._model_names.get(model)
+        if cache_name is None:
+            return None
+        return VersionedCacheManager.get_object_version_name(cache_name, pk)
+
+    @staticmethod
+    def get_keys(version_names, serializer_class, data):
+        """
+        Get the keys of a response
+
+        Rows are read along the fields of the serializer, see `get_serializer_plan`.
+        Computed once when the response is cached and stored with it.
+
+        Args:
+            version_names (list): Version names the response is cached under
+            serializer_class (type): Serializer of the view
+            data (any): Response data
+
+        Returns:
+            list: Keys, the version names first. Past `CACHE_SURROGATE_KEY_MAX`
+                only the version names are kept, which still cover the rows.
+        """
+        keys = list(dict.fromkeys(version_names))
+        if serializer_class is None or not isinstance(data, dict):
+            return keys
+
+        # Rows sit in the envelope of configs.variable_response, under "data_list" for lists
+        rows = data.get("data")
+        if isinstance(rows, dict) and "data_list" in rows:
+            rows = rows["data_list"]
+        row_keys = set()
+        SurrogateKeyManager.collect_keys(rows, SurrogateKeyManager.get_serializer_plan(serializer_class), row_keys)
+        row_keys.difference_update(keys)
+        if len(keys) + len(row_keys) > getattr(settings, "CACHE_SURROGATE_KEY_MAX", 256):
+            return keys
+        return keys + sorted(row_keys)
+
+    @staticmethod
+    def collect_keys(data, plan, keys):
+        """
+        Add the keys of the rows a serializer wrote, and of their nested rows
+
+        Args:
+            data (any): Output of the serializer, a row or a list of rows
+            plan (tuple): (model, primary key field name, {field name: plan}), see `get_serializer_plan`
+            keys (set): Keys found so far
+        """
+        if isinstance(data, list):
+            for item in data:
+                SurrogateKeyManager.collect_keys(item, plan, keys)
+            return
+        if not isinstance(data, dict):
+            return
+        model, pk_name, fields = plan
+        pk = data.get(pk_name) if pk_name else None
+        key = SurrogateKeyManager.get_object_key(model, pk) if pk is not None else None
+        if key is not None:
+            keys.add(key)
+        for name, field_plan in fields.items():
+            value = data.get(name)
+            if value is not None:
+                SurrogateKeyManager.collect_keys(value, field_plan, keys)
+
+    @staticmethod
+    def get_serializer_plan(serializer_class):
+        """
+        Get the model of a serializer and the plans of its nested serializers, built once per class
+
+        Args:
+            serializer_class (type): Model serializer class
+
+        Returns:
+            tuple: (model, primary key field name or None, {field name: plan of the nested serializer})
+        """
+        plan = SurrogateKeyManager._serializer_plans.get(serializer_class)
+        if plan is None:
+            plan = SurrogateKeyManager._build_plan(serializer_class())
+            SurrogateKeyManager._serializer_plans[serializer_class] = plan
+        return plan
+
+    @staticmethod
+    def _build_plan(serializer):
+        if isinstance(serializer, serializers.ListSerializer):
+            serializer = serializer.child
+        if not isinstance(serializer, serializers.ModelSerializer):
+            return None, None, {}
+        model = serializer.Meta.model
+        fields = serializer.fields
+        pk_name = model._meta.pk.name if model._meta.pk.name in fields else None
+        nested = {}
+        for name, field in fields.items():
+            if isinstance(field, serializers.BaseSerializer) and not field.write_only:
+                field_plan = SurrogateKeyManager._build_plan(field)
+                if field_plan[1] or field_plan[2]:
+                    nested[name] = field_plan
+        return model, pk_name, nested
+
+    @staticmethod
+    def set_headers(response, keys):
+        """
+        Set the surrogate key and shared cache lifetime headers
+
+        Args:
+            response: HTTP response
+            keys (list): Surrogate keys
+
+        Returns:
+            HttpResponse: Same response
+        """
+        if keys:
+            response[getattr(settings, "CACHE_SURROGATE_KEY_HEADER", "Surrogate-Key")] = " ".join(keys)
+        max_age = getattr(settings, "CACHE_SURROGATE_MAX_AGE", 0)
+        if max_age:
+            # Only the shared cache reads it, browsers keep following Cache-Control
+            response["Surrogate-Control"] = f"max-age={max_age}"
+        return response
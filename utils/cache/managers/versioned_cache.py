@@ -1,7 +1,31 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from utils.cache.managers.cache_codec import CacheCodecManager
+from utils.cache.managers.circuit_breaker import CircuitBreakerManager
+from utils.cache.managers.local_cache import LocalCacheManager
+from utils.cache.managers.metrics import MetricsManager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Versions resolved during the current request, see VersionedCacheManager.version_snapshot
+_version_snapshot = ContextVar("version_snapshot", default=None)
+
+# Reads a model version and the payload stored under that version in one round trip.
+# KEYS[1] is the version key, KEYS[2] the prefixed versioned key prefix (see get_versioned_prefix).
+GET_VERSION_AND_DATA_SCRIPT = """
+local version = redis.call('GET', KEYS[1]) or '1'
+return {version, redis.call('GET', KEYS[2] .. version)}
+"""
 
 
 class VersionedCacheManager:
+    _get_version_and_data_script = None
+
     @staticmethod
     def get_version_key(model_name):
         """Generate cache key for model version
@@ -14,6 +38,115 @@ class VersionedCacheManager:
         """
         return f"version_{model_name}"
 
+    @staticmethod
+    def get_object_version_name(model_name, pk):
+        """Generate the version name of a single object
+
+        Args:
+            model_name (str): Name of the model
+            pk (any): Primary key of the object
+
+        Returns:
+            str: Version name, e.g. "blogs:5"
+        """
+        return f"{model_name}:{pk}"
+
+    @staticmethod
+    def get_model_name(version_name):
+        """Get the model a version name belongs to, used as a bounded metrics label
+
+        Args:
+            version_name (str): Model or object version name
+
+        Returns:
+            str: Name of the model
+        """
+        return version_name.partition(":")[0]
+
+    @staticmethod
+    @contextmanager
+    def version_snapshot():
+        """
+        Resolve every model version at most once inside the block
+
+        Versions read while the snapshot is open are remembered and reused, so a
+        request does not go back to Redis each time it builds a versioned key.
+        Nested snapshots share the outermost one.
+        """
+        if _version_snapshot.get() is not None:
+            yield
+            return
+
+        token = _version_snapshot.set({})
+        try:
+            yield
+        finally:
+            _version_snapshot.reset(token)
+
+    @staticmethod
+    def get_known_version(model_name):
+        """Get version already resolved locally, without touching Redis
+
+        Args:
+            model_name (str): Name of the model
+
+        Returns:
+            int|None: Version from the request snapshot or the L1 cache, None if unknown
+        """
+        snapshot = _version_snapshot.get()
+        if snapshot is not None and model_name in snapshot:
+            return snapshot[model_name]
+
+        if LocalCacheManager.is_enabled():
+            version = LocalCacheManager.get_version(model_name)
+            if version is not None:
+                if snapshot is not None:
+                    snapshot[model_name] = version
+                return version
+        return None
+
+    @staticmethod
+    def remember_version(model_name, version):
+        """Store a version read from Redis in the request snapshot and the L1 cache
+
+        Args:
+            model_name (str): Name of the model
+            version (int): Current version
+        """
+        snapshot = _version_snapshot.get()
+        if snapshot is not None:
+            snapshot[model_name] = version
+        if LocalCacheManager.is_enabled():
+            LocalCacheManager.set_version(model_name, version)
+
+    @staticmethod
+    def prefetch_versions(model_names):
+        """Resolve several model versions with a single MGET
+
+        Args:
+            model_names (list): Names of the models
+
+        Returns:
+            dict: Model name -> current version
+        """
+        versions = {}
+        missing = []
+        for model_name in model_names:
+            version = VersionedCacheManager.get_known_version(model_name)
+            if version is None:
+                missing.append(model_name)
+            else:
+                versions[model_name] = version
+
+        if missing:
+            version_keys = {VersionedCacheManager.get_version_key(name): name for name in missing}
+            found = cache.get_many(list(version_keys))
+            for version_key, model_name in version_keys.items():
+                version = found.get(version_key) or 1
+                VersionedCacheManager.remember_version(model_name, version)
+                versions[model_name] = version
+        return versions
+
     @staticmethod
     def get_current_version(model_name):
         """Get current version of a model
@@ -24,7 +157,11 @@ class VersionedCacheManager:
         Returns:
             int: Current version
         """
-        return cache.get(VersionedCacheManager.get_version_key(model_name)) or 1
+        version = VersionedCacheManager.get_known_version(model_name)
+        if version is None:
+            version = cache.get(VersionedCacheManager.get_version_key(model_name)) or 1
+            VersionedCacheManager.remember_version(model_name, version)
+        return version
 
     @staticmethod
     def increment_version(model_name):
@@ -32,17 +169,65 @@ class VersionedCacheManager:
         Increment version of a model
 
         Args:
-            model_name:
+            model_name (str): Name of the model
 
         Returns:
+            int|None: New version, None if the bump was deferred
+        """
+        return VersionedCacheManager.increment_versions([model_name]).get(model_name)
 
+    @staticmethod
+    def increment_versions(model_names):
         """
-        version_key = VersionedCacheManager.get_version_key(model_name)
-        current_version = cache.get(version_key) or 1
-        new_version = current_version + 1
-        cache.set(version_key, new_version)
-        print(f"Version incremented: {model_name} v{current_version} -> v{new_version}")
-        return new_version
+        Atomically increment versions of several models
+
+        Every key is bumped with INCR inside one MULTI/EXEC pipeline. A missing key counts as version 1, so its first bump yields 2.
+        Version keys never expire. While Redis is unreachable the bumps are
+        deferred until the circuit closes, see `CircuitBreakerManager`.
+
+        Args:
+            model_names (list): Names of the models
+
+        Returns:
+            dict: Model name -> new version, empty when the bumps were deferred
+        """
+        version_keys = [VersionedCacheManager.get_version_key(name) for name in model_names]
+        pipeline = get_redis_connection("default").pipeline(transaction=True)
+        for version_key in version_keys:
+            redis_key = cache.make_key(version_key)
+            pipeline.set(redis_key, 1, nx=True)
+            pipeline.incr(redis_key)
+        results = CircuitBreakerManager.call(pipeline.execute)
+        if results is None:
+            CircuitBreakerManager.add_pending_versions(model_names)
+            return {}
+
+        versions = dict(zip(model_names, results[1::2]))
+        for model_name, new_version in versions.items():
+            VersionedCacheManager.remember_version(model_name, new_version)
+            if LocalCacheManager.is_enabled():
+                LocalCacheManager.publish_version(model_name, new_version)
+            logger.event("cache.version", "Version incremented", model=model_name, version=new_version)
+            MetricsManager.inc(
+                "cache_version_bumps_total", {"model": VersionedCacheManager.get_model_name(model_name)}
+            )
+        return versions
+
+    @staticmethod
+    def get_versioned_prefix(base_key, model_name):
+        """Generate versioned cache key without its version number
+
+        The version name is part of the key so the sweeper can tell which
+        version a key was written under, see `CacheSweeperManager`.
+
+        Args:
+            base_key (str): Base cache key
+            model_name (str): Model or object version name
+
+        Returns:
+            str: Key prefix, e.g. "response_<md5>_blogs:5_v"
+        """
+        return f"{base_key}_{model_name}_v"
 
     @staticmethod
     def get_versioned_key(base_key, model_name):
@@ -56,12 +241,15 @@ class VersionedCacheManager:
             str: Versioned cache key
         """
         version = VersionedCacheManager.get_current_version(model_name)
-        return f"{base_key}_v{version}"
+        return f"{VersionedCacheManager.get_versioned_prefix(base_key, model_name)}{version}"
 
     @staticmethod
     def get_versioned_data(base_key, model_name):
         """Get versioned data
 
+        When the model version is not known yet, the version and the payload
+        are read together in a single Redis round trip.
+
         Args:
             base_key (str): Base cache key
             model_name (str): Name of the model
@@ -69,8 +257,74 @@ class VersionedCacheManager:
         Returns:
             any: Cached data
         """
-        versioned_key = VersionedCacheManager.get_versioned_key(base_key, model_name)
-        return cache.get(versioned_key)
+        version = VersionedCacheManager.get_known_version(model_name)
+        if version is None:
+            version, data = VersionedCacheManager.get_version_and_data(base_key, model_name)
+            VersionedCacheManager.remember_version(model_name, version)
+            if data is not None and LocalCacheManager.is_enabled():
+                LocalCacheManager.set(f"{VersionedCacheManager.get_versioned_prefix(base_key, model_name)}{version}", data)
+            return data
+
+        versioned_key = f"{VersionedCacheManager.get_versioned_prefix(base_key, model_name)}{version}"
+        if not LocalCacheManager.is_enabled():
+            return CacheCodecManager.get(versioned_key)
+
+        data = LocalCacheManager.get(versioned_key)
+        if data is None:
+            data = CacheCodecManager.get(versioned_key)
+            if data is not None:
+                LocalCacheManager.set(versioned_key, data)
+        return data
+
+    @staticmethod
+    def get_version_and_data(base_key, model_name):
+        """Read current model version and the data stored under it
+
+        Uses a Lua script, falls back to two GETs when the key function does not
+        allow it and while the Redis circuit is open.
+
+        Args:
+            base_key (str): Base cache key
+            model_name (str): Name of the model
+
+        Returns:
+            tuple: (version, data), data is None on miss
+        """
+        version_key = VersionedCacheManager.get_version_key(model_name)
+        prefix = VersionedCacheManager.get_versioned_prefix(base_key, model_name)
+        script = VersionedCacheManager.get_script()
+
+        def read_with_script():
+            result = script(keys=[cache.make_key(version_key), cache.make_key(prefix)])
+            version = int(result[0])
+            data = None
+            if len(result) > 1 and result[1] is not None:
+                data = CacheCodecManager.load(f"{prefix}{version}", cache.client.decode(result[1]))
+            return version, data
+
+        def read_separately():
+            version = cache.get(version_key) or 1
+            return version, CacheCodecManager.get(f"{prefix}{version}")
+
+        if script is None:
+            return read_separately()
+        # While Redis is unreachable the client answers the separate reads from its fallback cache
+        return CircuitBreakerManager.call(read_with_script, read_separately)
+
+    @staticmethod
+    def get_script():
+        """Get the registered version-and-data Lua script
+
+        Returns:
+            Script|None: Script, or None when the cache uses a key function that
+                does not end with the raw key
+        """
+        if VersionedCacheManager._get_version_and_data_script is None:
+            script = False
+            if cache.make_key("key_v") + "1" == cache.make_key("key_v1"):
+                script = get_redis_connection("default").register_script(GET_VERSION_AND_DATA_SCRIPT)
+            VersionedCacheManager._get_version_and_data_script = script
+        return VersionedCacheManager._get_version_and_data_script or None
 
     @staticmethod
     def set_versioned_data(base_key, model_name, data, timeout=None):
@@ -86,6 +340,9 @@ class VersionedCacheManager:
             any: Cached data
         """
         versioned_key = VersionedCacheManager.get_versioned_key(base_key, model_name)
-        cache.set(versioned_key, data, timeout=timeout)
-        print(f"Versioned cache stored: {versioned_key[:50]}...")
-        return versioned_key
\ No newline at end of file
+        size = CacheCodecManager.set(versioned_key, data, timeout=timeout)
+        MetricsManager.record_store(base_key, VersionedCacheManager.get_model_name(model_name), size)
+        if LocalCacheManager.is_enabled():
+            LocalCacheManager.set(versioned_key, data, timeout=timeout)
+        logger.event("cache.store", "Versioned cache stored", key=base_key.split("_", 1)[0], model=model_name, bytes=size)
+        return versioned_key
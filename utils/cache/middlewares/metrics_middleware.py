@@ -0,0 +1,64 @@
+import time
+
+from django.db import connection
+from django.urls import Resolver404, resolve
+
+from utils.cache.managers.metrics import MetricsManager
+
+
+class MetricsMiddleware:
+    """
+    Record latency, database time and query count of every request by view
+
+    Place it first so the time spent in the other middlewares, including
+    answers from the page cache, is measured.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not MetricsManager.is_enabled():
+            return self.get_response(request)
+
+        db_stats = {"duration": 0.0, "queries": 0}
+
+        def record_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                db_stats["duration"] += time.perf_counter() - start
+                db_stats["queries"] += 1
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(record_query):
+            response = self.get_response(request)
+        MetricsManager.record_request(
+            self.get_view_name(request),
+            time.perf_counter() - start,
+            db_stats["duration"],
+            db_stats["queries"]
+        )
+        return response
+
+    def get_view_name(self, request):
+        """
+        Get a bounded label for the view that handled the request
+
+        Args:
+            request: HTTP request object
+
+        Returns:
+            str: View class or function name, "unmatched" for unknown paths
+        """
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            try:
+                match = resolve(request.path_info)
+            except Resolver404:
+                return "unmatched"
+        view_class = getattr(match.func, "view_class", None)
+        if view_class is not None:
+            return view_class.__name__
+        return getattr(match.func, "__name__", match.view_name)
@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+from utils.cache.managers.http_cache import HttpCacheManager
+from utils.cache.managers.metrics import MetricsManager
+from utils.cache.managers.page_cache import PageCacheManager
+from utils.cache.managers.versioned_cache import VersionedCacheManager
+from utils.cache.mixins.response_cache_mixin import ResponseCacheMixin
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PageCacheMiddleware:
+    """
+    Full-page cache for anonymous GET requests to ResponseCacheMixin views
+
+    Rendered body bytes and headers are stored under a key versioned like the
+    view's response cache (model or object version), so a hit is answered before sessions, CSRF, auth and the
+    view itself run. Place it right after the middlewares whose headers
+    depend on the request (CORS, security, static files).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        view_class, view_kwargs = self.get_cacheable_view(request)
+        if view_class is None:
+            return self.get_response(request)
+
+        model_name = view_class.queryset.model.__name__.lower()
+        version_name = view_class.get_cache_version_name(view_kwargs)
+        view_name = view_class.__name__
+
+        # Resolve model versions once for the whole request
+        with VersionedCacheManager.version_snapshot():
+            # Answer conditional requests from model versions alone
+            if "HTTP_IF_NONE_MATCH" in request.META:
+                etag = HttpCacheManager.get_etag(
+                    request, view_name, view_class.get_cache_version_names(view_kwargs), view=view_class
+                )
+                if HttpCacheManager.is_not_modified(request, etag):
+                    logger.event("cache.hit", "Not modified", layer="page", view=view_name, model=model_name)
+                    MetricsManager.record_cache("page", "not_modified", view_name, model_name)
+                    return HttpCacheManager.not_modified_response(etag, view_class.get_cache_control())
+
+            cached_page = PageCacheManager.get_cached_page(request, version_name, view_name, view=view_class)
+            if cached_page:
+                logger.event("cache.hit", "Using page cache", view=view_name, model=model_name)
+                MetricsManager.record_cache("page", "hit", view_name, model_name)
+                response = PageCacheManager.build_response(cached_page)
+                if HttpCacheManager.matches_any(request) and response.has_header("ETag"):
+                    return HttpCacheManager.not_modified_response(response["ETag"], view_class.get_cache_control())
+                return response
+
+            MetricsManager.record_cache("page", "miss", view_name, model_name)
+            response = self.get_response(request)
+            if self.is_cacheable_response(response):
+                PageCacheManager.cache_page(
+                    request=request,
+                    model_name=version_name,
+                    view_name=view_name,
+                    response=response,
+                    timeout=view_class.response_cache_timeout,
+                    view=view_class
+                )
+            return response
+
+    def get_cacheable_view(self, request):
+        """
+        Get the view class handling the request if its page may be cached
+
+        Args:
+            request: HTTP request object
+
+        Returns:
+            tuple: (view class, URL kwargs), (None, None) if the request must not use the page cache
+        """
+        if not getattr(settings, "CACHE_PAGE_ENABLED", True) or request.method != "GET":
+            return None, None
+        # Only anonymous JSON requests, the browsable API renders per user
+        if "HTTP_AUTHORIZATION" in request.META or settings.SESSION_COOKIE_NAME in request.COOKIES:
+            return None, None
+        if "text/html" in request.META.get("HTTP_ACCEPT", ""):
+            return None, None
+
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None, None
+
+        view_class = getattr(match.func, "view_class", None)
+        if view_class is None or not issubclass(view_class, ResponseCacheMixin):
+            return None, None
+        if not view_class.full_page_cache or view_class.is_streamed(request):
+            return None, None
+        return view_class, match.kwargs
+
+    def is_cacheable_response(self, response):
+        """
+        Check whether a rendered response may be stored
+
+        Args:
+            response: HTTP response
+
+        Returns:
+            bool: True if the response may be replayed to other clients
+        """
+        return (
+            response.status_code == 200
+            and not response.streaming
+            and not response.cookies
+            and not getattr(response, "is_stale_cache", False)
+            and response.get("Content-Type", "").startswith("application/json")
+        )
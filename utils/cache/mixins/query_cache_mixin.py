@@ -1,25 +1,36 @@
 from configs.variable_response import response_data
 from utils.cache.managers.query_cache import QueryCacheManager
 from utils.cache.managers.versioned_cache import VersionedCacheManager
+from utils.db.eager_loading import EagerLoadingMixin
+from utils.logger import get_logger
 
-class ListRequestMixin:
-    """Base mixin for handling list requests with pagination"""
+logger = get_logger(__name__)
+
+class ListRequestMixin(EagerLoadingMixin):
+    """Base mixin for handling list requests with pagination, querysets eager-load what the serializer reads"""
 
     def handle_list_request(self, request):
         """Handle list request with pagination support"""
         model_name = self.queryset.model.__name__.lower()
-        print(f"Searching {model_name}")
+        logger.event("view.list", "Searching", view=self.__class__.__name__, model=model_name)
 
         queryset = self.filter_queryset(self.get_queryset())
         paginator = self.pagination_class()
+        cache_timeout = getattr(self, 'cache_timeout', 300)
+
+        stream_format = paginator.get_stream_format(request, self)
+        if stream_format is not None:
+            logger.event("view.list", "Streaming", view=self.__class__.__name__, model=model_name, format=stream_format)
+            return paginator.get_streaming_response(
+                queryset, self.serializer_class, request, self, cache_timeout, stream_format
+            )
         
         # Use cached pagination method
-        cache_timeout = getattr(self, 'cache_timeout', 300)
         result = paginator.get_paginated_data_with_cache(
             queryset, self.serializer_class, request, self, cache_timeout
         )
             
-        print(f"Found {model_name}, total: [{result['paging']['total_rows']}]")
+        logger.event("view.list", "Found", view=self.__class__.__name__, model=model_name, total=result['paging'].get('total_rows'))
         return response_data(data=result)
 
 class QueryCacheMixin(ListRequestMixin):
@@ -29,18 +40,25 @@ class QueryCacheMixin(ListRequestMixin):
     def handle_list_request(self, request):
         """Handle list request with versioned caching support"""
         model_name = self.queryset.model.__name__.lower()
-        print(f"Searching {model_name}")
+        logger.event("view.list", "Searching", view=self.__class__.__name__, model=model_name)
 
         queryset = self.filter_queryset(self.get_queryset())
         paginator = self.pagination_class()
+        cache_timeout = getattr(self, 'cache_timeout', 300)
+
+        stream_format = paginator.get_stream_format(request, self)
+        if stream_format is not None:
+            logger.event("view.list", "Streaming", view=self.__class__.__name__, model=model_name, format=stream_format)
+            return paginator.get_streaming_response(
+                queryset, self.serializer_class, request, self, cache_timeout, stream_format
+            )
         
         # Use cached pagination method
-        cache_timeout = getattr(self, 'cache_timeout', 300)
         result = paginator.get_paginated_data_with_cache(
             queryset, self.serializer_class, request, self, cache_timeout
         )
         
-        print(f"Found {model_name}, total: [{result['paging']['total_rows']}]")
+        logger.event("view.list", "Found", view=self.__class__.__name__, model=model_name, total=result['paging'].get('total_rows'))
         return response_data(data=result)
 
 
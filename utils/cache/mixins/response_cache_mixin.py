@@ -1,6 +1,16 @@
+import time
+
 from rest_framework.response import Response
+from utils.cache.managers.background_refresh import BackgroundRefreshManager
+from utils.cache.managers.http_cache import HttpCacheManager
+from utils.cache.managers.metrics import MetricsManager
 from utils.cache.managers.response_cache import ResponseCacheManager
+from utils.cache.managers.single_flight import SingleFlightManager
+from utils.cache.managers.surrogate_key import SurrogateKeyManager
 from utils.cache.managers.versioned_cache import VersionedCacheManager
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class ResponseCacheMixin:
@@ -10,10 +20,90 @@ class ResponseCacheMixin:
     This mixin automatically caches successful responses and serves them
     on subsequent requests until the data version changes.
     
+    With `response_cache_stale_ttl` set, responses are served stale-while-revalidate:
+    past `response_cache_timeout`, or right after a version bump, the last good
+    response is returned immediately and refreshed in a background thread.
+    Views opt in, with a window no longer than their data may lag behind an edit.
+    
     Attributes:
         response_cache_timeout (int): Cache timeout in seconds (default: 300)
+        response_cache_stale_ttl (int): Seconds a stale response may be served
+            while refreshing, 0 disables stale-while-revalidate (default: 0)
+        full_page_cache (bool): Let PageCacheMiddleware store the rendered
+            response bytes for anonymous requests (default: True)
+        http_cache_max_age (int): Seconds clients may reuse a response before
+            revalidating it with its ETag (default: 0)
+        cache_warm_pages (int): First pages re-rendered by CacheWarmerManager
+            after a version bump, 0 disables warming (default: 0)
+        cache_warm_params (tuple): Query parameter sets warmed for each page
+            (default: the request without parameters)
+        cache_object_kwarg (str): URL kwarg holding the object's primary key.
+            When set, responses are keyed by the object version (e.g. "blogs:5")
+            instead of the model version, so only edits that touch this object
+            invalidate them. The model must be registered with `track_objects`
+            (default: None)
     """
     response_cache_timeout = 300
+    response_cache_stale_ttl = 0
+    full_page_cache = True
+    http_cache_max_age = 0
+    cache_warm_pages = 0
+    cache_warm_params = ({},)
+    cache_object_kwarg = None
+
+    @classmethod
+    def get_cache_model_names(cls):
+        """
+        Get names of the model versions the cached response depends on
+
+        Related models are covered through the invalidation graph, which bumps
+        this model's version when any of them changes.
+
+        Returns:
+            list: Model names
+        """
+        return [cls.queryset.model.__name__.lower()]
+
+    @classmethod
+    def get_cache_version_name(cls, view_kwargs):
+        """
+        Get the version name the cached response of a request is keyed by
+
+        Args:
+            view_kwargs (dict): URL kwargs of the request
+
+        Returns:
+            str: Object version name with `cache_object_kwarg`, model name otherwise
+        """
+        model_name = cls.queryset.model.__name__.lower()
+        if cls.cache_object_kwarg is None:
+            return model_name
+        return VersionedCacheManager.get_object_version_name(model_name, view_kwargs[cls.cache_object_kwarg])
+
+    @classmethod
+    def get_cache_version_names(cls, view_kwargs):
+        """
+        Get the version names the ETag of a request is built from
+
+        Args:
+            view_kwargs (dict): URL kwargs of the request
+
+        Returns:
+            list: Version names
+        """
+        if cls.cache_object_kwarg is None:
+            return cls.get_cache_model_names()
+        return [cls.get_cache_version_name(view_kwargs)]
+
+    @classmethod
+    def get_cache_control(cls):
+        """
+        Get Cache-Control header value for this view
+
+        Returns:
+            str: Cache-Control header value
+        """
+        return HttpCacheManager.get_cache_control(cls.http_cache_max_age, cls.response_cache_stale_ttl)
 
     def dispatch(self, request, *args, **kwargs):
         """
@@ -30,44 +120,245 @@ class ResponseCacheMixin:
         if request.method != 'GET':
             return super().dispatch(request, *args, **kwargs)
 
+        # Resolve model versions once for the whole request
+        with VersionedCacheManager.version_snapshot():
+            return self.dispatch_cached(request, *args, **kwargs)
+
+    def dispatch_cached(self, request, *args, **kwargs):
+        """
+        Serve a GET request from the versioned response cache, or compute and store it
+
+        Args:
+            request: HTTP request object
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Response: Cached or fresh response
+        """
         model_name = self.queryset.model.__name__.lower()
+        version_name = self.get_cache_version_name(kwargs)
         view_name = self.__class__.__name__
 
+        # Answer conditional requests from model versions alone
+        if "HTTP_IF_NONE_MATCH" in request.META:
+            etag = HttpCacheManager.get_etag(request, view_name, self.get_cache_version_names(kwargs), view=self.__class__)
+            if HttpCacheManager.is_not_modified(request, etag):
+                logger.event("cache.hit", "Not modified", layer="response", view=view_name, model=model_name)
+                MetricsManager.record_cache("response", "not_modified", view_name, model_name)
+                return HttpCacheManager.not_modified_response(etag, self.get_cache_control())
+
+        # Streamed lists are never stored here, the paginator caches them chunk by chunk
+        if self.is_streamed(request):
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == 200:
+                self.set_http_cache_headers(request, view_name, response)
+            return response
+
         cached_response = ResponseCacheManager.get_versioned_cached_response(
             request=request,
-            model_name=model_name,
+            model_name=version_name,
             view_name=view_name
         )
 
         if cached_response:
-            version = VersionedCacheManager.get_current_version(model_name)
-            print(f"Using versioned response cache for {view_name} v{version} ")
-            
-            # Create proper Response object with renderer context
-            response = Response(
-                data=cached_response["data"],
-                status=cached_response["status_code"]
-            )
-            # Set renderer context from the view
-            response.accepted_renderer = self.get_renderers()[0]
-            response.accepted_media_type = response.accepted_renderer.media_type
-            response.renderer_context = self.get_renderer_context()
+            version = VersionedCacheManager.get_current_version(version_name)
+            logger.event("cache.hit", "Using versioned response cache", view=view_name, model=version_name, version=version)
+            MetricsManager.record_cache("response", "hit", view_name, model_name)
+            response = self.build_response(cached_response)
+            self.set_http_cache_headers(request, view_name, response)
+            if HttpCacheManager.matches_any(request):
+                return HttpCacheManager.not_modified_response(response["ETag"], self.get_cache_control())
+            if self.response_cache_stale_ttl and ResponseCacheManager.is_soft_expired(cached_response):
+                self.schedule_refresh(request, version_name, view_name, *args, **kwargs)
+                response.is_stale_cache = True
             return response
 
-        print(f"Computing fresh response for {view_name}")
-        response = super().dispatch(request, *args, **kwargs)
+        # The cache warmer must store the current version, not replay the stale one
+        if self.response_cache_stale_ttl and not getattr(request, "is_cache_warming", False):
+            stale_response = ResponseCacheManager.get_stale_response(request, view_name)
+            if stale_response:
+                logger.event("cache.stale", "Using stale response cache while refreshing", view=view_name, model=model_name)
+                MetricsManager.record_cache("response", "stale", view_name, model_name)
+                self.schedule_refresh(request, version_name, view_name, *args, **kwargs)
+                response = self.build_response(stale_response)
+                response.is_stale_cache = True
+                return response
 
+        MetricsManager.record_cache("response", "miss", view_name, model_name)
+        # Only one request per versioned key computes the response, others wait for it
+        response = SingleFlightManager.execute(
+            cache_key=ResponseCacheManager.get_versioned_cache_key(request, version_name, view_name),
+            compute=lambda: self.compute_response(request, version_name, view_name, *args, **kwargs),
+            fetch=lambda: self.get_cached_response(request, version_name, view_name)
+        )
         if response.status_code == 200:
+            self.set_http_cache_headers(request, view_name, response)
+        return response
+
+    @classmethod
+    def is_streamed(cls, request):
+        """
+        Check whether the view's paginator streams the response of a request
+
+        Args:
+            request: HTTP request object
+
+        Returns:
+            bool: True for streamed list responses
+        """
+        pagination_class = getattr(cls, "pagination_class", None)
+        if pagination_class is None or not hasattr(pagination_class, "get_stream_format"):
+            return False
+        return pagination_class().get_stream_format(request, cls) is not None
+
+    def set_http_cache_headers(self, request, view_name, response):
+        """
+        Set ETag, Cache-Control, Vary and surrogate key headers on a current-version response
+
+        The surrogate keys were computed when the response was cached, see
+        `compute_response`. Responses without them (streamed lists, entries
+        cached before keys were stored) are tagged with their version names.
+
+        Args:
+            request: HTTP request object
+            view_name (str): Name of the view class
+            response: Response to update
+        """
+        version_names = self.get_cache_version_names(self.kwargs)
+        etag = HttpCacheManager.get_etag(request, view_name, version_names, view=self.__class__)
+        HttpCacheManager.set_headers(response, etag, self.get_cache_control())
+        if SurrogateKeyManager.is_enabled():
+            keys = getattr(response, "surrogate_keys", None) or list(dict.fromkeys(version_names))
+            SurrogateKeyManager.set_headers(response, keys)
+
+    def get_surrogate_keys(self, data):
+        """
+        Get the surrogate keys of a response, stored with it in the cache
+
+        Args:
+            data (any): Response data
+
+        Returns:
+            list|None: Keys, None when surrogate keys are disabled
+        """
+        if not SurrogateKeyManager.is_enabled():
+            return None
+        return SurrogateKeyManager.get_keys(
+            self.get_cache_version_names(self.kwargs), self.get_serializer_class(), data
+        )
+
+    def schedule_refresh(self, request, version_name, view_name, *args, **kwargs):
+        """
+        Recompute the response for this request in the background
+
+        A fresh view instance and a new request with the same path, query
+        parameters, host and scheme are used, so nothing is shared with the
+        request that is being answered from the stale entry.
+
+        Args:
+            request: HTTP request object
+            version_name (str): Model or object version name
+            view_name (str): Name of the view class
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+        """
+        view_class = self.__class__
+        refresh_request = BackgroundRefreshManager.build_request(
+            request.path,
+            request.GET.copy(),
+            host=request.get_host(),
+            secure=request.is_secure(),
+            accept=request.META.get("HTTP_ACCEPT", "application/json")
+        )
+
+        def refresh():
+            view = view_class()
+            view.setup(refresh_request, *args, **kwargs)
+            with VersionedCacheManager.version_snapshot():
+                view.compute_response(refresh_request, version_name, view_name, *args, **kwargs)
+
+        BackgroundRefreshManager.submit(
+            ResponseCacheManager.get_versioned_cache_key(request, version_name, view_name),
+            refresh
+        )
+
+    def get_cached_response(self, request, version_name, view_name):
+        """
+        Build a Response from the versioned response cache
+
+        Args:
+            request: HTTP request object
+            version_name (str): Model or object version name
+            view_name (str): Name of the view class
+
+        Returns:
+            Response|None: Cached response or None on miss
+        """
+        cached_response = ResponseCacheManager.get_versioned_cached_response(
+            request=request,
+            model_name=version_name,
+            view_name=view_name
+        )
+        if not cached_response:
+            return None
+        return self.build_response(cached_response)
+
+    def build_response(self, cached_response):
+        """
+        Create a Response with renderer context from cached response data
+
+        Args:
+            cached_response (dict): Cached response data
+
+        Returns:
+            Response: Response ready to be rendered
+        """
+        response = Response(
+            data=cached_response["data"],
+            status=cached_response["status_code"]
+        )
+        # Set renderer context from the view
+        response.accepted_renderer = self.get_renderers()[0]
+        response.accepted_media_type = response.accepted_renderer.media_type
+        response.renderer_context = self.get_renderer_context()
+        response.surrogate_keys = cached_response.get("surrogate_keys")
+        return response
+
+    def compute_response(self, request, version_name, view_name, *args, **kwargs):
+        """
+        Run the view and store a successful response in the versioned cache
+
+        Args:
+            request: HTTP request object
+            version_name (str): Model or object version name
+            view_name (str): Name of the view class
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Response: Fresh response
+        """
+        start = time.perf_counter()
+        response = super().dispatch(request, *args, **kwargs)
+        logger.event(
+            "cache.miss", "Computed fresh response",
+            view=view_name, model=version_name, duration=round(time.perf_counter() - start, 4)
+        )
+
+        if response.status_code == 200 and not response.streaming:
+            response.surrogate_keys = self.get_surrogate_keys(response.data)
             ResponseCacheManager.cache_versioned_response(
                 request=request,
-                model_name=model_name,
+                model_name=version_name,
                 response_data=response.data,
                 status_code=response.status_code,
                 timeout=self.response_cache_timeout,
-                view_name=view_name
+                view_name=view_name,
+                stale_timeout=self.response_cache_stale_ttl,
+                surrogate_keys=response.surrogate_keys
             )
-            version = VersionedCacheManager.get_current_version(model_name)
-            print(f"Stored versioned response cache for {view_name} v{version}")
+            version = VersionedCacheManager.get_current_version(version_name)
+            logger.event("cache.store", "Stored versioned response cache", view=view_name, model=version_name, version=version)
 
         return response
-
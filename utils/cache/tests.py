@@ -0,0 +1,605 @@
+import io
+import pickle
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from common.models import PendingCacheVersion
+from info.serializers import BlogsSerializer
+from utils.cache.managers.background_refresh import BackgroundRefreshManager
+from utils.cache.managers.cache_codec import CacheCodecManager
+from utils.cache.managers.cache_sweeper import STALE_KEY, VERSIONED_KEY, CacheSweeperManager
+from utils.cache.managers.cache_warmer import CacheWarmerManager
+from utils.cache.managers.circuit_breaker import CircuitBreakerManager
+from utils.cache.managers.invalidation import CacheInvalidationManager
+from utils.cache.managers.local_cache import LocalCacheManager
+from utils.cache.managers.metrics import LE_LABEL, MetricsManager
+from utils.cache.managers.surrogate_key import SurrogateKeyManager
+from utils.cache.managers.versioned_cache import VersionedCacheManager
+from utils.cache.mixins.response_cache_mixin import ResponseCacheMixin
+from utils.testing.fixtures import seed_portfolio
+
+
+class CacheInvalidationTests(TestCase):
+    """Version bumps queued by the dependency graph in info/signals.py and common/signals.py"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portfolio = seed_portfolio(blogs=2, projects=2, experiences=1, skills=4)
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+        # The test data transaction never commits, flush what it queued as if it had
+        CacheInvalidationManager.flush()
+
+    def commit(self, change):
+        """Run a change in its own transaction and return the names of each version bump it caused"""
+        with mock.patch.object(
+            VersionedCacheManager, "increment_versions", wraps=VersionedCacheManager.increment_versions
+        ) as increment_versions:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    change()
+        return [set(call.args[0]) for call in increment_versions.call_args_list]
+
+    def test_file_saved_through_project_images(self):
+        project = self.portfolio["projects"][0]
+        image = project.images.first().image
+
+        def change():
+            image.format = "webp"
+            image.save()
+            image.save()
+
+        # Every model reading a File, and the one project showing this image
+        self.assertEqual(
+            self.commit(change),
+            [{"files", "blogs", "experiences", "projects", f"projects:{project.pk}"}],
+        )
+
+    def test_file_deleted_through_project_images(self):
+        project = self.portfolio["projects"][0]
+        image = project.images.first().image
+
+        # The ProjectImage row is set to NULL, which the "images" path covers too
+        self.assertEqual(
+            self.commit(image.delete),
+            [{"files", "blogs", "experiences", "projects", f"projects:{project.pk}"}],
+        )
+
+    def test_skills_m2m_changed(self):
+        project = self.portfolio["projects"][0]
+        skill = self.portfolio["skills"][-1]
+
+        def change():
+            project.skills.add(skill)
+            project.skills.remove(skill)
+
+        # The blogs through table is not touched, so blogs keep their version
+        self.assertEqual(self.commit(change), [{"projects", f"projects:{project.pk}"}])
+
+    def test_skills_m2m_cleared_from_the_skill_side(self):
+        skill = self.portfolio["skills"][1]
+        blog_names = {f"blogs:{blog.pk}" for blog in skill.personal_info_blogs_skills.all()}
+        project_names = {f"projects:{project.pk}" for project in skill.personal_info_experiences.all()}
+
+        self.assertEqual(
+            self.commit(lambda: (skill.personal_info_blogs_skills.clear(), skill.personal_info_experiences.clear())),
+            [{"blogs", "projects"} | blog_names | project_names],
+        )
+
+    def test_forced_file_url_backfill(self):
+        project = self.portfolio["projects"][0]
+        backfill = lambda *args: call_command("backfill_file_urls", "--batch-size", "4", *args, stdout=io.StringIO())
+
+        # Filling missing URLs serves the same ones
+        self.assertEqual(self.commit(backfill), [])
+        bumps = self.commit(lambda: backfill("--force"))
+        self.assertEqual(len(bumps), 1)
+        self.assertLessEqual({"files", "blogs", "experiences", "projects", f"projects:{project.pk}"}, bumps[0])
+
+    def test_nothing_bumped_on_rollback(self):
+        image = self.portfolio["projects"][0].images.first().image
+
+        def rolled_back():
+            try:
+                with transaction.atomic():
+                    image.save()
+                    self.portfolio["projects"][0].skills.clear()
+                    raise RuntimeError("rollback")
+            except RuntimeError:
+                pass
+
+        self.assertEqual(self.commit(rolled_back), [])
+        # Names of the rolled back transaction are not carried into the next one
+        project = self.portfolio["projects"][1]
+        self.assertEqual(
+            self.commit(project.link_github.save),
+            [{"links", "projects", f"links:{project.link_github_id}", f"projects:{project.pk}"}],
+        )
+
+
+class StaleWhileRevalidateTests(TestCase):
+    """Stale responses of ResponseCacheMixin and their background refresh"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portfolio = seed_portfolio(blogs=3, projects=1, experiences=1, skills=2)
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+        CacheInvalidationManager.flush()
+
+    def test_stale_response_refreshed_on_a_new_request(self):
+        url = reverse("info:blogs-list")
+        self.client.get(url, {"page_size": "2"}, HTTP_X_TRACE="first")
+        VersionedCacheManager.increment_version("blogs")
+
+        with mock.patch.object(BackgroundRefreshManager, "submit") as submit:
+            response = self.client.get(url, {"page_size": "2"}, HTTP_X_TRACE="second")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(submit.call_count, 1)
+
+        # The refresh only carries path, parameters, host and scheme over
+        with mock.patch.object(ResponseCacheMixin, "compute_response") as compute_response:
+            submit.call_args.args[1]()
+        refresh_request = compute_response.call_args.args[0]
+        self.assertNotIn("HTTP_X_TRACE", refresh_request.META)
+        self.assertEqual(refresh_request.GET.dict(), {"page_size": "2"})
+        self.assertEqual(refresh_request.path, url)
+        self.assertEqual(refresh_request.get_host(), "testserver")
+        self.assertFalse(refresh_request.is_secure())
+
+    def test_build_request(self):
+        params = QueryDict("tag=a&tag=b&search=two words")
+        request = BackgroundRefreshManager.build_request(
+            "/api/info/blogs/", params, host="example.com", secure=True, accept="text/html"
+        )
+        self.assertIsInstance(request, WSGIRequest)
+        self.assertEqual(request.method, "GET")
+        self.assertEqual(request.GET, params)
+        self.assertEqual(request.build_absolute_uri(), "https://example.com/api/info/blogs/?tag=a&tag=b&search=two+words")
+        self.assertEqual(request.META["HTTP_ACCEPT"], "text/html")
+        self.assertEqual(request.body, b"")
+
+    def test_views_without_a_window_never_serve_stale(self):
+        url = reverse("info:experiences-list")
+        self.client.get(url)
+        VersionedCacheManager.increment_version("experiences")
+
+        with mock.patch.object(BackgroundRefreshManager, "submit") as submit:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        submit.assert_not_called()
+
+
+class ConditionalRequestTests(TestCase):
+    """If-None-Match handling of ResponseCacheMixin and PageCacheMiddleware"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portfolio = seed_portfolio(blogs=1, projects=1, experiences=1, skills=1)
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+
+    def test_any_etag_on_a_missing_object(self):
+        url = reverse("info:blogs-detail", kwargs={"id": 999})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH="*").status_code, 404)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH="*").status_code, 404)
+
+    def test_any_etag_once_the_object_is_cached(self):
+        url = reverse("info:blogs-detail", kwargs={"id": self.portfolio["blogs"][0].id})
+        first = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(first.status_code, 200)
+        second = self.client.get(url, HTTP_IF_NONE_MATCH="*")
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_matching_etag(self):
+        url = reverse("info:blogs-list")
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+
+
+class CacheWarmerTests(TestCase):
+    """Pages re-rendered by CacheWarmerManager after a version bump"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portfolio = seed_portfolio(blogs=25, projects=1, experiences=1, skills=3)
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+
+    @override_settings(SECURE_SSL_REDIRECT=True)
+    def test_warm_behind_ssl_redirect(self):
+        path = reverse("info:blogs-list")
+        self.assertEqual(CacheWarmerManager.warm(path, {}, 3), 3)
+
+        # The pages are now answered from the cache
+        with self.assertNumQueries(0):
+            response = self.client.get(path, {"page": "2"}, secure=True)
+        self.assertEqual(response.status_code, 200)
+
+
+class CacheCodecTests(TestCase):
+    """Values written through CodecSerializer, the SERIALIZER of the default cache"""
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+
+    def get_raw(self, key):
+        return get_redis_connection("default").get(cache.make_key(key))
+
+    def test_payload_encoded_once(self):
+        data = {"data": {"data_list": [{"id": index, "title": "Blog post"} for index in range(100)]}}
+        size = CacheCodecManager.set("codec_test", data)
+
+        raw = self.get_raw("codec_test")
+        self.assertEqual(len(raw), size)
+        self.assertEqual(raw[:2], CacheCodecManager.MSGPACK + CacheCodecManager.ZLIB)
+        self.assertEqual(CacheCodecManager.get("codec_test"), data)
+
+    @override_settings(CACHE_VALUE_CHUNK_BYTES=64, CACHE_VALUE_COMPRESS_MIN_BYTES=0)
+    def test_chunked_payload(self):
+        data = [{"id": index, "title": f"Blog post {index}"} for index in range(20)]
+        CacheCodecManager.set("codec_test", data)
+
+        self.assertEqual(self.get_raw("codec_test")[:1], CacheCodecManager.CHUNKED)
+        self.assertEqual(self.get_raw("codec_test_chunk0")[:2], CacheCodecManager.BYTES + CacheCodecManager.RAW)
+        self.assertEqual(CacheCodecManager.get("codec_test"), data)
+        cache.delete("codec_test_chunk1")
+        self.assertIsNone(CacheCodecManager.get("codec_test"))
+
+    def test_plain_cache_values(self):
+        cache.set("codec_test", {"token": "abc", "when": timezone.now().date()})
+        self.assertEqual(self.get_raw("codec_test")[:1], CacheCodecManager.PICKLE)
+        self.assertEqual(cache.get("codec_test")["token"], "abc")
+        cache.set("codec_test", 7)
+        self.assertEqual(cache.incr("codec_test"), 8)
+
+    def test_values_kept_exactly(self):
+        values = [
+            ("a", 1),
+            {1: "one", 2: "two"},
+            {"rows": [(1, 2)], "ids": {3, 4}},
+            {"data": [{"id": 1, "title": "Blog post", "score": 1.5, "status": True, "cover_img": None}]},
+        ]
+        for codec in ("msgpack", "json"):
+            with self.subTest(codec=codec), override_settings(CACHE_VALUE_CODEC=codec):
+                for value in values:
+                    cache.set("codec_test", value)
+                    self.assertEqual(cache.get("codec_test"), value)
+                    self.assertIs(type(cache.get("codec_test")), type(value))
+                # Only the last one is left to msgpack or JSON
+                self.assertNotEqual(self.get_raw("codec_test")[:1], CacheCodecManager.PICKLE)
+                cache.set("codec_test", {1: "one"})
+                self.assertEqual(self.get_raw("codec_test")[:1], CacheCodecManager.PICKLE)
+
+    def test_values_pickled_before_the_codec(self):
+        connection = get_redis_connection("default")
+        connection.set(cache.make_key("codec_test"), pickle.dumps({"status_code": 200}))
+        self.assertEqual(cache.get("codec_test"), {"status_code": 200})
+        # Payloads of the codec pickled again by the previous serializer
+        connection.set(cache.make_key("codec_test"), pickle.dumps(bytes(CacheCodecManager.encode([1, 2]))))
+        self.assertEqual(cache.get("codec_test"), [1, 2])
+
+    def test_fallback_cache_while_redis_is_down(self):
+        data = {"data": {"data_list": [{"id": 1}]}}
+        with mock.patch.object(CircuitBreakerManager, "allow_request", return_value=False):
+            CacheCodecManager.set("codec_test", data)
+            self.assertEqual(CacheCodecManager.get("codec_test"), data)
+        CircuitBreakerManager.get_fallback_cache().clear()
+
+
+class CircuitBreakerReplayTests(TestCase):
+    """Version bumps deferred by CircuitBreakerManager and their replay"""
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+
+    def fail_bump(self, model_names):
+        with mock.patch("redis.client.Pipeline.execute", side_effect=RedisTimeoutError("Timeout reading from socket")):
+            self.assertEqual(VersionedCacheManager.increment_versions(model_names), {})
+
+    def test_single_failure_below_the_threshold(self):
+        version = VersionedCacheManager.get_current_version("blogs")
+        self.fail_bump(["blogs"])
+        self.assertEqual(CircuitBreakerManager.get_state(), CircuitBreakerManager.CLOSED)
+        self.assertTrue(PendingCacheVersion.objects.filter(name="blogs").exists())
+
+        # The next successful call replays the bump although the circuit never opened, without a query
+        with self.assertNumQueries(0):
+            cache.get("breaker_test")
+        self.assertEqual(VersionedCacheManager.get_current_version("blogs"), version + 1)
+        self.assertFalse(CircuitBreakerManager._pending_versions)
+
+        # The stored row is left to the replay thread
+        self.assertEqual(CircuitBreakerManager.replay_stored_versions(), 0)
+        self.assertEqual(VersionedCacheManager.get_current_version("blogs"), version + 2)
+        self.assertFalse(PendingCacheVersion.objects.exists())
+
+    def test_redis_calls_never_query_the_database(self):
+        PendingCacheVersion.objects.create(name="projects", deferred_at=timezone.now())
+        with self.assertNumQueries(0), mock.patch.object(CircuitBreakerManager, "schedule_replay") as schedule_replay:
+            # Recovering from an outage only starts the replay thread
+            with mock.patch.object(CircuitBreakerManager, "_state", CircuitBreakerManager.HALF_OPEN):
+                cache.get("breaker_test")
+            cache.get("breaker_test")
+        schedule_replay.assert_called_once_with()
+        self.assertTrue(PendingCacheVersion.objects.exists())
+
+    def test_bump_stored_by_another_process(self):
+        version = VersionedCacheManager.get_current_version("projects")
+        PendingCacheVersion.objects.create(name="projects", deferred_at=timezone.now())
+        self.assertEqual(CircuitBreakerManager.replay_stored_versions(), 0)
+        self.assertEqual(VersionedCacheManager.get_current_version("projects"), version + 1)
+        self.assertFalse(PendingCacheVersion.objects.exists())
+
+    def test_bump_stored_while_redis_is_down(self):
+        PendingCacheVersion.objects.create(name="projects", deferred_at=timezone.now())
+        with mock.patch("redis.client.Pipeline.execute", side_effect=RedisTimeoutError("Timeout reading from socket")):
+            self.assertEqual(CircuitBreakerManager.replay_stored_versions(), 1)
+        CircuitBreakerManager.record_success()
+        self.assertTrue(PendingCacheVersion.objects.exists())
+
+    def test_bump_deferred_again_during_a_replay(self):
+        self.fail_bump(["skills"])
+        CircuitBreakerManager._pending_versions.clear()
+
+        def increment_versions(model_names):
+            # Another worker fails to bump "skills" while this replay runs
+            PendingCacheVersion.objects.filter(name="skills").update(deferred_at=timezone.now())
+            return {"skills": 2}
+
+        with mock.patch.object(VersionedCacheManager, "increment_versions", side_effect=increment_versions):
+            self.assertEqual(CircuitBreakerManager.replay_stored_versions(), 1)
+        # Only the row that was read is deleted
+        self.assertTrue(PendingCacheVersion.objects.filter(name="skills").exists())
+
+class SurrogateKeyTests(TestCase):
+    """Surrogate keys of ResponseCacheMixin responses"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portfolio = seed_portfolio(blogs=2, projects=1, experiences=1, skills=3)
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+
+    @override_settings(CACHE_PAGE_ENABLED=False)
+    def test_keys_computed_once_and_sent_on_hits(self):
+        blog = self.portfolio["blogs"][0]
+        url = reverse("info:blogs-detail", kwargs={"id": blog.id})
+        with mock.patch.object(SurrogateKeyManager, "get_keys", wraps=SurrogateKeyManager.get_keys) as get_keys:
+            first = self.client.get(url)
+            second = self.client.get(url)
+        self.assertEqual(get_keys.call_count, 1)
+        self.assertEqual(first["Surrogate-Key"], second["Surrogate-Key"])
+        keys = first["Surrogate-Key"].split()
+        self.assertIn(f"blogs:{blog.id}", keys)
+        self.assertIn(f"files:{blog.cover_img_id}", keys)
+        for skill in blog.skills.all():
+            self.assertIn(f"skills:{skill.id}", keys)
+
+    def test_rows_read_along_serializer_fields(self):
+        data = {"data": {"data_list": [{
+            "id": 1,
+            "title": "Blog post",
+            # A value shaped like a skill under a key the serializer does not nest is not a row
+            "cover_img": {"id": 7, "derived_urls": {"id": 3, "icon": "", "name": "Skill"}},
+            "skills": [{"id": 2, "name": "Skill"}],
+        }]}}
+        self.assertEqual(
+            SurrogateKeyManager.get_keys(["blogs"], BlogsSerializer, data),
+            ["blogs", "blogs:1", "files:7", "skills:2"],
+        )
+
+
+class CacheSweeperTests(TestCase):
+    """Keys removed by CacheSweeperManager"""
+    MD5 = "0123456789abcdef0123456789abcdef"
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+
+    def store(self, base_key, model_name, rows=3):
+        """Store a versioned entry and return its keys, chunks included"""
+        key = VersionedCacheManager.set_versioned_data(base_key, model_name, list(range(rows)), timeout=300)
+        return {key} | set(cache.keys(f"{key}_chunk*"))
+
+    def get_keys(self):
+        return set(cache.keys("*")) - {CacheSweeperManager.CURSOR_KEY}
+
+    def test_key_patterns(self):
+        match = VERSIONED_KEY.match(f"response_{self.MD5}_blogs:5_v3_chunk0")
+        self.assertEqual((match.group("name"), match.group("version")), ("blogs:5", "3"))
+        match = VERSIONED_KEY.match(f"page_{self.MD5}_personal_info_blogs_v12")
+        self.assertEqual(match.group("name"), "personal_info_blogs")
+        self.assertIsNone(VERSIONED_KEY.match(f"response_{self.MD5}_stale"))
+        self.assertIsNone(VERSIONED_KEY.match("version_blogs"))
+        self.assertTrue(STALE_KEY.match(f"response_{self.MD5}_stale_chunk1"))
+
+    @override_settings(CACHE_VALUE_CHUNK_BYTES=64, CACHE_VALUE_COMPRESS_MIN_BYTES=0)
+    def test_only_superseded_versions_removed(self):
+        superseded = self.store(f"response_{self.MD5}", "blogs") | self.store(f"query_{self.MD5}", "projects", rows=100)
+        object_entry = self.store(f"response_{self.MD5}", "blogs:5")
+        VersionedCacheManager.increment_versions(["blogs", "projects"])
+        current = self.store(f"response_{self.MD5}", "blogs") | self.store(f"query_{self.MD5}", "projects", rows=100)
+        CacheCodecManager.set(f"response_{self.MD5}_stale", list(range(100)), timeout=300)
+        stale = set(cache.keys(f"response_{self.MD5}_stale*"))
+        self.assertTrue(any("_chunk" in key for key in superseded))
+        self.assertTrue(any("_chunk" in key for key in current))
+        self.assertTrue(any("_chunk" in key for key in stale))
+        kept = self.get_keys() - superseded
+
+        stats = CacheSweeperManager.sweep()
+        self.assertEqual(stats["orphaned"], len(superseded))
+        self.assertEqual(stats["evicted"], 0)
+        self.assertEqual(self.get_keys(), kept)
+        # Current versions, the other object name, stale copies and version keys
+        self.assertTrue(object_entry | current | stale <= kept)
+        self.assertIn(VersionedCacheManager.get_version_key("blogs"), kept)
+
+    def test_memory_budget_spares_version_keys(self):
+        VersionedCacheManager.increment_versions(["blogs"])
+        self.store(f"response_{self.MD5}", "blogs")
+        CacheCodecManager.set(f"response_{self.MD5}_stale", [1], timeout=300)
+
+        with mock.patch.object(CacheSweeperManager, "get_used_memory", return_value=2048):
+            stats = CacheSweeperManager.sweep(memory_budget=1024, dry_run=True)
+            self.assertEqual(stats["evicted"], 2)
+            self.assertEqual(len(self.get_keys()), 3)
+            CacheSweeperManager.sweep(memory_budget=1024)
+        self.assertEqual(self.get_keys(), {VersionedCacheManager.get_version_key("blogs")})
+
+
+@override_settings(CACHE_L1_ENABLED=True, CACHE_L1_VERSION_TTL=5)
+class LocalCacheVersionTests(TestCase):
+    """Model versions known to the L1 cache of a worker"""
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+        LocalCacheManager.clear()
+        # The pub/sub listener is stood in for by set_version calls
+        listener = mock.patch.object(LocalCacheManager, "_ensure_listener")
+        listener.start()
+        self.addCleanup(listener.stop)
+        self.addCleanup(LocalCacheManager.clear)
+
+    def test_version_read_before_a_bump_applied_after_it(self):
+        LocalCacheManager.set_version("blogs", 4)
+        # The listener applies the bump, then a request that read v4 from Redis remembers it
+        LocalCacheManager.set_version("blogs", 5)
+        VersionedCacheManager.remember_version("blogs", 4)
+        self.assertEqual(LocalCacheManager.get_version("blogs"), 5)
+        self.assertEqual(VersionedCacheManager.get_known_version("blogs"), 5)
+
+    def test_version_read_again_after_the_ttl(self):
+        LocalCacheManager.set_version("blogs", 5)
+        with mock.patch("utils.cache.managers.local_cache.time.monotonic", return_value=time.monotonic() + 6):
+            self.assertIsNone(LocalCacheManager.get_version("blogs"))
+            # Redis lost its version keys, the version read from it is taken
+            LocalCacheManager.set_version("blogs", 1)
+            self.assertEqual(LocalCacheManager.get_version("blogs"), 1)
+
+    def test_entries_served_under_the_current_version(self):
+        VersionedCacheManager.set_versioned_data("response_l1", "blogs", {"rows": [1]}, timeout=60)
+        self.assertEqual(VersionedCacheManager.get_versioned_data("response_l1", "blogs"), {"rows": [1]})
+        VersionedCacheManager.increment_versions(["blogs"])
+        self.assertIsNone(VersionedCacheManager.get_versioned_data("response_l1", "blogs"))
+
+
+@override_settings(CACHE_METRICS_ENABLED=True, CACHE_METRICS_FLUSH_INTERVAL=3600)
+class MetricsTests(TestCase):
+    """Samples recorded by MetricsManager and MetricsMiddleware, and the /metrics endpoint"""
+    REQUESTS = 'cache_requests_total{layer="response",model="blogs",result="hit",view="BlogsListView"}'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portfolio = seed_portfolio(blogs=2, projects=1, experiences=1, skills=1)
+
+    def setUp(self):
+        cache.clear()
+        CircuitBreakerManager.record_success()
+        with MetricsManager._lock:
+            MetricsManager._get_values().clear()
+
+    def test_samples_recorded(self):
+        MetricsManager.record_cache("response", "hit", "BlogsListView", "blogs")
+        MetricsManager.record_cache("response", "hit", "BlogsListView", "blogs")
+        MetricsManager.record_request("BlogsListView", 0.02, 0.004, 3)
+
+        values = MetricsManager.collect()
+        self.assertEqual(values[self.REQUESTS], 2)
+        self.assertNotIn('http_request_duration_seconds_bucket{le="0.01",view="BlogsListView"}', values)
+        self.assertEqual(values['http_request_duration_seconds_bucket{le="0.025",view="BlogsListView"}'], 1)
+        self.assertEqual(values['http_request_duration_seconds_bucket{le="+Inf",view="BlogsListView"}'], 1)
+        self.assertAlmostEqual(values['http_request_duration_seconds_sum{view="BlogsListView"}'], 0.02)
+        self.assertEqual(values['http_request_duration_seconds_count{view="BlogsListView"}'], 1)
+        self.assertEqual(values['db_queries_total{view="BlogsListView"}'], 3)
+
+    def test_nothing_recorded_when_disabled(self):
+        with override_settings(CACHE_METRICS_ENABLED=False):
+            MetricsManager.record_cache("response", "hit", "BlogsListView", "blogs")
+            self.client.get(reverse("info:blogs-list"))
+        self.assertEqual(MetricsManager.collect(), {})
+
+    def test_render_adds_up_workers(self):
+        # Another worker has already flushed its values to the shared hash
+        get_redis_connection("default").hincrbyfloat(cache.make_key(MetricsManager.METRICS_KEY), self.REQUESTS, 5)
+        MetricsManager.record_cache("response", "hit", "BlogsListView", "blogs")
+        MetricsManager.record_cache("response", "miss", "BlogsListView", "blogs")
+
+        lines = MetricsManager.render().splitlines()
+        self.assertIn(f"{self.REQUESTS} 6", lines)
+        self.assertIn('cache_requests_total{layer="response",model="blogs",result="miss",view="BlogsListView"} 1', lines)
+        help_line = lines.index("# HELP cache_requests_total " + MetricsManager.METRICS["cache_requests_total"][1])
+        self.assertEqual(lines[help_line + 1], "# TYPE cache_requests_total counter")
+        self.assertLess(help_line, lines.index(f"{self.REQUESTS} 6"))
+
+    def test_render_orders_histogram_buckets_by_bound(self):
+        MetricsManager.observe("http_request_duration_seconds", 0.001, {"view": "BlogsListView"})
+
+        lines = [
+            line for line in MetricsManager.render().splitlines()
+            if line.startswith("http_request_duration_seconds")
+        ]
+        bounds = [LE_LABEL.search(line).group(1) for line in lines if "_bucket" in line]
+        self.assertEqual(bounds, [str(bound) for bound in MetricsManager.LATENCY_BUCKETS] + ["+Inf"])
+        self.assertTrue(lines[-2].startswith("http_request_duration_seconds_count"))
+        self.assertTrue(lines[-1].startswith("http_request_duration_seconds_sum"))
+
+    def test_label_values_escaped(self):
+        self.assertEqual(
+            MetricsManager.get_field("db_queries_total", {"view": 'a"b\\c\n'}),
+            'db_queries_total{view="a\\"b\\\\c\\n"}',
+        )
+
+    def test_requests_recorded_by_view(self):
+        self.client.get(reverse("info:blogs-list"))
+        self.client.get("/no-such-path/")
+
+        values = MetricsManager.collect()
+        self.assertEqual(values['http_request_duration_seconds_count{view="BlogsListView"}'], 1)
+        self.assertGreater(values['db_queries_total{view="BlogsListView"}'], 0)
+        self.assertEqual(values['http_request_duration_seconds_count{view="unmatched"}'], 1)
+
+    @override_settings(METRICS_TOKEN="secret", DEBUG=False)
+    def test_endpoint_with_a_token(self):
+        url = reverse("metrics")
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.assertEqual(self.client.get(url, HTTP_AUTHORIZATION="Bearer other").status_code, 401)
+
+        response = self.client.get(url, HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        self.assertIn("# TYPE cache_requests_total counter", response.content.decode())
+
+    @override_settings(METRICS_TOKEN="")
+    def test_endpoint_without_a_token(self):
+        url = reverse("metrics")
+        with override_settings(DEBUG=False):
+            self.assertEqual(self.client.get(url).status_code, 404)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get(url).status_code, 200)
@@ -0,0 +1,297 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+from rest_framework import serializers
+
+# Model fields whose Python values DRF returns unchanged (to_representation is str(), int() or bool() of the same type)
+PASSTHROUGH_MODEL_FIELDS = {
+    "AutoField", "BigAutoField", "SmallAutoField",
+    "IntegerField", "BigIntegerField", "SmallIntegerField",
+    "PositiveIntegerField", "PositiveBigIntegerField", "PositiveSmallIntegerField",
+    "BooleanField", "CharField", "TextField", "JSONField",
+}
+PASSTHROUGH_SERIALIZER_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.JSONField, serializers.ReadOnlyField,
+)
+
+
+def get_related(obj, name):
+    """Objects of a to-many relation, read from the prefetch cache without building a manager when loaded"""
+    prefetched = getattr(obj, "_prefetched_objects_cache", None)
+    if prefetched and name in prefetched:
+        return prefetched[name]
+    return getattr(obj, name).all()
+
+
+class CompiledSerializerManager:
+    """
+    Read-only serializers compiled into plain functions building dicts
+
+    A `ModelSerializer` walks its fields on every object: attribute lookup
+    through `get_attribute`, a `to_representation` call per field, a nested
+    serializer per relation. For output only, the field list is known once
+    per class, so each serializer is compiled into the source of a function
+    returning the dict literal directly:
+
+        def represent_BlogsSerializer(obj):
+            return {
+                'id': obj.id,
+                'title': obj.title,
+                'cover_img': None if (value := obj.cover_img) is None else represent_cover_img(value),
+                'skills': [represent_skills(item) for item in get_related(obj, 'skills')],
+            }
+
+    Fields returned unchanged by DRF are read as attributes, other model
+    fields (dates, decimals) keep DRF's `to_representation` and
+    `SerializerMethodField` keeps its method, so the output is the one of
+    `serializer.data`. Serializers with fields the compiler does not handle
+    (dotted or `*` sources, properties, methods) keep DRF's
+    `to_representation`. To-many relations are read from the prefetch cache.
+
+    Flat serializers are also compiled for `.values_list()` rows, which
+    skips building model instances when serializing a queryset.
+
+    Example:
+        data = CompiledSerializerManager.serialize(BlogsSerializer, page)
+    """
+    _functions = {}
+    _row_plans = {}
+
+    @staticmethod
+    def serialize(serializer_class, objects):
+        """
+        Serialize objects for output like `serializer_class(objects, many=True).data`
+
+        Args:
+            serializer_class (type): Serializer class
+            objects (QuerySet|list): Objects, an unevaluated queryset of a flat
+                serializer is read with `.values_list()`
+
+        Returns:
+            list: Representation of each object
+        """
+        if not getattr(settings, "SERIALIZER_COMPILE_ENABLED", True):
+            return serializer_class(objects, many=True).data
+
+        if isinstance(objects, QuerySet) and objects._result_cache is None:
+            row_plan = CompiledSerializerManager.get_row_plan(serializer_class)
+            if row_plan is not None:
+                sources, represent_row = row_plan
+                rows = objects.prefetch_related(None).values_list(*sources)
+                return [represent_row(row) for row in rows]
+
+        represent = CompiledSerializerManager.get_function(serializer_class)
+        return [represent(obj) for obj in objects]
+
+    @staticmethod
+    def iterate(serializer_class, queryset, chunk_size):
+        """
+        Serialize a queryset row by row, fetching `chunk_size` rows per query
+
+        Args:
+            serializer_class (type): Serializer class
+            queryset (QuerySet): Unevaluated queryset, prefetches run per chunk
+            chunk_size (int): Rows fetched at a time
+
+        Returns:
+            iterator: Representation of each object
+        """
+        if not getattr(settings, "SERIALIZER_COMPILE_ENABLED", True):
+            serializer = serializer_class()
+            return map(serializer.to_representation, queryset.iterator(chunk_size=chunk_size))
+
+        row_plan = CompiledSerializerManager.get_row_plan(serializer_class)
+        if row_plan is not None:
+            sources, represent_row = row_plan
+            rows = queryset.prefetch_related(None).values_list(*sources)
+            return map(represent_row, rows.iterator(chunk_size=chunk_size))
+        return map(CompiledSerializerManager.get_function(serializer_class), queryset.iterator(chunk_size=chunk_size))
+
+    @staticmethod
+    def get_function(serializer_class):
+        """
+        Get the compiled function of a serializer, built once per class
+
+        Args:
+            serializer_class (type): Serializer class
+
+        Returns:
+            callable: Function of a model instance returning its representation
+        """
+        represent = CompiledSerializerManager._functions.get(serializer_class)
+        if represent is None:
+            represent = CompiledSerializerManager.compile(serializer_class())
+            CompiledSerializerManager._functions[serializer_class] = represent
+        return represent
+
+    @staticmethod
+    def get_row_plan(serializer_class):
+        """
+        Get the `.values_list()` columns and row function of a flat serializer
+
+        Args:
+            serializer_class (type): Serializer class
+
+        Returns:
+            tuple|None: (column names, function of a row), None when the serializer
+                reads anything but concrete columns or leaves out the primary key
+        """
+        if serializer_class not in CompiledSerializerManager._row_plans:
+            CompiledSerializerManager._row_plans[serializer_class] = CompiledSerializerManager.compile_rows(
+                serializer_class()
+            )
+        return CompiledSerializerManager._row_plans[serializer_class]
+
+    @staticmethod
+    def compile(serializer):
+        """
+        Compile a serializer instance into a function of a model instance
+
+        Args:
+            serializer (Serializer): Serializer, the child of a list serializer
+
+        Returns:
+            callable: Compiled function, the serializer's `to_representation` when
+                some field cannot be compiled
+        """
+        if not isinstance(serializer, serializers.ModelSerializer):
+            return serializer.to_representation
+        model = serializer.Meta.model
+        namespace = {}
+        entries = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField):
+                namespace[f"f_{name}"] = getattr(serializer, field.method_name)
+                entries.append((name, f"f_{name}(obj)"))
+                continue
+
+            model_field = CompiledSerializerManager.get_model_field(model, field)
+            if model_field is None:
+                return serializer.to_representation
+            attribute = f"obj.{field.source}"
+
+            if isinstance(field, serializers.ListSerializer):
+                namespace[f"f_{name}"] = CompiledSerializerManager.compile(field.child)
+                namespace["get_related"] = get_related
+                entries.append((name, f"[f_{name}(item) for item in get_related(obj, {field.source!r})]"))
+            elif isinstance(field, serializers.BaseSerializer):
+                if not model_field.is_relation:
+                    return serializer.to_representation
+                namespace[f"f_{name}"] = CompiledSerializerManager.compile(field)
+                entries.append((name, f"None if (value := {attribute}) is None else f_{name}(value)"))
+            elif model_field.is_relation or not model_field.concrete:
+                return serializer.to_representation
+            else:
+                entries.append((name, CompiledSerializerManager.get_column_expression(
+                    name, field, model_field, attribute, namespace
+                )))
+
+        return CompiledSerializerManager.build_function(
+            f"represent_{serializer.__class__.__name__}", "obj", entries, namespace
+        )
+
+    @staticmethod
+    def compile_rows(serializer):
+        """
+        Compile a flat serializer into a function of a `.values_list()` row
+
+        Args:
+            serializer (Serializer): Serializer instance
+
+        Returns:
+            tuple|None: (column names, compiled function), None when not flat
+        """
+        if not isinstance(serializer, serializers.ModelSerializer):
+            return None
+        model = serializer.Meta.model
+        namespace = {}
+        entries = []
+        sources = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer)):
+                return None
+            model_field = CompiledSerializerManager.get_model_field(model, field)
+            if model_field is None or model_field.is_relation or not model_field.concrete:
+                return None
+            entries.append((name, CompiledSerializerManager.get_column_expression(
+                name, field, model_field, f"row[{len(sources)}]", namespace
+            )))
+            sources.append(model_field.name)
+
+        # Without the primary key, values_list() of a distinct queryset could merge rows
+        if model._meta.pk.name not in sources:
+            return None
+        return sources, CompiledSerializerManager.build_function(
+            f"represent_{serializer.__class__.__name__}_row", "row", entries, namespace
+        )
+
+    @staticmethod
+    def get_model_field(model, field):
+        """
+        Get the model field a serializer field reads
+
+        Args:
+            model (type): Model of the serializer
+            field (Field): Serializer field
+
+        Returns:
+            Field|None: Model field, None when the source is not a plain field name
+        """
+        if field.source == "*" or not field.source.isidentifier():
+            return None
+        try:
+            return model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+
+    @staticmethod
+    def get_column_expression(name, field, model_field, value, namespace):
+        """
+        Get the source expression of a column's representation
+
+        Args:
+            name (str): Field name
+            field (Field): Serializer field
+            model_field (Field): Concrete model field
+            value (str): Expression of the column value
+            namespace (dict): Globals of the compiled function, converters are added to it
+
+        Returns:
+            str: Expression
+        """
+        passthrough = (
+            isinstance(field, PASSTHROUGH_SERIALIZER_FIELDS)
+            and model_field.get_internal_type() in PASSTHROUGH_MODEL_FIELDS
+            and not getattr(field, "binary", False)
+        )
+        if passthrough:
+            return value
+        namespace[f"f_{name}"] = field.to_representation
+        return f"None if (value := {value}) is None else f_{name}(value)"
+
+    @staticmethod
+    def build_function(function_name, argument, entries, namespace):
+        """
+        Compile the source of a function returning a dict literal
+
+        Args:
+            function_name (str): Name shown in tracebacks and profiles
+            argument (str): Argument name
+            entries (list): (key, expression) in output order
+            namespace (dict): Globals of the function
+
+        Returns:
+            callable: Compiled function
+        """
+        lines = [f"def {function_name}({argument}):", "    return {"]
+        lines.extend(f"        {key!r}: {expression}," for key, expression in entries)
+        lines.append("    }")
+        exec(compile("\n".join(lines), f"<compiled {function_name}>", "exec"), namespace)
+        return namespace[function_name]
@@ -0,0 +1,82 @@
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, Window
+
+
+class CountStrategyManager:
+    """
+    Ways of getting a list total cheaper than a separate COUNT(*)
+
+    window: the page query also selects `COUNT(*) OVER ()`, the window is
+        computed over the whole filtered set before LIMIT, so one query
+        returns the page and the total. Not used for DISTINCT querysets,
+        whose window would count the joined duplicates.
+    estimated: unfiltered querysets on PostgreSQL read the planner's row
+        estimate (`pg_class.reltuples`, refreshed by ANALYZE/autovacuum).
+        Estimates below `COUNT_ESTIMATE_MIN_ROWS` are replaced by an exact
+        COUNT, which is cheap at that size.
+    """
+    TOTAL_ANNOTATION = "window_total_rows"
+
+    @staticmethod
+    def supports_window(queryset):
+        """
+        Check whether a queryset's total can come from a window over its page
+
+        Args:
+            queryset (QuerySet): Unsliced queryset
+
+        Returns:
+            bool: True when the database has window functions and the query is not DISTINCT
+        """
+        return (
+            connections[queryset.db].features.supports_over_clause
+            and not queryset.query.distinct
+            and not queryset.query.is_sliced
+        )
+
+    @staticmethod
+    def get_window_page(queryset, offset, limit):
+        """
+        Fetch a page and the queryset's total in one query
+
+        Args:
+            queryset (QuerySet): Queryset accepted by `supports_window`
+            offset (int): First row of the page
+            limit (int): Rows per page
+
+        Returns:
+            tuple: (rows, total), total is None when the page is empty
+        """
+        annotated = queryset.annotate(**{CountStrategyManager.TOTAL_ANNOTATION: Window(expression=Count("*"))})
+        rows = list(annotated[offset:offset + limit])
+        if not rows:
+            return rows, None
+        return rows, getattr(rows[0], CountStrategyManager.TOTAL_ANNOTATION)
+
+    @staticmethod
+    def get_estimated_count(queryset):
+        """
+        Get the planner's row estimate of an unfiltered queryset
+
+        Args:
+            queryset (QuerySet): Queryset
+
+        Returns:
+            int|None: Estimate, None when the queryset is filtered, the database is
+                not PostgreSQL, the table was never analyzed or the estimate is
+                below `COUNT_ESTIMATE_MIN_ROWS`
+        """
+        if queryset.query.where or queryset.query.distinct or queryset.query.is_sliced:
+            return None
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        # reltuples is -1 (0 before PostgreSQL 14) until the table is first analyzed
+        if row is None or row[0] < getattr(settings, "COUNT_ESTIMATE_MIN_ROWS", 100000):
+            return None
+        return row[0]
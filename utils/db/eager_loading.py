@@ -0,0 +1,166 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+class EagerLoadingManager:
+    """
+    select_related / prefetch_related / only() plans derived from serializers
+
+    Nested serializers on forward foreign keys and one-to-one relations are
+    joined with `select_related`, nested `many=True` serializers are loaded
+    with one `Prefetch` query per relation, whose queryset gets the nested
+    serializer's own plan. Serializing a page therefore costs a constant
+    number of queries whatever its size.
+
+    Columns are restricted with `only()` to the fields the serializers read.
+    Fields the planner cannot see through (`SerializerMethodField`, dotted or
+    `*` sources) disable `only()` for the whole plan, unless the serializer
+    lists the model fields they read in `Meta.eager_loading_fields`.
+
+    Example:
+        class FileSerializer(serializers.ModelSerializer):
+            full_url = serializers.SerializerMethodField()
+
+            class Meta:
+                model = File
+                fields = ['id', 'full_url']
+                eager_loading_fields = ['url', 'public_id', 'version', 'format', 'resource_type']
+    """
+    _plans = {}
+
+    @staticmethod
+    def apply(queryset, serializer_class):
+        """
+        Apply the plan of a serializer to a queryset
+
+        Args:
+            queryset (QuerySet): Queryset of the serializer's model
+            serializer_class (type): Model serializer class
+
+        Returns:
+            QuerySet: Queryset loading everything the serializer reads
+        """
+        select_related, prefetch_related, only = EagerLoadingManager.get_plan(serializer_class)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if only is not None:
+            queryset = queryset.only(*only)
+        return queryset
+
+    @staticmethod
+    def get_plan(serializer_class):
+        """
+        Get the loading plan of a serializer, built once per class
+
+        Args:
+            serializer_class (type): Model serializer class
+
+        Returns:
+            tuple: (select_related lookups, Prefetch objects, only() fields or None)
+        """
+        plan = EagerLoadingManager._plans.get(serializer_class)
+        if plan is None:
+            plan = EagerLoadingManager.build_plan(serializer_class())
+            EagerLoadingManager._plans[serializer_class] = plan
+        return plan
+
+    @staticmethod
+    def build_plan(serializer, prefix=""):
+        """
+        Build the loading plan of a serializer instance
+
+        Args:
+            serializer (ModelSerializer): Serializer, the child of a list serializer
+            prefix (str): Lookup path of the serializer's model from the queryset's model
+
+        Returns:
+            tuple: (select_related lookups, Prefetch objects, only() fields or None)
+        """
+        if not isinstance(serializer, serializers.ModelSerializer):
+            return [], [], None
+        meta = serializer.Meta
+        model = meta.model
+        select_related = []
+        prefetch_related = []
+        only = [f"{prefix}{model._meta.pk.name}"]
+        only.extend(f"{prefix}{name}" for name in getattr(meta, "eager_loading_fields", ()))
+        complete = True
+
+        for field in serializer.fields.values():
+            if isinstance(field, serializers.SerializerMethodField):
+                complete = complete and hasattr(meta, "eager_loading_fields")
+                continue
+            source = field.source
+            if source == "*" or "." in source:
+                complete = False
+                continue
+            try:
+                model_field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                # Properties and methods may read anything
+                complete = False
+                continue
+
+            if isinstance(field, serializers.ListSerializer):
+                prefetch_related.append(
+                    EagerLoadingManager.get_prefetch(f"{prefix}{source}", model_field, field.child)
+                )
+            elif isinstance(field, serializers.ModelSerializer) and model_field.is_relation:
+                nested_select, nested_prefetch, nested_only = EagerLoadingManager.build_plan(
+                    field, f"{prefix}{source}__"
+                )
+                select_related.append(f"{prefix}{source}")
+                select_related.extend(nested_select)
+                prefetch_related.extend(nested_prefetch)
+                if model_field.concrete:
+                    only.append(f"{prefix}{source}")
+                if nested_only is None:
+                    complete = False
+                else:
+                    only.extend(nested_only)
+            elif model_field.concrete:
+                only.append(f"{prefix}{source}")
+            else:
+                complete = False
+
+        return select_related, prefetch_related, list(dict.fromkeys(only)) if complete else None
+
+    @staticmethod
+    def get_prefetch(lookup, model_field, child):
+        """
+        Build the Prefetch of a to-many relation with the plan of its serializer
+
+        Args:
+            lookup (str): Prefetch lookup from the queryset's model
+            model_field (Field): Relation on the parent model
+            child (Serializer): Serializer of each related object
+
+        Returns:
+            Prefetch: Prefetch with a planned queryset
+        """
+        related_model = model_field.related_model
+        queryset = related_model._default_manager.all()
+        if not isinstance(child, serializers.ModelSerializer):
+            return Prefetch(lookup, queryset=queryset)
+
+        select_related, prefetch_related, only = EagerLoadingManager.build_plan(child)
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*prefetch_related)
+        if only is not None:
+            if model_field.one_to_many:
+                # The foreign key back to the parent is how prefetched rows are matched
+                only.append(model_field.field.name)
+            queryset = queryset.only(*only)
+        return Prefetch(lookup, queryset=queryset)
+
+
+class EagerLoadingMixin:
+    """View mixin applying the serializer's eager-loading plan to `get_queryset()`"""
+
+    def get_queryset(self):
+        return EagerLoadingManager.apply(super().get_queryset(), self.get_serializer_class())
@@ -0,0 +1,65 @@
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+
+from common.models import File, Links, Skills
+from common.serializers import FileSerializer, LinksSerializer, SkillsSerializer
+from info.models import Blogs, Experiences, ProjectImage, Projects
+from info.serializers import BlogsSerializer, ExperiencesSerializer, ProjectsSerializer
+from utils.db.compiled_serializer import CompiledSerializerManager
+from utils.db.eager_loading import EagerLoadingManager
+from utils.testing.fixtures import create_file, seed_portfolio
+
+SERIALIZERS = [
+    (BlogsSerializer, Blogs),
+    (ExperiencesSerializer, Experiences),
+    (ProjectsSerializer, Projects),
+    (SkillsSerializer, Skills),
+    (LinksSerializer, Links),
+    (FileSerializer, File),
+]
+
+
+class CompiledSerializerTests(TestCase):
+    """Output of CompiledSerializerManager compared with DRF's `serializer.data`"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.portfolio = seed_portfolio(blogs=3, projects=2, experiences=2, skills=4)
+        # Null relations
+        Blogs.objects.create(title="No cover", description="", content="", status=True, cover_img=None)
+        Experiences.objects.create(
+            company_name="No logo", job_title="Engineer", description="", working_period="2020", company_img=None
+        )
+        ProjectImage.objects.create(project=cls.portfolio["projects"][1], image=None)
+        # A File saved before its URLs were stored
+        unbackfilled = create_file("blog_cover_image/unbackfilled", File.BLOG_TYPE)
+        File.objects.filter(pk=unbackfilled.pk).update(url="", derived_urls={})
+        Blogs.objects.create(title="Old cover", description="", content="", status=True, cover_img=unbackfilled)
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def assert_same_output(self, serializer_class, model):
+        queryset = EagerLoadingManager.apply(model.objects.order_by("pk"), serializer_class)
+        expected = self.render(serializer_class(list(queryset), many=True).data)
+        # Model instances, then values_list() rows for flat serializers
+        self.assertEqual(self.render(CompiledSerializerManager.serialize(serializer_class, list(queryset))), expected)
+        self.assertEqual(self.render(CompiledSerializerManager.serialize(serializer_class, queryset.all())), expected)
+        self.assertEqual(
+            self.render(list(CompiledSerializerManager.iterate(serializer_class, queryset.all(), chunk_size=2))),
+            expected,
+        )
+
+    def test_list_serializers(self):
+        for serializer_class, model in SERIALIZERS:
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assert_same_output(serializer_class, model)
+
+    def test_flat_serializers_read_rows(self):
+        self.assertIsNotNone(CompiledSerializerManager.get_row_plan(SkillsSerializer))
+        self.assertIsNotNone(CompiledSerializerManager.get_row_plan(LinksSerializer))
+        self.assertIsNone(CompiledSerializerManager.get_row_plan(BlogsSerializer))
+
+    @override_settings(SERIALIZER_COMPILE_ENABLED=False)
+    def test_disabled(self):
+        self.assert_same_output(BlogsSerializer, Blogs)
@@ -0,0 +1,171 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+
+
+class EventLogger:
+    """
+    Structured event logger with per-category sampling
+
+    Each event has a dotted category (e.g. "cache.hit") whose sample rate is
+    read from `LOG_EVENTS`, the longest matching prefix wins: 1 logs every
+    event, 0.01 one in a hundred, 0 turns the category off. Dropped events
+    return before a log record is built.
+
+    Example:
+        logger = get_logger(__name__)
+        logger.event("cache.hit", "Using response cache", view="BlogsListView", version=3)
+    """
+
+    def __init__(self, name):
+        self.logger = logging.getLogger(name)
+
+    def event(self, event, message, level=logging.INFO, exc_info=None, **fields):
+        """
+        Log an event if its category is enabled and sampled
+
+        Args:
+            event (str): Dotted event category
+            message (str): Human readable message
+            level (int): Logging level
+            exc_info: Exception info, as for `logging.Logger.log`
+            **fields: Structured fields (view, model, version, key, duration, ...)
+        """
+        rate = get_sample_rate(event)
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return
+        if not self.logger.isEnabledFor(level):
+            return
+        if rate < 1:
+            fields["sample_rate"] = rate
+        self.logger.log(level, message, exc_info=exc_info, extra={"event": event, "fields": fields})
+
+    def error(self, event, message, exc_info=None, **fields):
+        """Log an error event, see `event`"""
+        self.event(event, message, level=logging.ERROR, exc_info=exc_info, **fields)
+
+
+def get_logger(name):
+    """
+    Get a structured event logger
+
+    Args:
+        name (str): Logger name, usually the module `__name__`
+
+    Returns:
+        EventLogger: Event logger
+    """
+    return EventLogger(name)
+
+
+def get_sample_rate(event):
+    """
+    Get the sample rate of an event category from `LOG_EVENTS`
+
+    Args:
+        event (str): Dotted event category
+
+    Returns:
+        float: Sample rate between 0 and 1, 1 when not configured
+    """
+    rates = getattr(settings, "LOG_EVENTS", {})
+    while event:
+        rate = rates.get(event)
+        if rate is not None:
+            return rate
+        event = event.rpartition(".")[0]
+    return 1.0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the event fields at the top level"""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Readable single line format for local development"""
+
+    def format(self, record):
+        fields = " ".join(f"{key}={value}" for key, value in getattr(record, "fields", {}).items())
+        line = f"[{self.formatTime(record, '%Y-%m-%d %H:%M:%S')}] {record.levelname} {record.getMessage()}"
+        if fields:
+            line = f"{line} {fields}"
+        if record.exc_info:
+            line = f"{line}\n{self.formatException(record.exc_info)}"
+        return line
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Hand log records to a background thread that formats and writes them
+
+    The request thread only puts the record on a bounded queue. When the
+    queue is full the record is dropped instead of blocking the request.
+    Each process (gunicorn worker) gets its own queue and listener thread.
+    """
+
+    def __init__(self, json_format=True, queue_size=10000):
+        super().__init__(queue.Queue(queue_size))
+        self.queue_size = queue_size
+        self.target = logging.StreamHandler(sys.stdout)
+        self.target.setFormatter(JsonFormatter() if json_format else TextFormatter())
+        self.listener = None
+        self.pid = None
+        self.dropped = 0
+
+    def prepare(self, record):
+        # Formatting is left to the listener thread
+        return record
+
+    def enqueue(self, record):
+        if self.pid != os.getpid():
+            self.start_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def start_listener(self):
+        """Start the listener thread of this process"""
+        self.acquire()
+        try:
+            if self.pid == os.getpid():
+                return
+            # A queue inherited through fork may hold a lock of the parent's listener
+            self.queue = queue.Queue(self.queue_size)
+            self.listener = QueueListener(self.queue, self.target)
+            self.listener.start()
+            self.pid = os.getpid()
+            atexit.register(self.stop_listener)
+        finally:
+            self.release()
+
+    def stop_listener(self):
+        """Write the queued records and stop the listener thread"""
+        if self.listener is not None and self.pid == os.getpid():
+            self.listener.stop()
+            self.listener = None
+            self.pid = None
+
+    def close(self):
+        self.stop_listener()
+        super().close()
@@ -1,12 +1,16 @@
-import hashlib
+import json
+import threading
 import uuid
+from collections import OrderedDict
 from cloudinary import uploader as uploader_cloudinary, utils as utils_cloudinary
-from django.core.cache import cache
+from django.conf import settings
 
 from helpers import helper
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
 
-from utils.cache.managers.versioned_cache import VersionedCacheManager
+# Memo of build_url, (public_id, version, format, resource_type, transformation) -> URL
+_url_memo = OrderedDict()
+_url_memo_lock = threading.Lock()
 
 
 class CloudinaryService:
@@ -59,7 +63,7 @@ class CloudinaryService:
     @staticmethod
     def get_url_from_public_id(public_id: str, options_config: dict = {}) -> Tuple[Optional[str], Optional[dict]]:
         """
-        Get URL from public ID with caching.
+        Get URL from public ID, computed locally (see `build_url`).
         
         Args:
             public_id: Public ID
@@ -72,27 +76,89 @@ class CloudinaryService:
             if not public_id:
                 return None, None
 
-            cache_key_data = f"{public_id}_{str(sorted(options_config.items()))}"
-            cache_key = f"cloudinary_url_{hashlib.md5(cache_key_data.encode()).hexdigest()}"
+            options_config = dict(options_config)
+            transformation = options_config.pop("transformation", None)
+            unknown = set(options_config) - {"version", "format", "resource_type", "secure"}
+            if unknown:
+                # Options outside the memo key are passed straight to Cloudinary
+                options_config["secure"] = True
+                return utils_cloudinary.cloudinary_url(public_id, transformation=transformation, **options_config)
 
-            cached_result = VersionedCacheManager.get_versioned_data(cache_key, "files")
-            if cached_result:
-                return cached_result
-
-            # Ensure always use HTTPS
-            options_config['secure'] = True
-            url, options = utils_cloudinary.cloudinary_url(public_id, **options_config)
-            result = (url, options)
-
-            VersionedCacheManager.set_versioned_data(
-                base_key=cache_key,
-                model_name="files",
-                data=result,
-                timeout=3600
+            url = CloudinaryService.build_url(
+                public_id,
+                version=options_config.get("version"),
+                format=options_config.get("format"),
+                resource_type=options_config.get("resource_type") or "image",
+                transformation=transformation,
             )
+            return url, {}
 
-            return result
-            
         except Exception as e:
             helper.print_log_error("cloudinary_get_url", e)
-            return None, None
\ No newline at end of file
+            return None, None
+
+    @staticmethod
+    def build_url(public_id: str, version: Optional[str] = None, format: Optional[str] = None,
+                  resource_type: str = "image", transformation=None) -> Optional[str]:
+        """
+        Build the secure delivery URL of an asset without any network or cache round trip.
+
+        `cloudinary_url()` is a pure function of its arguments and the account
+        configuration, so results are memoized per process in a bounded LRU of
+        `CLOUDINARY_URL_MEMO_SIZE` entries. Replacing a file changes its version
+        and therefore its memo key, so nothing needs invalidating.
+
+        Args:
+            public_id: Public ID
+            version: Asset version
+            format: File extension
+            resource_type: "image", "video" or "raw"
+            transformation: Transformation dict or list of dicts, e.g. {"width": 400, "crop": "limit"}
+
+        Returns:
+            URL, None without public ID
+        """
+        if not public_id:
+            return None
+        memo_key = (
+            public_id, version, format, resource_type,
+            json.dumps(transformation, sort_keys=True) if transformation else None,
+        )
+        with _url_memo_lock:
+            url = _url_memo.get(memo_key)
+            if url is not None:
+                _url_memo.move_to_end(memo_key)
+                return url
+
+        url, _ = utils_cloudinary.cloudinary_url(
+            public_id,
+            version=version,
+            format=format,
+            resource_type=resource_type,
+            transformation=transformation,
+            secure=True,
+        )
+        with _url_memo_lock:
+            _url_memo[memo_key] = url
+            while len(_url_memo) > getattr(settings, "CLOUDINARY_URL_MEMO_SIZE", 4096):
+                _url_memo.popitem(last=False)
+        return url
+
+    @staticmethod
+    def build_urls(files, transformation=None) -> Dict[int, Optional[str]]:
+        """
+        Build delivery URLs for a batch of files, e.g. every image of a page.
+
+        Args:
+            files: Iterable of File instances, None items are skipped
+            transformation: Transformation applied to every file
+
+        Returns:
+            File ID -> URL
+        """
+        return {
+            file.pk: CloudinaryService.build_url(
+                file.public_id, file.version, file.format, file.resource_type or "image", transformation
+            )
+            for file in files if file is not None
+        }
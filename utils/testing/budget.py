@@ -0,0 +1,148 @@
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django_redis import get_redis_connection
+
+from utils.cache.managers.circuit_breaker import CircuitBreakerManager
+from utils.cache.managers.single_flight import RELEASE_LOCK_SCRIPT
+from utils.cache.managers.versioned_cache import GET_VERSION_AND_DATA_SCRIPT
+
+
+class RedisCommandCounter:
+    """
+    Count Redis round trips made by the current thread
+
+    A command sent on its own counts once, a pipeline counts once however
+    many commands it carries. Threads other than the measuring one (the
+    background refresh pool, the log writer) are ignored.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.commands = []
+        self._thread = threading.current_thread()
+
+    @contextmanager
+    def patch(self):
+        from redis.client import Pipeline, Redis
+
+        execute_command = Redis.execute_command
+        execute_pipeline = Pipeline.execute
+        counter = self
+
+        def counting_execute_command(client, *args, **options):
+            if threading.current_thread() is counter._thread:
+                counter.count += 1
+                counter.commands.append(str(args[0]))
+            return execute_command(client, *args, **options)
+
+        def counting_execute_pipeline(pipeline, *args, **kwargs):
+            if threading.current_thread() is counter._thread:
+                counter.count += 1
+                counter.commands.append(f"PIPELINE[{len(pipeline.command_stack)}]")
+            return execute_pipeline(pipeline, *args, **kwargs)
+
+        Redis.execute_command = counting_execute_command
+        Pipeline.execute = counting_execute_pipeline
+        try:
+            yield self
+        finally:
+            Redis.execute_command = execute_command
+            Pipeline.execute = execute_pipeline
+
+
+class EndpointBudgetTestCase(TestCase):
+    """
+    Base test case holding endpoints to SQL query, Redis round trip and payload budgets
+
+    Each endpoint is requested twice: cold (empty cache, the response is
+    computed) and warm (the same request again, served from the cache).
+    Budgets are declared per URL name in `budgets`:
+
+        budgets = {
+            "info:blogs-list": {"cold": (3, 12), "warm": (0, 1), "max_bytes": 40000},
+        }
+
+    where "cold" and "warm" are (SQL queries, Redis round trips) upper
+    bounds. A budget keyed by "<url name>?<query string>" overrides the URL
+    name's budget for that query string. A request over any bound fails the test with the measured values
+    and the Redis commands sent. Set `ENDPOINT_BUDGET_REPORT=1` to print every
+    measurement.
+    """
+    budgets = {}
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        CircuitBreakerManager.record_success()
+        # Redis keeps scripts once loaded, so the first test to run one does not pay SCRIPT LOAD
+        connection = get_redis_connection("default")
+        for script in (GET_VERSION_AND_DATA_SCRIPT, RELEASE_LOCK_SCRIPT):
+            connection.script_load(script)
+
+    def measure(self, url):
+        """
+        Request a URL and record what it cost
+
+        Args:
+            url (str): URL with query string
+
+        Returns:
+            dict: "status", "queries", "redis", "commands", "bytes" and "content"
+        """
+        counter = RedisCommandCounter()
+        with CaptureQueriesContext(connection) as queries, counter.patch():
+            response = self.client.get(url)
+            # Streamed bodies query and read the cache while they are consumed
+            content = b"".join(response.streaming_content) if response.streaming else response.content
+        return {
+            "status": response.status_code,
+            "queries": len(queries),
+            "redis": counter.count,
+            "commands": counter.commands,
+            "bytes": len(content),
+            "content": content,
+        }
+
+    def assert_within_budget(self, url_name, query_string="", **url_kwargs):
+        """
+        Request an endpoint cold and warm and check both against its budget
+
+        Args:
+            url_name (str): URL name with namespace, e.g. "info:blogs-list"
+            query_string (str): Query string without "?"
+            **url_kwargs: URL kwargs
+        """
+        budget = self.budgets.get(f"{url_name}?{query_string}") or self.budgets[url_name]
+        url = reverse(url_name, kwargs=url_kwargs or None)
+        if query_string:
+            url = f"{url}?{query_string}"
+
+        for phase in ("cold", "warm"):
+            result = self.measure(url)
+            if os.environ.get("ENDPOINT_BUDGET_REPORT"):
+                sys.stderr.write(
+                    f"\n{phase:<5} {url:<40} sql={result['queries']:<3} redis={result['redis']:<3} "
+                    f"bytes={result['bytes']}"
+                )
+            self.assertEqual(result["status"], 200, f"{phase} {url}")
+            max_queries, max_redis = budget[phase]
+            self.assertLessEqual(
+                result["queries"], max_queries,
+                f"{phase} {url}: {result['queries']} SQL queries, budget {max_queries}"
+            )
+            self.assertLessEqual(
+                result["redis"], max_redis,
+                f"{phase} {url}: {result['redis']} Redis round trips, budget {max_redis}: {result['commands']}"
+            )
+            self.assertLessEqual(
+                result["bytes"], budget["max_bytes"],
+                f"{phase} {url}: {result['bytes']} bytes, budget {budget['max_bytes']}"
+            )
@@ -0,0 +1,92 @@
+from django.utils import timezone
+
+from common.models import File, Links, Skills
+from info.models import Blogs, Experiences, ProjectImage, Projects
+
+PARAGRAPH = (
+    "<p>Caching a read-heavy API is mostly about knowing what changed. "
+    "Versioned keys make invalidation a single increment, and the rest is "
+    "keeping every layer honest about the versions it serves.</p>"
+)
+
+
+def create_file(public_id, file_type=File.OTHER_TYPE):
+    """Create a File as saved after a Cloudinary upload"""
+    return File.objects.create(
+        public_id=f"personal-bucket/test/{public_id}",
+        version="1700000000",
+        format="png",
+        resource_type="image",
+        file_type=file_type,
+        uploaded_at=timezone.now(),
+        metadata={"width": 1280, "height": 720, "bytes": 204800},
+    )
+
+
+def seed_portfolio(blogs=25, projects=8, experiences=5, skills=10):
+    """
+    Create a portfolio the size of a real one, with every relation the serializers follow
+
+    Args:
+        blogs (int): Blogs, each with a cover image and 3 skills, every fifth unpublished
+        projects (int): Projects, each with 2 links, 3 skills and 3 images
+        experiences (int): Experiences, each with a company image
+        skills (int): Skills shared by blogs and projects
+
+    Returns:
+        dict: Created objects by kind
+    """
+    skill_objects = [
+        Skills.objects.create(name=f"Skill {index}", icon=f'<i class="devicon-{index}"></i>')
+        for index in range(skills)
+    ]
+
+    blog_objects = []
+    for index in range(blogs):
+        blog = Blogs.objects.create(
+            title=f"Blog post {index}",
+            description=f"What blog post {index} is about",
+            content=PARAGRAPH * 12,
+            status=index % 5 != 4,
+            cover_img=create_file(f"blog_cover_image/{index}", File.BLOG_TYPE),
+        )
+        blog.skills.set(skill_objects[index % skills:index % skills + 3])
+        blog_objects.append(blog)
+
+    project_objects = []
+    for index in range(projects):
+        project = Projects.objects.create(
+            name=f"Project {index}",
+            descriptions=f"Project {index}, a versioned and cached portfolio API",
+            link_github=Links.objects.create(
+                name=f"github-{index}", title="GitHub", url=f"https://github.com/example/{index}", icon="github"
+            ),
+            link_website=Links.objects.create(
+                name=f"website-{index}", title="Website", url=f"https://example.com/{index}", icon="globe"
+            ),
+        )
+        project.skills.set(skill_objects[index % skills:index % skills + 3])
+        for image_index in range(3):
+            ProjectImage.objects.create(
+                project=project,
+                image=create_file(f"project_image/{index}-{image_index}", File.PROJECT_TYPE),
+            )
+        project_objects.append(project)
+
+    experience_objects = [
+        Experiences.objects.create(
+            company_name=f"Company {index}",
+            job_title="Backend engineer",
+            description=PARAGRAPH * 3,
+            working_period=f"{2015 + index} - {2016 + index}",
+            company_img=create_file(f"company_image/{index}", File.EXPERIENCE_TYPE),
+        )
+        for index in range(experiences)
+    ]
+
+    return {
+        "skills": skill_objects,
+        "blogs": blog_objects,
+        "projects": project_objects,
+        "experiences": experience_objects,
+    }